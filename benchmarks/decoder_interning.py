@@ -0,0 +1,84 @@
+"""
+Benchmark of memory retained by decoded list-of-records documents with and
+without interning of short string values, run from the project root::
+
+    python -m benchmarks.decoder_interning [--records 20000]
+
+Records repeat the same keys and most of values, e.g. protocols or zones.
+Mapping keys are always shared by decoders, :code:`intern_values` shares
+short string values too. Reports memory allocated by the decoded document,
+including data kept for locations lookup, measured by :py:mod:`tracemalloc`,
+and the best decoding time, measured without tracing. YAML is decoded by
+*libyaml* based loader, if it's available.
+"""
+import argparse
+import json
+import tracemalloc
+from functools import partial
+from timeit import repeat
+from typing import Any, Callable, List
+
+import yaml
+
+from pydantic_settings.decoder import json as json_decoder
+from pydantic_settings.decoder import yaml as yaml_decoder
+
+
+def build_records(records: int) -> List[Any]:
+    return [
+        {
+            'host': f'host-{num % 100}.example.com',
+            'port': 8000 + num % 10,
+            'proto': 'tcp' if num % 3 else 'udp',
+            'zone': f'zone-{num % 4}',
+            'timeout': 1.5,
+            'tags': ['primary' if num % 2 else 'secondary'],
+        }
+        for num in range(records)
+    ]
+
+
+def retained_memory(decode: Callable[[], Any]) -> float:
+    """Memory allocated by decoded document, in MB."""
+    tracemalloc.start()
+    document = decode()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del document
+    return retained / 2 ** 20
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--records', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    loader_cls = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    decode_yaml = partial(yaml_decoder.decode_document, loader_cls=loader_cls)
+
+    document = {'records': build_records(args.records)}
+    json_content = json.dumps(document)
+    yaml_content = yaml.safe_dump(document)
+    cases = {
+        'json, json.loads': lambda: json.loads(json_content),
+        'json': lambda: json_decoder.decode_document(json_content),
+        'json, intern_values': lambda: json_decoder.decode_document(
+            json_content, intern_values=True
+        ),
+        'yaml': lambda: decode_yaml(yaml_content),
+        'yaml, intern_values': lambda: decode_yaml(
+            yaml_content, intern_values=True
+        ),
+    }
+
+    print(f'{args.records} records')
+    print(f'{"decoder":<24}{"retained, MB":>14}{"time, ms":>12}')
+    for name, decode in cases.items():
+        retained = retained_memory(decode)
+        duration = min(repeat(decode, number=1, repeat=args.repeat))
+        print(f'{name:<24}{retained:>14.1f}{duration * 1000:>12.1f}')
+
+
+if __name__ == '__main__':
+    main()
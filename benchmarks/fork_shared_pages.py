@@ -0,0 +1,150 @@
+"""
+Benchmark of memory pages shared by forked workers with the master process,
+which loaded settings, run from the project root on Linux::
+
+    python -m benchmarks.fork_shared_pages [--workers 32] [--records 50000]
+
+Each mode runs in a fresh interpreter, since garbage collector state is
+process-wide:
+
+* :code:`plain`: settings are loaded, then workers are forked
+* :code:`frozen`: :py:func:`pydantic_settings.disable_gc_until_fork` is
+  called before loading and :py:func:`pydantic_settings.freeze_for_fork`
+  before forking
+
+Each worker reads every settings record and runs a full collection, like a
+long-living worker eventually does, then reports its memory from
+:code:`/proc/self/smaps_rollup`. Pages copied on write are private dirty
+ones, the rest of touched pages stay shared.
+"""
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List
+
+from pydantic import BaseModel
+
+from pydantic_settings import (
+    disable_gc_until_fork,
+    freeze_for_fork,
+    load_settings,
+)
+
+MODES = ('plain', 'frozen')
+
+
+class Upstream(BaseModel):
+    host: str
+    port: int
+    weight: float = 1.0
+    tags: List[str] = []
+
+
+class Settings(BaseModel):
+    upstreams: List[Upstream]
+
+
+def read_memory() -> Dict[str, int]:
+    """Memory of the current process in kB by smaps field name."""
+    result = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            name, _, value = line.partition(':')
+            if value.strip().endswith('kB'):
+                result[name] = int(value.split()[0])
+    return result
+
+
+def run_worker(settings: Settings, out_fd: int) -> None:
+    total = 0
+    for upstream in settings.upstreams:
+        total += upstream.port + len(upstream.host) + len(upstream.tags)
+    gc.collect()
+    memory = read_memory()
+    report = {
+        'private': memory['Private_Dirty'],
+        'shared': memory['Shared_Clean'] + memory['Shared_Dirty'],
+    }
+    os.write(out_fd, (json.dumps(report) + '\n').encode())
+
+
+def run_mode(mode: str, workers: int, records: int) -> None:
+    if mode == 'frozen':
+        disable_gc_until_fork()
+
+    content = json.dumps(
+        {
+            'upstreams': [
+                {'host': f'host-{num}', 'port': num, 'tags': ['a', 'b']}
+                for num in range(records)
+            ]
+        }
+    )
+    settings = load_settings(Settings, content, type_hint='json')
+    del content
+
+    if mode == 'frozen':
+        freeze_for_fork(settings)
+
+    read_fd, write_fd = os.pipe()
+    pids = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover
+            os.close(read_fd)
+            run_worker(settings, write_fd)
+            os._exit(0)
+        pids.append(pid)
+    os.close(write_fd)
+
+    with os.fdopen(read_fd) as f:
+        reports = [json.loads(line) for line in f]
+    for pid in pids:
+        os.waitpid(pid, 0)
+
+    private = sum(report['private'] for report in reports) / len(reports)
+    shared = sum(report['shared'] for report in reports) / len(reports)
+    print(
+        f'{mode:<10}{len(reports):>8}{private / 1024:>16.1f}'
+        f'{shared / 1024:>16.1f}{private * len(reports) / 1024:>16.1f}'
+    )
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--workers', type=int, default=32)
+    parser.add_argument('--records', type=int, default=50000)
+    parser.add_argument('--mode', choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.mode is not None:
+        run_mode(args.mode, args.workers, args.records)
+        return
+
+    print(
+        f'{"mode":<10}{"workers":>8}{"private, MB":>16}{"shared, MB":>16}'
+        f'{"total private":>16}'
+    )
+    sys.stdout.flush()
+    for mode in MODES:
+        subprocess.run(
+            [
+                sys.executable,
+                '-m',
+                'benchmarks.fork_shared_pages',
+                '--mode',
+                mode,
+                '--workers',
+                str(args.workers),
+                '--records',
+                str(args.records),
+            ],
+            check=True,
+        )
+
+
+if __name__ == '__main__':
+    main()
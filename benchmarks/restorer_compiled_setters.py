@@ -0,0 +1,81 @@
+"""
+Benchmark of :py:class:`pydantic_settings.restorer.ModelShapeRestorer`
+with generated per-path setters against the generic restoration, run from
+the project root::
+
+    python -m benchmarks.restorer_compiled_setters [--sections 10] [--repeat 5]
+
+The model is three levels deep: sections of subsections of string fields,
+and every field is set by an environment variable. Reports the best of
+repeats of a :code:`restore()` call of both restorers.
+"""
+import argparse
+from timeit import repeat
+from typing import Callable, Dict, List, Tuple, Type
+
+from pydantic import BaseModel, create_model
+
+from pydantic_settings.decoder.json import decode_document
+from pydantic_settings.restorer import ModelShapeRestorer
+
+
+def build_model(
+    sections: int, subsections: int, fields: int
+) -> Tuple[Type[BaseModel], Dict[str, str]]:
+    leaf = create_model(
+        'Leaf', **{f'field{num}': (str, '') for num in range(fields)}
+    )
+    section = create_model(
+        'Section', **{f'sub{num}': (leaf, None) for num in range(subsections)}
+    )
+    model = create_model(
+        'Settings', **{f'sec{num}': (section, None) for num in range(sections)}
+    )
+    environ = {
+        f'APP_SEC{sec}_SUB{sub}_FIELD{field}': 'value'
+        for sec in range(sections)
+        for sub in range(subsections)
+        for field in range(fields)
+    }
+    return model, environ
+
+
+def best_of(func: Callable[[], object], number: int, times: int) -> float:
+    """Best time of a single call, in seconds."""
+    return min(repeat(func, number=number, repeat=times)) / number
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sections', type=int, default=10)
+    parser.add_argument('--subsections', type=int, default=5)
+    parser.add_argument('--fields', type=int, default=4)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--number', type=int, default=500)
+    args = parser.parse_args(argv)
+
+    model, environ = build_model(args.sections, args.subsections, args.fields)
+    results = {}
+    for name, compile_setters in (('generic', False), ('compiled', True)):
+        restorer = ModelShapeRestorer(
+            model,
+            'APP',
+            False,
+            decode_document,
+            compile_setters=compile_setters,
+        )
+        values, errs = restorer.restore(environ)
+        assert not errs and len(values) == args.sections
+        results[name] = best_of(
+            lambda: restorer.restore(environ), args.number, args.repeat
+        )
+
+    print(f'{len(environ)} variables, restore() call')
+    for name, seconds in results.items():
+        print(f'{name:<36}{seconds * 1e3:>10.3f} ms')
+    speed_up = results['generic'] / results['compiled']
+    print(f'{"speed-up":<36}{speed_up:>10.2f}x')
+
+
+if __name__ == '__main__':
+    main()
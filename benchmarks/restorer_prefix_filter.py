@@ -0,0 +1,97 @@
+"""
+Benchmark of rejecting environment variables without the prefix by
+:py:class:`pydantic_settings.restorer.ModelShapeRestorer`, run from the
+project root::
+
+    python -m benchmarks.restorer_prefix_filter [--size 10000] [--repeat 5]
+
+The environment consists of random variables and two prefixed ones, which
+is typical for a process environment. Reports the best of repeats of:
+
+* case-folding every key and checking the prefix, what :code:`restore()`
+  did before keys were filtered by the first character
+* the first :code:`restore()` of a fresh restorer, before case-folded keys
+  are memoized
+* :code:`restore()` repeated with the same environment
+* :code:`restore()` of a case-sensitive restorer, which folds nothing
+"""
+import argparse
+import random
+import string
+from time import perf_counter
+from timeit import repeat
+from typing import Callable, Dict, List, Mapping
+
+from pydantic import BaseModel
+
+from pydantic_settings.decoder.json import decode_document
+from pydantic_settings.restorer import ModelShapeRestorer
+
+
+class Settings(BaseModel):
+    debug: bool = False
+    name: str = ''
+
+
+def build_environ(size: int) -> Dict[str, str]:
+    rnd = random.Random(0)
+    chars = string.ascii_letters + '_'
+    environ = {
+        ''.join(rnd.choice(chars) for _ in range(rnd.randint(4, 24))): 'value'
+        for _ in range(size - 2)
+    }
+    environ.update(APP_NAME='bench', app_debug='true')
+    return environ
+
+
+def best_of(func: Callable[[], object], number: int, times: int) -> float:
+    """Best time of a single call, in seconds."""
+    return min(repeat(func, number=number, repeat=times)) / number
+
+
+def casefold_all(environ: Mapping[str, str], prefix: str) -> int:
+    return sum(1 for key in environ if key.casefold().startswith(prefix))
+
+
+def restore_cold(environ: Mapping[str, str], times: int) -> float:
+    """Best time of the first call of fresh restorers, in seconds."""
+    timings = []
+    for _ in range(times):
+        restorer = ModelShapeRestorer(Settings, 'APP', False, decode_document)
+        start = perf_counter()
+        restorer.restore(environ)
+        timings.append(perf_counter() - start)
+    return min(timings)
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--size', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--number', type=int, default=100)
+    args = parser.parse_args(argv)
+
+    environ = build_environ(args.size)
+    restorer = ModelShapeRestorer(Settings, 'APP', False, decode_document)
+    sensitive = ModelShapeRestorer(Settings, 'APP', True, decode_document)
+    assert restorer.restore(environ)[0] == {'name': 'bench', 'debug': 'true'}
+
+    results = {
+        'casefold every key': best_of(
+            lambda: casefold_all(environ, 'app_'), args.number, args.repeat
+        ),
+        'restore(), first call': restore_cold(environ, args.repeat),
+        'restore(), repeated': best_of(
+            lambda: restorer.restore(environ), args.number, args.repeat
+        ),
+        'restore(), case-sensitive': best_of(
+            lambda: sensitive.restore(environ), args.number, args.repeat
+        ),
+    }
+    print(f'{len(environ)} variables, 2 of them prefixed')
+    for name, seconds in results.items():
+        print(f'{name:<36}{seconds * 1e3:>10.3f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""
+Benchmark of :py:class:`pydantic_settings.restorer.ModelShapeRestorer`
+shared between threads, run from the project root::
+
+    python -m benchmarks.restorer_throughput [--threads 1 8] [--repeat 5]
+
+Reports the best of repeats of:
+
+* :code:`restore()` of an environ without matching keys and with a few ones
+* :code:`with_prefix()` compared to building a new restorer
+* :code:`from_env()` throughput of a single class-wide restorer used by
+  several threads at once
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from timeit import repeat
+from typing import Callable, Dict, List
+
+from pydantic import BaseModel
+
+from pydantic_settings import BaseSettingsModel
+from pydantic_settings.decoder.json import decode_document
+from pydantic_settings.restorer import ModelShapeRestorer
+
+
+class Upstream(BaseModel):
+    host: str = 'localhost'
+    port: int = 80
+
+
+class Database(BaseModel):
+    dsn: str = ''
+    pool_size: int = 10
+    replicas: List[Upstream] = []
+
+
+class Settings(BaseSettingsModel):
+    class Config:
+        env_prefix = 'APP'
+        compile_env_setters = True
+
+    debug: bool = False
+    name: str = ''
+    database: Database = Database()
+    upstream: Upstream = Upstream()
+
+
+NON_MATCHING = {f'OTHER_VARIABLE_{num}': str(num) for num in range(200)}
+MATCHING = {
+    'APP_DEBUG': 'true',
+    'APP_NAME': 'bench',
+    'APP_DATABASE_DSN': 'postgres://db',
+    'APP_DATABASE_REPLICAS_0_HOST': 'replica',
+    'APP_UPSTREAM': '{"host": "upstream", "port": 8080}',
+}
+
+
+def best_of(func: Callable[[], object], number: int, times: int) -> float:
+    """Best time of a single call, in seconds."""
+    return min(repeat(func, number=number, repeat=times)) / number
+
+
+def from_env_throughput(threads: int, calls: int, times: int) -> float:
+    """Best number of :code:`from_env()` calls per second."""
+    environ = {**NON_MATCHING, **MATCHING}
+    per_thread = calls // threads
+
+    def run(_: int) -> None:
+        for _ in range(per_thread):
+            Settings.from_env(environ)
+
+    best = 0.0
+    with ThreadPoolExecutor(threads) as executor:
+        for _ in range(times):
+            start = perf_counter()
+            list(executor.map(run, range(threads)))
+            best = max(best, per_thread * threads / (perf_counter() - start))
+    return best
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 8])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--calls', type=int, default=8000)
+    args = parser.parse_args(argv)
+
+    restorer = ModelShapeRestorer(
+        Settings, 'APP', False, decode_document, compile_setters=True
+    )
+    results: Dict[str, float] = {
+        'restore(), 200 non-matching keys': best_of(
+            lambda: restorer.restore(NON_MATCHING), 2000, args.repeat
+        ),
+        'restore(), 5 matching keys': best_of(
+            lambda: restorer.restore(MATCHING), 2000, args.repeat
+        ),
+        'with_prefix()': best_of(
+            lambda: restorer.with_prefix('OTHER'), 200, args.repeat
+        ),
+        'new restorer': best_of(
+            lambda: ModelShapeRestorer(
+                Settings, 'OTHER', False, decode_document
+            ),
+            200,
+            args.repeat,
+        ),
+    }
+    for name, seconds in results.items():
+        print(f'{name:<36}{seconds * 1e6:>10.1f} us')
+
+    for threads in args.threads:
+        rate = from_env_throughput(threads, args.calls, args.repeat)
+        print(f'{f"from_env(), {threads} threads":<36}{rate:>10.0f} /s')
+
+
+if __name__ == '__main__':
+    main()
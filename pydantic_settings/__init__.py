@@ -1,11 +1,21 @@
 from .attrs_docs import with_attrs_docs  # noqa: F401
 from .base import BaseSettingsModel  # noqa: F401
+from .cache import SettingsCache  # noqa: F401
+from .columnar import Columnar  # noqa: F401
 from .errors import (  # noqa: F401
     LoadingError,
     LoadingParseError,
     LoadingValidationError,
 )
+from .fork import (  # noqa: F401
+    disable_gc_until_fork,
+    enable_gc_after_forking,
+    freeze_for_fork,
+)
+from .include import IncludeResolver  # noqa: F401
 from .load import load_settings  # noqa: F401
+from .profiling import LoadProfiler, PhaseStats  # noqa: F401
+from .shared import SharedSettings  # noqa: F401
 from .types import TextLocation  # noqa: F401
 
 __version__ = '0.1.0'
@@ -0,0 +1,5 @@
+import sys
+
+from pydantic_settings.cli import main
+
+sys.exit(main())
@@ -1,10 +1,38 @@
-from typing import Any, ClassVar, Mapping, Type, TypeVar, cast
+from collections import deque
+from concurrent.futures import Executor, Future
+from functools import partial
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Deque,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    cast,
+)
 
 from pydantic import BaseModel, ValidationError
 
 from pydantic_settings.attrs_docs import apply_attributes_docs
+from pydantic_settings.cache import SettingsCache
 from pydantic_settings.decoder import json
 from pydantic_settings.errors import ExtendedErrorWrapper, with_errs_locations
+from pydantic_settings.lazy import (
+    ErrorsLocator,
+    LazyFieldDescriptor,
+    ShallowModel,
+    bind_errors_locator,
+    get_lazy_fields,
+    validate_pending,
+    validate_shallow,
+)
 from pydantic_settings.restorer import ModelShapeRestorer
 from pydantic_settings.utils import deep_merge_mappings
 
@@ -44,6 +72,33 @@ class BaseSettingsModel(BaseModel):
         env variable :command:`export APP_FOO='{"bar": 2, "baz": "new_val"}'`.
          """
 
+        complex_inline_values_cache_size: int = 128
+        """
+        Max number of memoized values decoded by
+        :py:attr:`complex_inline_values_decoder`, so unchanged values aren't
+        decoded again by subsequent :py:meth:`from_env` calls. Zero disables
+        memoization.
+        """
+
+        lazy_submodels: bool = False
+        """
+        Defer validation of nested model fields until the first access to
+        them, or until :py:meth:`validate_all` call, so processes pay only for
+        sections they actually use. Deferred validation errors are located
+        among sources the same way as eager ones. Fields with validators
+        and nested models of complex shape are validated eagerly.
+
+        Root validators receive raw values of deferred fields.
+        """
+
+        compile_env_setters: bool = False
+        """
+        Restore environment variables using functions generated for each
+        field path of the model. It makes :py:meth:`from_env` faster for
+        models with lots of nested fields, at the cost of some extra work on
+        the first call.
+        """
+
         build_attr_docs: bool = True
         """
         Set model field descriptions taken from attributes docstrings. Read
@@ -56,26 +111,83 @@ class BaseSettingsModel(BaseModel):
         """
 
     shape_restorer: ClassVar[ModelShapeRestorer]
+    _lazy_fields: ClassVar[List[str]] = []
+    _shallow_model: ClassVar[ShallowModel]
 
     def __init_subclass__(cls, **kwargs):
         config = cast(cls.Config, cls.__config__)
+        cls._lazy_fields = (
+            get_lazy_fields(cls) if config.lazy_submodels else []
+        )
+        if cls._lazy_fields:
+            cls._shallow_model = ShallowModel(cls, cls._lazy_fields)
+            for name in cls._lazy_fields:
+                setattr(cls, name, LazyFieldDescriptor(name))
+
         cls.shape_restorer = ModelShapeRestorer(
             cls,
             config.env_prefix,
             config.env_case_sensitive,
             config.complex_inline_values_decoder,
+            config.complex_inline_values_cache_size,
+            config.compile_env_setters,
         )
         if config.build_attr_docs:
             apply_attributes_docs(
                 cls, override_existing=config.override_exited_attrs_docs
             )
 
+    def __init__(__pydantic_self__, **data: Any) -> None:
+        cls = __pydantic_self__.__class__
+        if not cls._lazy_fields:
+            super().__init__(**data)
+            return
+
+        values, fields_set = validate_shallow(
+            cls, cls._shallow_model, cls._lazy_fields, data
+        )
+        object.__setattr__(__pydantic_self__, '__dict__', values)
+        object.__setattr__(__pydantic_self__, '__fields_set__', fields_set)
+
+    def validate_all(self) -> None:
+        """
+        Validate all deferred nested models at once, see
+        :py:attr:`Config.lazy_submodels`.
+
+        :raises ValidationError: in case of failure
+        """
+        validate_pending(self)
+
+    def bind_errors_locator(self, locator: ErrorsLocator) -> None:
+        """
+        Set function used to locate errors of deferred validation among
+        values sources.
+        """
+        if self._lazy_fields:
+            bind_errors_locator(self, locator)
+
+    def _iter(self, *args: Any, **kwargs: Any) -> Iterator[Tuple[str, Any]]:
+        if self._lazy_fields:
+            validate_pending(self)
+        return super()._iter(*args, **kwargs)
+
+    def __iter__(self) -> Iterator[Tuple[str, Any]]:
+        if self._lazy_fields:
+            validate_pending(self)
+        return super().__iter__()
+
+    def __getstate__(self) -> Any:
+        if self._lazy_fields:
+            validate_pending(self)
+        return super().__getstate__()
+
     @classmethod
     def from_env(
         cls: Type[T],
         environ: Mapping[str, str],
         *,
         ignore_restore_errs: bool = True,
+        cache: SettingsCache = None,
         **values: Any
     ) -> T:
         """
@@ -85,14 +197,20 @@ class BaseSettingsModel(BaseModel):
             values
         :param ignore_restore_errs: ignore errors happened while restoring
             flat-mapping
+        :param cache: validated models cache, see
+            :py:class:`.SettingsCache`
         :param values: values
         :raises ValidationError: in case of failure
         :return: model instance
         """
         env_vars_applied, env_apply_errs = cls.shape_restorer.restore(environ)
         validation_err = None
+        document = deep_merge_mappings(env_vars_applied, values)
         try:
-            res = cls(**deep_merge_mappings(env_vars_applied, values))
+            if cache is not None:
+                res = cache.get_or_validate(cls, document)
+            else:
+                res = cls(**document)
         except ValidationError as err:
             res = None
             validation_err = err
@@ -114,4 +232,113 @@ class BaseSettingsModel(BaseModel):
         if validation_err:
             raise with_errs_locations(cls, validation_err, env_vars_applied)
 
+        res.bind_errors_locator(
+            partial(_locate_errors, cls, sources=(env_vars_applied,))
+        )
         return res
+
+    @classmethod
+    def from_env_batch(
+        cls: Type[T],
+        environs: Iterable[Mapping[str, str]],
+        *,
+        ignore_restore_errs: bool = True,
+        executor: Executor = None,
+        chunk_size: int = 256,
+        max_pending: int = 4,
+        **values: Any
+    ) -> Iterator[Union[T, ValidationError]]:
+        """
+        Build model instances for each of given environs, sharing class-wide
+        :py:attr:`shape_restorer` between them. Results are streamed in the
+        order of environs, failures are yielded in-place instead of being
+        raised, so single bad item doesn't break the whole batch.
+
+        :param environs: environment-like flat mappings
+        :param ignore_restore_errs: same as for :py:meth:`from_env`
+        :param executor: optional executor, which will build instances by
+            chunks, e.g. :py:class:`concurrent.futures.ProcessPoolExecutor`.
+            Model class must be importable by workers in such case
+        :param chunk_size: number of environs handled by executor at once
+        :param max_pending: max number of chunks submitted to executor, but
+            not yielded yet. Environs are consumed lazily, so memory usage is
+            bounded even for endless environs iterables
+        :param values: values shared between all instances
+        :return: iterator of model instances or validation errors
+        """
+        if executor is None:
+            return _iter_from_env(cls, environs, ignore_restore_errs, values)
+
+        return _iter_from_executor(
+            executor,
+            partial(
+                _build_from_env_chunk,
+                cls,
+                ignore_restore_errs=ignore_restore_errs,
+                values=values,
+            ),
+            _chunked(environs, chunk_size),
+            max(max_pending, 1),
+        )
+
+
+def _locate_errors(
+    cls: Type[BaseModel], err: ValidationError, *, sources: Tuple[Any, ...]
+) -> ValidationError:
+    return with_errs_locations(cls, err, *sources)
+
+
+def _iter_from_env(
+    cls: Type[T],
+    environs: Iterable[Mapping[str, str]],
+    ignore_restore_errs: bool,
+    values: Mapping[str, Any],
+) -> Iterator[Union[T, ValidationError]]:
+    for environ in environs:
+        try:
+            yield cls.from_env(
+                environ, ignore_restore_errs=ignore_restore_errs, **values
+            )
+        except ValidationError as err:
+            yield err
+
+
+def _build_from_env_chunk(
+    cls: Type[T],
+    environs: List[Mapping[str, str]],
+    *,
+    ignore_restore_errs: bool,
+    values: Mapping[str, Any],
+) -> List[Union[T, ValidationError]]:
+    return list(_iter_from_env(cls, environs, ignore_restore_errs, values))
+
+
+def _iter_from_executor(
+    executor: Executor,
+    build_chunk: Callable[[List[Mapping[str, str]]], List[Any]],
+    chunks: Iterator[List[Mapping[str, str]]],
+    max_pending: int,
+) -> Iterator[Any]:
+    pending: Deque[Future] = deque()
+    try:
+        for chunk in chunks:
+            pending.append(executor.submit(build_chunk, chunk))
+            if len(pending) >= max_pending:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        # iteration stopped early
+        for future in pending:
+            future.cancel()
+
+
+def _chunked(
+    items: Iterable[Mapping[str, str]], size: int
+) -> Iterator[List[Mapping[str, str]]]:
+    items_iter = iter(items)
+    while True:
+        chunk = list(islice(items_iter, size))
+        if not chunk:
+            return
+        yield chunk
@@ -0,0 +1,99 @@
+from typing import Any, Hashable, Mapping, Optional, Type, TypeVar
+
+from pydantic import BaseModel
+
+from pydantic_settings.types import Json
+from pydantic_settings.utils import LRUCache
+
+M = TypeVar('M', bound=BaseModel)
+
+
+class UnhashableInputError(TypeError):
+    """Input document contains values which can't be fingerprinted."""
+
+
+def fingerprint(value: Json) -> Hashable:
+    """
+    Build hashable fingerprint of JSON-like document. Scalar values are
+    tagged with their type, so :code:`1`, :code:`1.0` and :code:`True`
+    (which are equal for python) produce different fingerprints, because
+    *pydantic* may treat them differently.
+
+    :param value: JSON-like document
+    :raises UnhashableInputError: document contains unhashable value of
+        unknown kind
+    :return: hashable fingerprint
+    """
+    if isinstance(value, Mapping):
+        return frozenset((key, fingerprint(val)) for key, val in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(fingerprint(val) for val in value)
+
+    try:
+        hash(value)
+    except TypeError as err:
+        raise UnhashableInputError(
+            f'value of type {type(value)} can\'t be fingerprinted'
+        ) from err
+
+    return type(value), value
+
+
+def _detached(model: M) -> M:
+    if model.__config__.allow_mutation:
+        return model.copy(deep=True)
+    return model
+
+
+class SettingsCache:
+    """
+    Bounded LRU cache of validated models, keyed by model class and a
+    fingerprint of the whole input document, e.g. decoded file content merged
+    with restored environment variables. Cache hit skips validation at all.
+
+    Instances of models with :code:`allow_mutation = False` are shared among
+    all callers, so their mutable values, like lists, must be treated as
+    read-only. Other models are deep-copied on each call, so changes made by
+    one caller are never seen by others, but a hit is less cheap.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self._models: LRUCache[Hashable, BaseModel] = LRUCache(maxsize)
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_validate(self, cls: Type[M], document: Mapping[str, Any]) -> M:
+        """
+        Get validated model from cache or validate the document.
+
+        :param cls: model class
+        :param document: input document
+        :raises ValidationError: in case if the document is invalid, failures
+            are never cached
+        :return: model instance
+        """
+        try:
+            key: Optional[Hashable] = (cls, fingerprint(document))
+        except UnhashableInputError:
+            key = None
+
+        if key is None:
+            self.misses += 1
+            return cls(**document)
+
+        result = self._models.get(key)
+        if result is not None:
+            self.hits += 1
+            return _detached(result)
+
+        self.misses += 1
+        result = cls(**document)
+        self._models.put(key, result)
+        return _detached(result)
+
+    def clear(self) -> None:
+        self._models.clear()
+        self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._models)
@@ -0,0 +1,392 @@
+"""
+Command-line tool, which profiles settings loading, run
+:code:`python -m pydantic_settings --help` for usage.
+
+Settings are loaded by :py:func:`.load_settings` several times, then timings
+of each :py:class:`.LoadProfiler` phase are reported. Exit status is non-zero
+if loading fails or if median loading time exceeds :code:`--max-time`, so the
+tool may guard deploy pipelines against startup regressions.
+"""
+import argparse
+import cProfile
+import importlib
+import json
+import os
+import statistics
+import sys
+import tracemalloc
+from functools import partial
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Sequence, TextIO, Type
+
+from attr import asdict, dataclass
+from pydantic import BaseModel
+from pydantic.utils import lenient_issubclass
+
+from pydantic_settings.decoder import (
+    DecoderNotFoundError,
+    ParsingError,
+    TextValues,
+    get_decoder,
+)
+from pydantic_settings.errors import LoadingError, LoadingValidationError
+from pydantic_settings.load import load_settings
+from pydantic_settings.profiling import LoadProfiler
+from pydantic_settings.types import JsonLocation
+
+TOTAL = 'total'
+
+
+@dataclass
+class TimingSummary:
+    """Statistics of repeated phase or decoder runs."""
+
+    name: str
+    runs: int
+    min: float
+    median: float
+    max: float
+    memory_delta: Optional[int] = None
+    size: Optional[int] = None
+    nodes: Optional[int] = None
+
+
+def import_model(path: str) -> Type[BaseModel]:
+    """
+    Import model class by :code:`"package.module:Class"` path.
+
+    :raises ValueError: path is malformed or doesn't refer a model class
+    :raises ImportError: module can't be imported
+    """
+    module_name, _, qualname = path.partition(':')
+    if not module_name or not qualname:
+        raise ValueError(f'"{path}" isn\'t a "module:Class" path')
+
+    obj: Any = importlib.import_module(module_name)
+    for name in qualname.split('.'):
+        try:
+            obj = getattr(obj, name)
+        except AttributeError:
+            raise ValueError(f'"{path}" isn\'t found') from None
+
+    if not lenient_issubclass(obj, BaseModel):
+        raise ValueError(f'"{path}" isn\'t a model class')
+    return obj
+
+
+def _model_arg(path: str) -> Type[BaseModel]:
+    try:
+        return import_model(path)
+    except (ValueError, ImportError) as err:
+        raise argparse.ArgumentTypeError(str(err))
+
+
+def _root_path_arg(path: str) -> JsonLocation:
+    return tuple(
+        int(part) if part.isdigit() else part for part in path.split('.')
+    )
+
+
+def _summarize(
+    name: str,
+    durations: List[float],
+    memory_deltas: Sequence[Optional[int]] = (),
+    size: int = None,
+    nodes: int = None,
+) -> TimingSummary:
+    memory = [delta for delta in memory_deltas if delta is not None]
+    return TimingSummary(
+        name,
+        len(durations),
+        min(durations),
+        statistics.median(durations),
+        max(durations),
+        int(statistics.median(memory)) if memory else None,
+        size,
+        nodes,
+    )
+
+
+def profile_loading(
+    cls: Type[BaseModel],
+    repeat: int,
+    trace_memory: bool = False,
+    allow_invalid: bool = False,
+    **load_kwargs: Any,
+) -> List[TimingSummary]:
+    """
+    Load settings repeatedly and summarize each phase, phases occurred
+    several times per run, like merging of several sources, are summed up.
+
+    :param cls: settings model class
+    :param repeat: number of runs
+    :param trace_memory: measure memory allocated by each phase
+    :param allow_invalid: profile validation failures, including errors
+        locating, instead of raising them
+    :param load_kwargs: :py:func:`.load_settings` arguments
+    :raises LoadingError: loading failed
+    :return: summaries of phases in order of appearance, followed by summary
+        of whole loading
+    """
+    durations: Dict[str, List[float]] = {}
+    memory_deltas: Dict[str, List[Optional[int]]] = {}
+    sizes: Dict[str, Optional[int]] = {}
+    nodes: Dict[str, Optional[int]] = {}
+    totals: List[float] = []
+
+    for _ in range(repeat):
+        profiler = LoadProfiler(trace_memory=trace_memory)
+        start = perf_counter()
+        try:
+            load_settings(cls, profiler=profiler, **load_kwargs)
+        except LoadingValidationError:
+            if not allow_invalid:
+                raise
+        totals.append(perf_counter() - start)
+
+        run_durations: Dict[str, float] = {}
+        run_memory: Dict[str, Optional[int]] = {}
+        for stats in profiler.phases:
+            run_durations[stats.name] = (
+                run_durations.get(stats.name, 0.0) + stats.duration
+            )
+            if stats.memory_delta is not None:
+                run_memory[stats.name] = (
+                    run_memory.get(stats.name) or 0
+                ) + stats.memory_delta
+            sizes[stats.name] = stats.size
+            nodes[stats.name] = stats.nodes
+
+        for name, duration in run_durations.items():
+            durations.setdefault(name, []).append(duration)
+            memory_deltas.setdefault(name, []).append(run_memory.get(name))
+
+    return [
+        _summarize(
+            name,
+            phase_durations,
+            memory_deltas[name],
+            sizes[name],
+            nodes[name],
+        )
+        for name, phase_durations in durations.items()
+    ] + [_summarize(TOTAL, totals)]
+
+
+def decoder_backends(
+    decoder_name: str,
+) -> Dict[str, Callable[..., TextValues]]:
+    """
+    Get decoders able to decode content of given decoder: *yaml* decoders
+    also decode *json* content. *yaml* is provided by pure python and by
+    *libyaml* based loaders, if it's available.
+    """
+    backends: Dict[str, Callable[..., TextValues]] = {}
+    if decoder_name == 'json':
+        backends['json'] = get_decoder('json').values_loader
+
+    if decoder_name in ('json', 'yaml'):
+        try:
+            import yaml
+        except ImportError:
+            return backends
+
+        from pydantic_settings.decoder.yaml import decode_document
+
+        backends['yaml'] = partial(decode_document, loader_cls=yaml.SafeLoader)
+        if getattr(yaml, '__with_libyaml__', False):
+            backends['yaml-libyaml'] = partial(
+                decode_document, loader_cls=yaml.CSafeLoader
+            )
+
+    return backends
+
+
+def compare_decoders(
+    content: str, decoder_name: str, repeat: int
+) -> List[TimingSummary]:
+    """
+    Time decoding of the whole content by each of
+    :py:func:`decoder_backends`. Locations are resolved lazily by decoders,
+    so only decoding itself is timed. Backends failed to decode the content
+    are omitted.
+    """
+    result = []
+    for name, values_loader in decoder_backends(decoder_name).items():
+        durations = []
+        try:
+            for _ in range(repeat):
+                start = perf_counter()
+                values_loader(content)
+                durations.append(perf_counter() - start)
+        except ParsingError:
+            continue
+        result.append(_summarize(name, durations, size=len(content.encode())))
+    return result
+
+
+def _format_optional(value: Optional[int]) -> str:
+    return '-' if value is None else str(value)
+
+
+def render_report(
+    title: str, summaries: List[TimingSummary], out: TextIO
+) -> None:
+    out.write(f'{title}\n')
+    out.write(
+        f'{"name":<16}{"runs":>6}{"min, ms":>12}{"median, ms":>12}'
+        f'{"max, ms":>12}{"memory, B":>12}{"size, B":>10}{"nodes":>10}\n'
+    )
+    for summary in summaries:
+        out.write(
+            f'{summary.name:<16}{summary.runs:>6}'
+            f'{summary.min * 1000:>12.3f}{summary.median * 1000:>12.3f}'
+            f'{summary.max * 1000:>12.3f}'
+            f'{_format_optional(summary.memory_delta):>12}'
+            f'{_format_optional(summary.size):>10}'
+            f'{_format_optional(summary.nodes):>10}\n'
+        )
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='python -m pydantic_settings',
+        description='Profile settings loading phases.',
+    )
+    parser.add_argument(
+        'model', type=_model_arg, help='settings model, "module:Class"'
+    )
+    parser.add_argument('source', nargs='?', type=Path, help='settings file')
+    parser.add_argument('--type-hint', help='decoder of the settings file')
+    parser.add_argument('--root-path', type=_root_path_arg)
+    parser.add_argument('--document', type=int)
+    parser.add_argument('--interpolate', action='store_true')
+    parser.add_argument('--intern-values', action='store_true')
+    parser.add_argument(
+        '--env', action='store_true', help='load environment variables'
+    )
+    parser.add_argument('--env-prefix', default='APP')
+    parser.add_argument('--env-file', type=Path)
+    parser.add_argument('--secrets-dir', type=Path)
+    parser.add_argument(
+        '-n', '--repeat', type=int, default=10, help='number of runs'
+    )
+    parser.add_argument(
+        '--trace-memory',
+        action='store_true',
+        help='measure memory allocated by each phase',
+    )
+    parser.add_argument(
+        '--allow-invalid',
+        action='store_true',
+        help='profile validation failures instead of reporting them',
+    )
+    parser.add_argument(
+        '--cprofile', type=Path, help='write cProfile stats of all runs'
+    )
+    parser.add_argument(
+        '--compare-decoders',
+        action='store_true',
+        help='time decoding of the settings file by each decoder backend',
+    )
+    parser.add_argument(
+        '--max-time',
+        type=float,
+        help='fail if median loading time exceeds given milliseconds',
+    )
+    parser.add_argument(
+        '--json', action='store_true', help='print report as JSON'
+    )
+    return parser
+
+
+def main(argv: Sequence[str] = None, out: TextIO = None) -> int:
+    """
+    Run command-line tool.
+
+    :param argv: command-line arguments, :py:data:`sys.argv` by default
+    :param out: report output, :py:data:`sys.stdout` by default
+    :return: exit status
+    """
+    out = out or sys.stdout
+    args = _build_parser().parse_args(argv)
+    if args.repeat < 1:
+        sys.stderr.write('repeat must be positive\n')
+        return 2
+
+    load_kwargs: Dict[str, Any] = dict(
+        any_content=args.source,
+        type_hint=args.type_hint,
+        load_env=args.env,
+        env_prefix=args.env_prefix,
+        environ=os.environ,
+        env_file=args.env_file,
+        secrets_dir=args.secrets_dir,
+        root_path=args.root_path or (),
+        document=args.document,
+        interpolate=args.interpolate,
+        intern_values=args.intern_values,
+    )
+
+    profile = cProfile.Profile() if args.cprofile is not None else None
+    stop_tracing = args.trace_memory and not tracemalloc.is_tracing()
+    if stop_tracing:
+        tracemalloc.start()
+    if profile is not None:
+        profile.enable()
+    try:
+        phases = profile_loading(
+            args.model,
+            args.repeat,
+            args.trace_memory,
+            args.allow_invalid,
+            **load_kwargs,
+        )
+    except LoadingError as err:
+        sys.stderr.write(f'{err.render_error()}\n')
+        return 1
+    finally:
+        if profile is not None:
+            profile.disable()
+            profile.dump_stats(str(args.cprofile))
+        if stop_tracing:
+            tracemalloc.stop()
+
+    decoders: List[TimingSummary] = []
+    if args.compare_decoders and args.source is not None:
+        try:
+            decoder_name = get_decoder(
+                args.type_hint or args.source.suffix
+            ).name
+        except DecoderNotFoundError as err:
+            sys.stderr.write(f'{err}\n')
+            return 2
+        decoders = compare_decoders(
+            args.source.read_text(), decoder_name, args.repeat
+        )
+
+    if args.json:
+        json.dump(
+            {
+                'phases': [asdict(summary) for summary in phases],
+                'decoders': [asdict(summary) for summary in decoders],
+            },
+            out,
+            indent=2,
+        )
+        out.write('\n')
+    else:
+        render_report('Loading phases', phases, out)
+        if decoders:
+            out.write('\n')
+            render_report('Decoders', decoders, out)
+
+    total = phases[-1]
+    if args.max_time is not None and total.median * 1000 > args.max_time:
+        sys.stderr.write(
+            f'median loading time {total.median * 1000:.3f} ms exceeds '
+            f'{args.max_time} ms\n'
+        )
+        return 3
+    return 0
@@ -0,0 +1,428 @@
+"""
+Columnar storage of large lists of homogeneous records, e.g. routing tables
+or feature flags lists, see :py:class:`Columnar`.
+"""
+import operator
+from array import array
+from collections.abc import Mapping
+from copy import deepcopy
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    MutableSequence,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+
+from pydantic import BaseModel, Extra, ValidationError
+from pydantic.error_wrappers import ErrorWrapper
+from pydantic.errors import DictError, ExtraError, ListError, MissingError
+from pydantic.fields import SHAPE_SINGLETON, ModelField
+
+M = TypeVar('M', bound=BaseModel)
+
+_ARRAY_TYPECODES = {int: 'q', float: 'd'}
+_IMMUTABLE_VALUES = (
+    int,
+    float,
+    str,
+    bytes,
+    bool,
+    tuple,
+    frozenset,
+    type(None),
+)
+_MISSING = object()
+
+
+def _immutable(method_name: str) -> Callable[..., Any]:
+    def method(self: 'ColumnarList', *args: Any, **kwargs: Any) -> Any:
+        raise TypeError(f'{self.__class__.__name__} is immutable')
+
+    method.__name__ = method_name
+    return method
+
+
+def _restore_columnar_list(
+    model: Type[M],
+    columns: Dict[str, Sequence[Any]],
+    length: int,
+    unset: Dict[str, Set[int]],
+) -> 'ColumnarList[M]':
+    return ColumnarList.from_columns(model, columns, length, unset)
+
+
+class ColumnarList(List[M]):
+    """
+    Immutable list of model records stored column by column: each field
+    values are kept in a single list, or inside :py:class:`array.array`, if
+    all of them are plain integers or floats. It's a :py:class:`list`
+    subclass, so it's serialized by :py:meth:`pydantic.BaseModel.dict` and
+    :py:meth:`pydantic.BaseModel.json` as a plain list, but the underlying
+    list storage is always empty, all list methods are overridden.
+
+    Records are built on access and aren't cached, each record is a detached
+    copy: mutable values like nested lists are copied, and changes of a
+    record aren't written back. Keep a reference to a record instead of
+    indexing the list repeatedly.
+    """
+
+    __slots__ = ('model', '_columns', '_len', '_unset', '_mutable')
+
+    def __new__(cls, iterable: Iterable[Any] = ()) -> Any:  # type: ignore
+        # pydantic rebuilds sequences by calling theirs class with items,
+        # e.g. converting records to dicts, that gives a plain list
+        return list(iterable)
+
+    @classmethod
+    def from_columns(
+        cls,
+        model: Type[M],
+        columns: Dict[str, Sequence[Any]],
+        length: int,
+        unset: Dict[str, Set[int]] = None,
+    ) -> 'ColumnarList[M]':
+        """
+        :param model: records model
+        :param columns: already validated values of each model field
+        :param length: number of records
+        :param unset: indexes of records, which field value is a default
+            one, by field name
+        """
+        self = list.__new__(cls)
+        self.model = model
+        self._columns = columns
+        self._len = length
+        self._unset = unset or {}
+        self._mutable = tuple(
+            name
+            for name, column in columns.items()
+            if not isinstance(column, array)
+            and any(
+                not isinstance(value, _IMMUTABLE_VALUES) for value in column
+            )
+        )
+        return self
+
+    def column(self, name: str) -> Sequence[Any]:
+        """
+        Get values of the field of all records without building them. Values
+        are shared with the list, don't modify them.
+
+        :raises KeyError: there is no such field
+        """
+        return self._columns[name]
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self._record(i) for i in range(*index.indices(self._len))]
+        index = operator.index(index)
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError('record index out of range')
+        return self._record(index)
+
+    def __iter__(self) -> Iterator[M]:
+        return map(self._record, range(self._len))
+
+    def __reversed__(self) -> Iterator[M]:
+        return map(self._record, range(self._len - 1, -1, -1))
+
+    def __contains__(self, item: Any) -> bool:
+        return any(record == item for record in self)
+
+    def index(self, item: Any, *args: Any) -> int:
+        for i in range(*slice(*args).indices(self._len)):
+            if self._record(i) == item:
+                return i
+        raise ValueError(f'{item!r} is not in list')
+
+    def count(self, item: Any) -> int:
+        return sum(1 for record in self if record == item)
+
+    def copy(self) -> List[M]:
+        return list(self)
+
+    def __add__(self, other: Any) -> List[M]:
+        return list(self) + other
+
+    def __radd__(self, other: Any) -> List[M]:
+        return other + list(self)
+
+    def __mul__(self, times: int) -> List[M]:
+        return list(self) * times
+
+    __rmul__ = __mul__
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, ColumnarList):
+            return (
+                self.model is other.model
+                and self._len == other._len
+                and all(
+                    list(column) == list(other._columns[name])
+                    for name, column in self._columns.items()
+                )
+            )
+        if isinstance(other, (list, tuple)):
+            return len(other) == self._len and all(
+                record == item for record, item in zip(self, other)
+            )
+        return NotImplemented
+
+    def __ne__(self, other: Any) -> bool:
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __lt__(self, other: Any) -> bool:
+        return list(self) < other
+
+    def __le__(self, other: Any) -> bool:
+        return list(self) <= other
+
+    def __gt__(self, other: Any) -> bool:
+        return list(self) > other
+
+    def __ge__(self, other: Any) -> bool:
+        return list(self) >= other
+
+    __hash__ = None  # type: ignore
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (
+            _restore_columnar_list,
+            (self.model, self._columns, self._len, self._unset),
+        )
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}[{self.model.__name__}]({self._len})'
+
+    __setitem__ = _immutable('__setitem__')
+    __delitem__ = _immutable('__delitem__')
+    __iadd__ = _immutable('__iadd__')
+    __imul__ = _immutable('__imul__')
+    append = _immutable('append')
+    extend = _immutable('extend')
+    insert = _immutable('insert')
+    remove = _immutable('remove')
+    pop = _immutable('pop')
+    clear = _immutable('clear')
+    sort = _immutable('sort')
+    reverse = _immutable('reverse')
+
+    def _record(self, index: int) -> M:
+        # the same as BaseModel.construct, but defaults are already filled
+        model = self.model
+        record = model.__new__(model)
+        values = {
+            name: column[index] for name, column in self._columns.items()
+        }
+        for name in self._mutable:
+            values[name] = deepcopy(values[name])
+        object.__setattr__(record, '__dict__', values)
+        fields_set = set(self._columns)
+        for name, indexes in self._unset.items():
+            if index in indexes:
+                fields_set.discard(name)
+        object.__setattr__(record, '__fields_set__', fields_set)
+        return record
+
+
+def _pack(field: ModelField, values: List[Any]) -> Sequence[Any]:
+    typecode = _ARRAY_TYPECODES.get(field.outer_type_)
+    if typecode is None or field.shape != SHAPE_SINGLETON:
+        return values
+    value_type = field.outer_type_
+    # bool values are integers too, but they must stay bool
+    if any(value.__class__ is not value_type for value in values):
+        return values
+    try:
+        return array(typecode, values)
+    except OverflowError:
+        return values
+
+
+def _row_values(row: Any, model: Type[BaseModel]) -> Mapping:
+    if isinstance(row, Mapping):
+        return row
+    if isinstance(row, model):
+        return {name: row.__dict__[name] for name in row.__fields_set__}
+    raise DictError()
+
+
+def validate_records(model: Type[M], value: Any) -> ColumnarList[M]:
+    """
+    Validate list of records column by column: values of each field are
+    validated by the field of the model one after another, then packed.
+
+    Field validators receive values of preceding fields of the record, as
+    usual. Errors locations are :code:`(index, field_alias)`, the same as
+    for a list of models, so they are located inside the source document.
+
+    :raises ValidationError: some records are invalid
+    """
+    if isinstance(value, ColumnarList) and value.model is model:
+        return value
+    if not isinstance(value, (list, tuple)):
+        raise ListError()
+
+    config = model.__config__
+    errors: List[ErrorWrapper] = []
+    rows: List[Optional[Mapping]] = []
+    for idx, row in enumerate(value):
+        try:
+            rows.append(_row_values(row, model))
+        except DictError as exc:
+            errors.append(ErrorWrapper(exc, loc=(idx,)))
+            rows.append(None)
+
+    fields = model.__fields__
+    needs_values = any(field.class_validators for field in fields.values())
+    rows_values: List[Dict[str, Any]] = (
+        [{} for _ in rows] if needs_values else []
+    )
+    columns: Dict[str, Sequence[Any]] = {}
+    unset: Dict[str, Set[int]] = {}
+    for name, field in fields.items():
+        alias = field.alias
+        by_name = config.allow_population_by_field_name and alias != name
+        default = field.default
+        copy_default = not isinstance(default, _IMMUTABLE_VALUES)
+        column: MutableSequence[Any] = []
+        for idx, row in enumerate(rows):
+            if row is None:
+                column.append(None)
+                continue
+
+            raw = row.get(alias, _MISSING)
+            if raw is _MISSING and by_name:
+                raw = row.get(name, _MISSING)
+            if raw is _MISSING:
+                if field.required:
+                    errors.append(
+                        ErrorWrapper(MissingError(), loc=(idx, alias))
+                    )
+                    column.append(None)
+                    continue
+                unset.setdefault(name, set()).add(idx)
+                column.append(deepcopy(default) if copy_default else default)
+                continue
+
+            validated, errs = field.validate(
+                raw,
+                rows_values[idx] if needs_values else {},
+                loc=(idx, alias),
+                cls=model,
+            )
+            if errs:
+                errors.append(errs)
+            elif needs_values:
+                rows_values[idx][name] = validated
+            column.append(validated)
+        columns[name] = column
+
+    if config.extra == Extra.forbid:
+        known = {field.alias for field in fields.values()}
+        if config.allow_population_by_field_name:
+            known.update(fields)
+        for idx, row in enumerate(rows):
+            for key in row or ():
+                if key not in known:
+                    errors.append(ErrorWrapper(ExtraError(), loc=(idx, key)))
+
+    if errors:
+        raise ValidationError(errors, model)
+
+    return ColumnarList.from_columns(
+        model,
+        {
+            name: _pack(fields[name], column)
+            for name, column in columns.items()
+        },
+        len(rows),
+        unset,
+    )
+
+
+class _ColumnarMeta(type):
+    _types: Dict[Type[BaseModel], Type['Columnar']] = {}
+
+    def __getitem__(cls, model: Type[BaseModel]) -> Type['Columnar']:
+        columnar_type = cls._types.get(model)
+        if columnar_type is not None:
+            return columnar_type
+
+        if not (isinstance(model, type) and issubclass(model, BaseModel)):
+            raise TypeError(f'{model} is not a pydantic model')
+        if model.__pre_root_validators__ or model.__post_root_validators__:
+            raise TypeError(
+                f'{model.__name__} has root validators, which need whole '
+                f'records'
+            )
+        if model.__config__.extra == Extra.allow:
+            raise TypeError(
+                f'{model.__name__} allows extra fields, which have no '
+                f'columns'
+            )
+
+        columnar_type = _ColumnarMeta(
+            f'{cls.__name__}[{model.__name__}]',
+            (cls,),
+            {'__columnar_model__': model},
+        )
+        cls._types[model] = columnar_type
+        return columnar_type
+
+
+class Columnar(metaclass=_ColumnarMeta):
+    """
+    Field type of a large list of records, e.g. :code:`Columnar[Upstream]`,
+    which is validated column by column and stored as
+    :py:class:`ColumnarList`. Numeric columns take 8 bytes per record
+    instead of a boxed number, and there is no model instance per record
+    until it's accessed. Default value is validated too, so the field is
+    always a :py:class:`ColumnarList`.
+
+    Items are addressed by environment variables and located by errors
+    exactly like items of :code:`List[Upstream]`, the JSON schema is the
+    same too. Models with root validators or allowing extra fields aren't
+    supported.
+    """
+
+    __columnar_model__: Optional[Type[BaseModel]] = None
+    """
+    Records model, an attribute checked by
+    :py:func:`.utils.get_sequence_item_type`.
+    """
+
+    validate_always = True
+
+    @classmethod
+    def __get_validators__(cls) -> Iterator[Any]:
+        yield cls.validate
+
+    @classmethod
+    def __modify_schema__(cls, field_schema: Dict[str, Any]) -> None:
+        model = cls.__columnar_model__
+        if model is not None:
+            field_schema.update(type='array', items=model.schema())
+
+    @classmethod
+    def validate(cls, value: Any) -> ColumnarList:
+        model = cls.__columnar_model__
+        if model is None:
+            raise TypeError('model of records is not specified')
+        return validate_records(model, value)
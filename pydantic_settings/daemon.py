@@ -0,0 +1,255 @@
+"""
+Local settings server, which loads and validates settings once and serves
+snapshots to short-lived processes over a Unix domain socket.
+
+Snapshots are transferred pickled, so only a socket owned by the current
+user or by root is trusted by :py:func:`fetch_settings`.
+"""
+import os
+import pickle
+import socket
+import socketserver
+import struct
+from pathlib import Path
+from threading import Lock
+from typing import Any, Optional, Tuple, Type, TypeVar, Union
+
+from pydantic import BaseModel
+
+from pydantic_settings.errors import LoadingError
+from pydantic_settings.load import load_settings
+from pydantic_settings.snapshot import schema_hash
+from pydantic_settings.utils import LRUCache
+
+M = TypeVar('M', bound=BaseModel)
+
+_OK = b'+'
+_FAIL = b'-'
+_RESPONSE_HEADER = struct.Struct('<cI')
+
+_schema_hashes: LRUCache[Type[BaseModel], str] = LRUCache(64)
+
+
+def _model_name(cls: Type[BaseModel]) -> str:
+    return f'{cls.__module__}:{cls.__qualname__}'
+
+
+def _schema_hash(cls: Type[BaseModel]) -> str:
+    result = _schema_hashes.get(cls)
+    if result is None:
+        result = schema_hash(cls).hex()
+        _schema_hashes.put(cls, result)
+    return result
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+    while size > 0:
+        chunk = sock.recv(size)
+        if not chunk:
+            raise ConnectionError('connection closed by the daemon')
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+class _SourceStamp:
+    __slots__ = ('path', 'stamp')
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.stamp = self.current()
+
+    def current(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    server: '_UnixServer'
+
+    def handle(self) -> None:
+        name, _, model_hash = (
+            self.rfile.readline().decode().strip().partition(' ')
+        )
+        status, payload = self.server.daemon.get_snapshot(name, model_hash)
+        self.wfile.write(_RESPONSE_HEADER.pack(status, len(payload)))
+        self.wfile.write(payload)
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, daemon: 'SettingsDaemon'):
+        self.daemon = daemon
+        super().__init__(path, _RequestHandler)
+
+    def server_bind(self) -> None:
+        # socket is created accessible by the owner only, there is no window
+        # other users might connect in, umask is process-wide though
+        old_umask = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(old_umask)
+
+
+class SettingsDaemon:
+    """
+    Serves settings loaded by :py:func:`.load_settings` over a Unix domain
+    socket. Settings file, if provided as a :py:class:`pathlib.Path`, is
+    watched: it's modification is checked on each request, and settings are
+    reloaded if it has been changed. The last valid snapshot keeps being
+    served if reloading fails.
+
+    Environment variables are taken from the daemon process.
+    """
+
+    def __init__(
+        self,
+        socket_path: Union[str, Path],
+        cls: Type[BaseModel],
+        any_content: Any = None,
+        **load_kwargs: Any,
+    ):
+        """
+        :param socket_path: path of Unix socket to listen on
+        :param cls: settings model class
+        :param any_content: settings content, see :py:func:`.load_settings`
+        :param load_kwargs: other :py:func:`.load_settings` arguments
+        :raises LoadingError: initial loading failed
+        """
+        self.cls = cls
+        self._model_hash = _schema_hash(cls)
+        self._any_content = any_content
+        self._load_kwargs = load_kwargs
+        self._source = (
+            _SourceStamp(any_content)
+            if isinstance(any_content, Path)
+            else None
+        )
+        self._lock = Lock()
+        self._payload = self._load()
+
+        self.socket_path = str(socket_path)
+        self._server = _UnixServer(self.socket_path, self)
+
+    def _load(self) -> bytes:
+        model = load_settings(self.cls, self._any_content, **self._load_kwargs)
+        return pickle.dumps(model, pickle.HIGHEST_PROTOCOL)
+
+    def get_snapshot(
+        self, model_name: str, model_hash: str
+    ) -> Tuple[bytes, bytes]:
+        """
+        :param model_name: requested model, :code:`"module:Class"`
+        :param model_hash: requested model schema hash, see
+            :py:func:`.snapshot.schema_hash`, so clients built against
+            other schema of the model don't get stale snapshots
+        :return: status and pickled model or error message
+        """
+        if model_name != _model_name(self.cls):
+            return _FAIL, f'daemon serves "{_model_name(self.cls)}"'.encode()
+        if model_hash != self._model_hash:
+            return _FAIL, b'daemon serves other schema of the model'
+
+        source = self._source
+        if source is not None and source.current() != source.stamp:
+            with self._lock:
+                stamp = source.current()
+                if stamp != source.stamp:
+                    try:
+                        self._payload = self._load()
+                    except LoadingError:
+                        pass
+                    source.stamp = stamp
+
+        return _OK, self._payload
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def shutdown(self) -> None:
+        """
+        Stop :py:meth:`serve_forever` loop, must be called from another
+        thread.
+        """
+        self._server.shutdown()
+
+    def close(self) -> None:
+        self._server.server_close()
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self) -> 'SettingsDaemon':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+def _fetch_snapshot(
+    cls: Type[M], socket_path: str, timeout: float
+) -> Optional[M]:
+    try:
+        owner = os.stat(socket_path).st_uid
+    except OSError:
+        return None
+    if owner not in (os.getuid(), 0):
+        return None
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        try:
+            sock.connect(socket_path)
+            sock.sendall(
+                f'{_model_name(cls)} {_schema_hash(cls)}\n'.encode()
+            )
+            status, size = _RESPONSE_HEADER.unpack(
+                _recv_exactly(sock, _RESPONSE_HEADER.size)
+            )
+            payload = _recv_exactly(sock, size)
+        except OSError:
+            return None
+
+    if status != _OK:
+        return None
+    try:
+        result = pickle.loads(payload)
+    except Exception:
+        # e.g. truncated payload or classes missing in this process
+        return None
+    return result if type(result) is cls else None
+
+
+def fetch_settings(
+    cls: Type[M],
+    socket_path: Union[str, Path],
+    any_content: Any = None,
+    *,
+    timeout: float = 1.0,
+    **load_kwargs: Any,
+) -> M:
+    """
+    Fetch prevalidated settings from :py:class:`SettingsDaemon` in a single
+    round trip, or load them locally by :py:func:`.load_settings` if the
+    daemon isn't available, serves another model or another schema of the
+    model, or its snapshot can't be unpickled.
+
+    :param cls: settings model class
+    :param socket_path: daemon socket path
+    :param any_content: settings content used for local loading
+    :param timeout: daemon response timeout in seconds
+    :param load_kwargs: other :py:func:`.load_settings` arguments
+    :raises LoadingError: local loading failed
+    :return: settings model instance
+    """
+    result = _fetch_snapshot(cls, str(socket_path), timeout)
+    if result is None:
+        result = load_settings(cls, any_content, **load_kwargs)
+    return result
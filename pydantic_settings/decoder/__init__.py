@@ -1,7 +1,7 @@
 """
 *yaml*, *json* and *toml* decoders providing source value location.
 """
-from typing import Callable, TextIO, Union
+from typing import Callable
 
 from attr import dataclass
 
@@ -19,7 +19,7 @@ class DecoderMeta:
     """Decoder matadata"""
 
     name: str
-    values_loader: Callable[[Union[str, TextIO]], TextValues]
+    values_loader: Callable[..., TextValues]
 
 
 def _get_json() -> DecoderMeta:
@@ -40,6 +40,15 @@ class TextValues(Dict[str, Json]):
         super().__init__(**values)
         self.location_finder = finder
 
+    def __reduce__(self):
+        return (
+            TextValues,
+            (self.location_finder,),
+            None,
+            None,
+            iter(self.items()),
+        )
+
     def get_location(self, val_loc: JsonLocation) -> TextLocation:
         return self.location_finder.get_location(val_loc)
 
@@ -59,3 +68,32 @@ class ParsingError(ValueError):
     def __init__(self, cause: Exception, text_location: TextLocation = None):
         self.cause = cause
         self.text_location: Optional[TextLocation] = text_location
+
+
+INTERNED_VALUE_MAX_LEN = 32
+"""
+Max length of string values, which are interned by decoders if
+:code:`intern_values` option is enabled.
+"""
+
+
+def intern_string_values(document: Json, memo: Dict[str, str]) -> None:
+    """
+    Replace short string values of decoded document by equal strings stored
+    in the memo, so repeated values share single object. Document is changed
+    in-place.
+
+    :param document: decoded document
+    :param memo: strings memo, which is usually shared by single document
+    """
+    memo_get = memo.setdefault
+    pending = [document]
+    while pending:
+        node = pending.pop()
+        items = node.items() if isinstance(node, dict) else enumerate(node)
+        for key, value in items:
+            if isinstance(value, str):
+                if len(value) <= INTERNED_VALUE_MAX_LEN:
+                    node[key] = memo_get(value, value)
+            elif isinstance(value, (dict, list)):
+                pending.append(value)
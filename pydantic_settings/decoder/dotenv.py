@@ -0,0 +1,130 @@
+"""
+Decoder of *dotenv* files, which produces flat mapping of variables names to
+theirs values, suitable for :py:meth:`.ModelShapeRestorer.restore`.
+
+Supported syntax is a common subset of *dotenv* implementations: optional
+:code:`export` keyword, unquoted values with trailing comments, raw single
+quoted values and double quoted values with backslash escapes. Quoted values
+may span several lines. Variables aren't expanded.
+"""
+import re
+from typing import Dict
+
+from pydantic_settings.types import JsonLocation, TextLocation
+
+from .common import ParsingError, TextValues
+
+_LINE = re.compile(
+    r"""
+    [ \t]*
+    (?:
+        (?:export[ \t]+)?
+        (?P<key>[A-Za-z_][A-Za-z0-9_.\-]*)
+        [ \t]*=
+        (?:
+            [ \t]*'(?P<single>[^']*)'(?:[ \t\r]+\#[^\n]*)?[ \t\r]*
+            | [ \t]*"(?P<double>(?:[^"\\]|\\.)*)"(?:[ \t\r]+\#[^\n]*)?[ \t\r]*
+            | (?![ \t]*['"])(?P<plain>[^\n]*)
+        )
+        | (?:\#[^\n]*)?[ \t\r]*
+    )
+    (?:\n|\Z)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+_INLINE_COMMENT = re.compile(r'[ \t]#')
+_ESCAPE = re.compile(r'\\(.)', re.DOTALL)
+_ESCAPES = {'n': '\n', 'r': '\r', 't': '\t'}
+
+
+def _unescape(match: 're.Match[str]') -> str:
+    char = match.group(1)
+    return _ESCAPES.get(char, char)
+
+
+class _LocationFinder:
+    def __init__(self, locations: Dict[str, TextLocation]):
+        self._locations = locations
+
+    def get_location(self, key: JsonLocation) -> TextLocation:
+        if len(key) != 1:
+            raise KeyError(key)
+        return self._locations[key[0]]
+
+
+def decode_document(content: str) -> TextValues:
+    """
+    Decode *dotenv* content in a single pass. Values of repeated variables
+    override previous ones.
+
+    :param content: *dotenv* content
+    :raises ParsingError: in case of malformed line
+    :return: variables values, which location is a location of value text
+        without quotes
+    """
+    values: Dict[str, str] = {}
+    locations: Dict[str, TextLocation] = {}
+    line = 1
+    line_start = 0
+    pos = 0
+    content_len = len(content)
+    while pos < content_len:
+        match = _LINE.match(content, pos)
+        if match is None:
+            line_end = content.find('\n', pos)
+            if line_end < 0:
+                line_end = content_len
+            raise ParsingError(
+                ValueError('malformed line'),
+                TextLocation(
+                    line,
+                    pos - line_start + 1,
+                    line,
+                    line_end - line_start + 1,
+                    pos,
+                    line_end,
+                ),
+            )
+
+        key = match.group('key')
+        if key is not None:
+            if match.group('single') is not None:
+                value = match.group('single')
+                start, end = match.span('single')
+            elif match.group('double') is not None:
+                value = match.group('double')
+                start, end = match.span('double')
+                if '\\' in value:
+                    value = _ESCAPE.sub(_unescape, value)
+            else:
+                start, end = match.span('plain')
+                comment = _INLINE_COMMENT.search(content, start, end)
+                if comment is not None:
+                    end = comment.start()
+                value = content[start:end].lstrip(' \t')
+                start = end - len(value)
+                value = value.rstrip(' \t\r')
+                end = start + len(value)
+
+            newlines = content.count('\n', start, end)
+            if newlines:
+                end_line = line + newlines
+                end_col = end - content.rfind('\n', start, end)
+            else:
+                end_line = line
+                end_col = end - line_start + 1
+
+            values[key] = value
+            locations[key] = TextLocation(
+                line, start - line_start + 1, end_line, end_col, start, end
+            )
+            line = end_line
+            line_start = end - end_col + 1
+
+        pos = match.end()
+        if match.group().endswith('\n'):
+            line += 1
+            line_start = pos
+
+    return TextValues(_LocationFinder(locations), **values)
@@ -1,8 +1,9 @@
 import copy
 import json
 import json.scanner
+import re
 from functools import partial, wraps
-from typing import Any, Callable, Dict, List, TextIO, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, TextIO, Tuple, Union
 
 from attr import dataclass
 
@@ -14,6 +15,7 @@ from .common import (
     MappingExpectError,
     ParsingError,
     TextValues,
+    intern_string_values,
 )
 
 
@@ -158,28 +160,138 @@ load = partial(json.load, cls=ASTDecoder)
 loads = partial(json.loads, cls=ASTDecoder)
 
 
-def decode_document(content: Union[str, TextIO]) -> TextValues:
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+# built-in scanner, it's implemented in C if available
+_scan_once = json.scanner.make_scanner(json.JSONDecoder())
+
+
+def _skip_ws(s: str, idx: int) -> int:
+    return _WHITESPACE.match(s, idx).end()
+
+
+def _skip_value(s: str, idx: int) -> int:
+    try:
+        _, end = _scan_once(s, idx)
+    except StopIteration as err:
+        raise json.JSONDecodeError('Expecting value', s, err.value)
+    return end
+
+
+def _expect(s: str, idx: int, sym: str) -> int:
+    if not s.startswith(sym, idx):
+        raise json.JSONDecodeError(f'Expecting \'{sym}\'', s, idx)
+    return _skip_ws(s, idx + 1)
+
+
+def _find_item(s: str, root_path: JsonLocation) -> int:
+    """
+    Find position of the value located by the path. Other values are skipped
+    by built-in scanner, so neither locations nor *ASTs* are built for them.
+    Mappings are scanned up to the end, so the last of duplicated keys wins,
+    as it does for built-in decoder.
+    """
+    idx = _skip_ws(s, 0)
+    for part_num, key_part in enumerate(root_path):
+        is_mapping = isinstance(key_part, str)
+        closing = '}' if is_mapping else ']'
+        if not s.startswith('{' if is_mapping else '[', idx):
+            error_cls = MappingExpectError if is_mapping else ListExpectError
+            raise error_cls(root_path, part_num)
+
+        idx = _skip_ws(s, idx + 1)
+        item_num = 0
+        found: Optional[int] = None
+        while not s.startswith(closing, idx):
+            if is_mapping:
+                if not s.startswith('"', idx):
+                    raise json.JSONDecodeError(
+                        'Expecting property name enclosed in double quotes',
+                        s,
+                        idx,
+                    )
+                key, idx = json.decoder.scanstring(s, idx + 1)
+                idx = _expect(s, _skip_ws(s, idx), ':')
+                if key == key_part:
+                    found = idx
+            elif item_num == key_part:
+                found = idx
+                break
+            else:
+                item_num += 1
+
+            idx = _skip_ws(s, _skip_value(s, idx))
+            if not s.startswith(closing, idx):
+                idx = _expect(s, idx, ',')
+
+        if found is None:
+            raise LocationLookupError(root_path, part_num)
+        idx = found
+
+    return idx
+
+
+def decode_document(
+    content: Union[str, TextIO],
+    *,
+    root_path: JsonLocation = (),
+    intern_values: bool = False,
+) -> TextValues:
+    """
+    Decode JSON document. Values are decoded by fast built-in decoder, while
+    values locations are recovered lazily using :py:class:`ASTDecoder` only
+    when some location is requested. Built-in decoder already shares equal
+    mapping keys within a document.
+
+    :param content: document content
+    :param root_path: decode only value located by the path, while the rest
+        of the document is only scanned, resulting locations are relative to
+        that value
+    :param intern_values: share equal short string values, see
+        :py:func:`.intern_string_values`
+    """
+    if not isinstance(content, str):
+        content = content.read()
+
     try:
-        if isinstance(content, str):
-            tree = loads(content)
+        if root_path:
+            start = _find_item(content, root_path)
+            values, _ = json.JSONDecoder().raw_decode(content, start)
         else:
-            tree = load(content)
+            start = 0
+            values = json.loads(content)
+    except LocationLookupError as err:
+        raise ParsingError(err, None)
     except json.JSONDecodeError as err:
         raise ParsingError(
             err, TextLocation(err.lineno, err.colno, -1, -1, err.pos, -1)
         )
 
-    if not isinstance(tree.value, dict):
+    if not isinstance(values, dict):
         raise ParsingError(
             ValueError('document root item must be a mapping'), None
         )
 
-    return TextValues(_LocationFinder(tree), **tree.get_json_value())
+    if intern_values:
+        intern_string_values(values, {})
+    return TextValues(_LocationFinder(content, start), **values)
 
 
 class _LocationFinder:
-    def __init__(self, root_item: ASTItem):
-        self.root_item = root_item
+    def __init__(self, content: str, start: int = 0):
+        self._content = content
+        self._start = start
+        self._root_item: Optional[ASTItem] = None
+
+    @property
+    def root_item(self) -> ASTItem:
+        if self._root_item is None:
+            if self._start == 0:
+                self._root_item = loads(self._content)
+            else:
+                self._root_item, _ = ASTDecoder().raw_decode(
+                    self._content, self._start
+                )
+        return self._root_item
 
     def get_location(self, key: JsonLocation) -> TextLocation:
         try:
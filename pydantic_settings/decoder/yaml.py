@@ -1,12 +1,25 @@
+import hashlib
 import io
-from typing import TextIO, Union
+import re
+from typing import (
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Set,
+    TextIO,
+    Tuple,
+    Union,
+)
 
 import yaml
 
-from pydantic_settings.types import JsonLocation
+from pydantic_settings.types import JsonDict, JsonLocation
+from pydantic_settings.utils import LRUCache
 
 from .. import TextLocation
 from .common import (
+    INTERNED_VALUE_MAX_LEN,
     ListExpectError,
     LocationLookupError,
     MappingExpectError,
@@ -14,10 +27,13 @@ from .common import (
     TextValues,
 )
 
+_STR_TAG = 'tag:yaml.org,2002:str'
+
 
 class _LocationFinder:
-    def __init__(self, root_node: yaml.Node):
+    def __init__(self, root_node: yaml.Node, offset: '_DocumentStart' = None):
         self._node = root_node
+        self._offset = offset or (0, 0)
 
     def get_location(self, key: JsonLocation) -> TextLocation:
         try:
@@ -25,13 +41,14 @@ class _LocationFinder:
         except LocationLookupError as err:
             raise KeyError(key) from err
 
+        pos, line = self._offset
         return TextLocation(
-            node.start_mark.line + 1,
+            line + node.start_mark.line + 1,
             node.start_mark.column + 1,
-            node.end_mark.line + 1,
+            line + node.end_mark.line + 1,
             node.end_mark.column + 1,
-            node.start_mark.pointer,
-            node.end_mark.pointer,
+            pos + node.start_mark.index,
+            pos + node.end_mark.index,
         )
 
     def _lookup_node_by_loc(self, key: JsonLocation) -> yaml.Node:
@@ -54,7 +71,7 @@ class _LocationFinder:
                 if not isinstance(curr_node, yaml.SequenceNode):
                     raise ListExpectError(key, part_num)
 
-                if len(curr_node.value) < key_part:
+                if key_part < len(curr_node.value):
                     new_node = curr_node.value[key_part]
 
             if new_node is curr_node:
@@ -64,29 +81,179 @@ class _LocationFinder:
         return curr_node
 
 
-def decode_document(
-    content: Union[str, TextIO], *, loader_cls=yaml.SafeLoader
-) -> TextValues:
-    if isinstance(content, str):
-        stream = io.StringIO(content)
+_COLLECTION_START = (yaml.MappingStartEvent, yaml.SequenceStartEvent)
+_COLLECTION_END = (yaml.MappingEndEvent, yaml.SequenceEndEvent)
+
+
+def _skip_node(loader: yaml.Loader) -> None:
+    depth = 0
+    while True:
+        event = loader.get_event()
+        if isinstance(event, _COLLECTION_START):
+            depth += 1
+        elif isinstance(event, _COLLECTION_END):
+            depth -= 1
+        if depth == 0:
+            return
+
+
+def _select_node(
+    loader: yaml.Loader, root_path: JsonLocation
+) -> Optional[yaml.Node]:
+    """
+    Compose only node located by the root path, other nodes are skipped on
+    the parser events level. Aliases of anchors defined inside skipped nodes
+    can't be resolved.
+    """
+    loader.get_event()  # stream start
+    if loader.check_event(yaml.StreamEndEvent):
+        return None
+    loader.get_event()  # document start
+    loader.anchors = {}
+
+    for part_num, key_part in enumerate(root_path):
+        if isinstance(key_part, str):
+            if not loader.check_event(yaml.MappingStartEvent):
+                raise MappingExpectError(root_path, part_num)
+            loader.get_event()
+            while True:
+                if loader.check_event(yaml.MappingEndEvent):
+                    raise LocationLookupError(root_path, part_num)
+                is_found = (
+                    loader.check_event(yaml.ScalarEvent)
+                    and loader.peek_event().value == key_part
+                )
+                _skip_node(loader)
+                if is_found:
+                    break
+                _skip_node(loader)
+        else:
+            if not loader.check_event(yaml.SequenceStartEvent):
+                raise ListExpectError(root_path, part_num)
+            loader.get_event()
+            for _ in range(key_part):
+                if loader.check_event(yaml.SequenceEndEvent):
+                    raise LocationLookupError(root_path, part_num)
+                _skip_node(loader)
+            if loader.check_event(yaml.SequenceEndEvent):
+                raise LocationLookupError(root_path, part_num)
+
+    return loader.compose_node(None, None)
+
+
+# position and line number of the document start inside a stream
+_DocumentStart = Tuple[int, int]
+
+
+_DOCUMENT_MARKER = re.compile(r'^---(?=[ \t\r\n]|$)', re.MULTILINE)
+
+_documents_index: LRUCache[bytes, Tuple[_DocumentStart, ...]] = LRUCache(16)
+
+DocumentSelector = Union[int, Callable[[JsonDict], bool]]
+
+
+def _has_content(text: str) -> bool:
+    return any(
+        line and not line.startswith(('#', '%'))
+        for line in (line.strip() for line in text.splitlines())
+    )
+
+
+def _index_documents(content: str) -> Tuple[_DocumentStart, ...]:
+    """
+    Find documents starts by scanning for document markers, without
+    parsing. Index is cached for repeated loads of the same content, keyed
+    by the content digest, so the cache doesn't keep contents alive.
+    """
+    digest = hashlib.sha256(content.encode()).digest()
+    index = _documents_index.get(digest)
+    if index is not None:
+        return index
+
+    starts: List[_DocumentStart] = []
+    line = pos = 0
+    for match in _DOCUMENT_MARKER.finditer(content):
+        line += content.count('\n', pos, match.start())
+        pos = match.start()
+        starts.append((pos, line))
+
+    if not starts:
+        starts.append((0, 0))
+    elif _has_content(content[: starts[0][0]]):
+        starts.insert(0, (0, 0))
     else:
-        stream = content
+        # directives and comments belong to the first document
+        starts[0] = (0, 0)
+
+    index = tuple(starts)
+    _documents_index.put(digest, index)
+    return index
 
+
+def _intern_nodes(root_node: yaml.Node, intern_values: bool) -> None:
+    """
+    Make equal mapping keys, and optionally short string values, of
+    composed document share single string before the document is
+    constructed, so both nodes and constructed values refer to it.
+    """
+    memo: Dict[str, str] = {}
+    memo_get = memo.setdefault
+    seen: Set[int] = set()
+    pending = [root_node]
+    while pending:
+        node = pending.pop()
+        # aliased nodes are shared and might be recursive
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+
+        if isinstance(node, yaml.MappingNode):
+            for key_node, value_node in node.value:
+                if isinstance(key_node, yaml.ScalarNode):
+                    key_node.value = memo_get(key_node.value, key_node.value)
+                else:
+                    pending.append(key_node)
+                pending.append(value_node)
+        elif isinstance(node, yaml.SequenceNode):
+            pending.extend(node.value)
+        elif (
+            intern_values
+            and node.tag == _STR_TAG
+            and len(node.value) <= INTERNED_VALUE_MAX_LEN
+        ):
+            node.value = memo_get(node.value, node.value)
+
+
+def _decode_single(
+    stream: Union[str, TextIO],
+    loader_cls: type,
+    root_path: JsonLocation,
+    offset: _DocumentStart = None,
+    intern_values: bool = False,
+) -> TextValues:
     loader = loader_cls(stream)
+    pos, line = offset or (0, 0)
 
     try:
-        root_node = loader.get_single_node()
+        if root_path:
+            root_node = _select_node(loader, root_path)
+        else:
+            root_node = loader.get_single_node()
+        if root_node is not None:
+            _intern_nodes(root_node, intern_values)
         values = loader.construct_document(root_node)
+    except LocationLookupError as err:
+        raise ParsingError(err, None)
     except yaml.YAMLError as err:
         if not isinstance(err, yaml.MarkedYAMLError):
             loc = None
         else:
             loc = TextLocation(
-                err.problem_mark.line + 1,
+                line + err.problem_mark.line + 1,
                 err.problem_mark.column + 1,
                 -1,
                 -1,
-                err.problem_mark.pointer,
+                pos + err.problem_mark.index,
                 -1,
             )
 
@@ -99,4 +266,85 @@ def decode_document(
             ValueError('document root item must be a mapping'), None
         )
 
-    return TextValues(_LocationFinder(root_node), **values)
+    return TextValues(_LocationFinder(root_node, offset), **values)
+
+
+def _decode_selected(
+    content: str,
+    loader_cls: type,
+    root_path: JsonLocation,
+    document: DocumentSelector,
+    intern_values: bool,
+) -> TextValues:
+    index = _index_documents(content)
+    if isinstance(document, int):
+        try:
+            candidates = [index[document]]
+        except IndexError:
+            raise ParsingError(
+                IndexError(
+                    f'stream contains {len(index)} documents, '
+                    f'but document {document} requested'
+                ),
+                None,
+            )
+    else:
+        candidates = list(index)
+
+    ends = {start: end for start, (end, _) in zip(index, index[1:])}
+    for start in candidates:
+        pos, line = start
+        end = ends.get(start, len(content))
+        values = _decode_single(
+            content[pos:end], loader_cls, root_path, start, intern_values
+        )
+        if isinstance(document, int):
+            return values
+        try:
+            is_selected = document(values)
+        except Exception as err:
+            raise ParsingError(err, TextLocation(line + 1, 1, -1, -1, pos, -1))
+        if is_selected:
+            return values
+
+    raise ParsingError(LookupError('no document matches the predicate'))
+
+
+def decode_document(
+    content: Union[str, TextIO],
+    *,
+    loader_cls=yaml.SafeLoader,
+    root_path: JsonLocation = (),
+    document: DocumentSelector = None,
+    intern_values: bool = False,
+) -> TextValues:
+    """
+    Decode YAML document. Equal mapping keys of the document share single
+    string.
+
+    :param content: document content
+    :param loader_cls: *PyYAML* loader class
+    :param root_path: decode only value located by the path, while the rest
+        of the document is only scanned, resulting locations are relative to
+        that value
+    :param document: select document of multi-document stream either by
+        index, or by predicate applied to each decoded document until the
+        first match, predicate errors are raised as :py:class:`ParsingError`
+        located at the document start. Documents before the selected one
+        aren't parsed, they are found by scanning for :code:`---` markers.
+        Single-document stream is required by default
+    :param intern_values: share equal short string values as well, see
+        :py:data:`.INTERNED_VALUE_MAX_LEN`
+    """
+    if document is None:
+        if isinstance(content, str):
+            content = io.StringIO(content)
+        return _decode_single(
+            content, loader_cls, root_path, intern_values=intern_values
+        )
+
+    if not isinstance(content, str):
+        content = content.read()
+    return _decode_selected(
+        content, loader_cls, root_path, document, intern_values
+    )
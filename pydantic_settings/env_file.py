@@ -0,0 +1,128 @@
+"""
+Settings source of a *dotenv* file, which variables are applied the same way
+as environment variables, but keep locations inside the file.
+"""
+from pathlib import Path
+from typing import Optional, Union
+
+import attr
+
+from pydantic_settings.decoder import (
+    DecoderMeta,
+    ParsingError,
+    TextValues,
+    dotenv,
+)
+from pydantic_settings.errors import LoadingError, LoadingParseError
+from pydantic_settings.restorer import (
+    FlatMapValues,
+    InvalidAssignError,
+    ModelShapeRestorer,
+)
+from pydantic_settings.types import JsonLocation, TextLocation
+
+DECODER = DecoderMeta('dotenv', dotenv.decode_document)
+
+
+def _inner_location(
+    value_loc: TextLocation, inner_loc: TextLocation
+) -> TextLocation:
+    line = value_loc.line + inner_loc.line - 1
+    end_line = value_loc.line + inner_loc.end_line - 1
+    col_shift = value_loc.col - 1
+    return attr.evolve(
+        inner_loc,
+        line=line,
+        col=inner_loc.col + (col_shift if inner_loc.line == 1 else 0),
+        end_line=end_line,
+        end_col=inner_loc.end_col + (col_shift if end_line == line else 0),
+        pos=value_loc.pos + inner_loc.pos,
+        end_pos=value_loc.pos + inner_loc.end_pos,
+    )
+
+
+def _variable_location(
+    variables: TextValues,
+    var_name: str,
+    inner_loc: Optional[TextLocation],
+    file_path: Path,
+) -> TextLocation:
+    value_loc = variables.get_location((var_name,))
+    value_len = value_loc.end_pos - value_loc.pos
+    # locations inside escaped values would be shifted, so whole value
+    # location is used for them
+    if inner_loc is not None and value_len == len(variables[var_name]):
+        value_loc = _inner_location(value_loc, inner_loc)
+    return attr.evolve(value_loc, file_path=file_path)
+
+
+class _EnvFileLocationFinder:
+    def __init__(
+        self, values: FlatMapValues, variables: TextValues, file_path: Path
+    ):
+        self._values = values
+        self._variables = variables
+        self._file_path = file_path
+
+    def get_location(self, key: JsonLocation) -> TextLocation:
+        var_name, inner_loc = self._values.get_location(key)
+        return _variable_location(
+            self._variables, var_name, inner_loc, self._file_path
+        )
+
+
+def _restore_error(
+    err: InvalidAssignError, variables: TextValues, file_path: Path
+) -> LoadingParseError:
+    inner_loc = getattr(err, 'text_location', None)
+    # decoders report unknown end of errors as negative values
+    if inner_loc is not None and inner_loc.end_pos < 0:
+        inner_loc = attr.evolve(
+            inner_loc,
+            end_line=inner_loc.line,
+            end_col=inner_loc.col,
+            end_pos=inner_loc.pos,
+        )
+    return LoadingParseError(
+        file_path,
+        err.__cause__ or err,
+        location=_variable_location(variables, err.key, inner_loc, file_path),
+        decoder=DECODER,
+    )
+
+
+def load_env_file(
+    restorer: ModelShapeRestorer, file_path: Union[str, Path]
+) -> TextValues:
+    """
+    Load values from *dotenv* file, see :py:mod:`.decoder.dotenv`.
+    Variables are matched against model fields by the restorer, exactly like
+    environment variables.
+
+    :param restorer: environment variables restorer
+    :param file_path: *dotenv* file path
+    :raises LoadingError: file can't be read or decoded
+    :raises LoadingParseError: variable value can't be assigned, e.g. it
+        can't be decoded as a value of a complex field, location refers to
+        the line of the file
+    :return: values, which locations refer to the file
+    """
+    file_path = Path(file_path)
+    try:
+        content = file_path.read_text()
+    except OSError as err:
+        raise LoadingError(file_path, err)
+
+    try:
+        variables = dotenv.decode_document(content)
+    except ParsingError as err:
+        raise LoadingParseError(
+            file_path, err.cause, location=err.text_location, decoder=DECODER
+        )
+
+    values, errs = restorer.restore(variables)
+    if errs:
+        raise _restore_error(errs[0], variables, file_path)
+    return TextValues(
+        _EnvFileLocationFinder(values, variables, file_path), **values
+    )
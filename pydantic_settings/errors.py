@@ -1,4 +1,5 @@
-from dataclasses import asdict
+import json
+from itertools import islice
 from pathlib import Path
 from typing import (
     Any,
@@ -7,11 +8,14 @@ from typing import (
     List,
     Optional,
     Sequence,
+    TextIO,
     Tuple,
     Type,
+    Union,
     cast,
 )
 
+from attr import asdict
 from pydantic import BaseConfig, BaseModel, ValidationError
 from pydantic.error_wrappers import ErrorWrapper, error_dict
 
@@ -70,17 +74,28 @@ class LoadingParseError(LoadingError):
         *args: Any,
         decoder: DecoderMeta = None,
         location: TextLocation = None,
+        source: str = None,
         **kwargs,
     ):
+        """
+        :param decoder: decoder of the file, which failed
+        :param location: error location inside the file
+        :param source: name of the source, which isn't decoded as a whole,
+            e.g. a secrets directory, defaults to the decoder name
+        """
         super().__init__(*args, **kwargs)
         self.location = location
         self.decoder = decoder
+        self.source = (
+            source if source is not None or decoder is None else decoder.name
+        )
 
     def render_error(self) -> str:
+        using = f' using "{self.source} loader"' if self.source else ''
         return (
             f'parsing error occurs while loading settings from '
-            f'{_render_err_file_path(self.file_path)} '
-            f'using "{self.decoder.name} loader": {str(self.cause)}'
+            f'{_render_err_file_path(self.file_path)}{using}: '
+            f'{str(self.cause)}'
         )
 
 
@@ -103,17 +118,13 @@ class LoadingValidationError(LoadingError, ValidationError):
 
     def errors(self) -> List[Dict[str, Any]]:
         if self._error_cache is None:
-            try:
-                config = self.model.__config__  # type: ignore
-            except AttributeError:
-                config = (  # type: ignore
-                    self.model.__pydantic_model__.__config__
-                )
-            self._error_cache = serialize_errors(self, config)
+            self._error_cache = serialize_errors(
+                self, _get_model_config(self.model)
+            )
         return self._error_cache
 
-    def render_error(self) -> str:
-        return render_validation_error(self)
+    def render_error(self, limit: int = None) -> str:
+        return render_validation_error(self, limit)
 
 
 class ExtendedErrorWrapper(ErrorWrapper):
@@ -160,6 +171,9 @@ def _flatten_errors_wrappers(
                 )
             else:
                 yield error_loc, error
+        elif isinstance(error, list):
+            # errors of sequence items are grouped by pydantic
+            yield from _flatten_errors_wrappers(error, loc=loc)
         else:
             raise RuntimeError(f'Unknown error object: {error}')
 
@@ -167,28 +181,41 @@ def _flatten_errors_wrappers(
 def with_errs_locations(
     model: Type[BaseModel],
     validation_err: ValidationError,
-    values_source: AnySourceLocProvider,
+    *values_sources: AnySourceLocProvider,
 ) -> ValidationError:
+    """
+    Attach source locations to validation errors. Error wrappers are
+    flattened once, then each error location is probed against given
+    providers in order, the first found location wins.
+
+    :param model: model class
+    :param validation_err: original validation error
+    :param values_sources: source location providers ordered by priority
+    :return: new validation error with flat list of error wrappers
+    """
+
     def process_err_wrapper(
-        err_wrapper: ErrorWrapper, loc_override: JsonLocation
+        err_wrapper: ErrorWrapper, loc_override: Tuple[Union[str, int], ...]
     ) -> ErrorWrapper:
-        try:
-            location = values_source.get_location(loc_override)
-        except KeyError:
-            if isinstance(err_wrapper, ExtendedErrorWrapper):
-                return ExtendedErrorWrapper(
-                    err_wrapper.exc, loc_override, err_wrapper.source_loc
-                )
-            else:
-                return ErrorWrapper(err_wrapper.exc, tuple(loc_override))
+        for values_source in values_sources:
+            try:
+                location = values_source.get_location(loc_override)
+            except KeyError:
+                continue
 
-        return ExtendedErrorWrapper(
-            err_wrapper.exc, loc_override, source_loc=location
-        )
+            return ExtendedErrorWrapper(
+                err_wrapper.exc, loc_override, source_loc=location
+            )
+
+        if isinstance(err_wrapper, ExtendedErrorWrapper):
+            return ExtendedErrorWrapper(
+                err_wrapper.exc, loc_override, err_wrapper.source_loc
+            )
+        return ErrorWrapper(err_wrapper.exc, loc_override)
 
     return ValidationError(
         [
-            process_err_wrapper(raw_err, model_loc)
+            process_err_wrapper(raw_err, tuple(model_loc))
             for model_loc, raw_err in _flatten_errors_wrappers(
                 validation_err.raw_errors
             )
@@ -197,40 +224,115 @@ def with_errs_locations(
     )
 
 
+def _get_model_config(model: Type[Any]) -> Type[BaseConfig]:
+    try:
+        return model.__config__
+    except AttributeError:
+        return model.__pydantic_model__.__config__
+
+
+def iter_serialized_errors(
+    err: ValidationError,
+    config: Type[BaseConfig] = None,
+    *,
+    limit: int = None,
+) -> Iterator[JsonDict]:
+    """
+    Lazily serialize validation errors, each error is serialized only when
+    requested.
+
+    :param err: validation error
+    :param config: model config, taken from error model if omitted
+    :param limit: serialize only first `limit` errors
+    :return: iterator of serialized errors
+    """
+    if config is None:
+        config = _get_model_config(err.model)
+
+    for model_loc, err_wrapper in islice(
+        _flatten_errors_wrappers(err.raw_errors), limit
+    ):
+        yield _ext_error_dict(err_wrapper, model_loc, config)
+
+
 def serialize_errors(
     err: ValidationError, config: Type[BaseConfig]
 ) -> List[Json]:
-    return [
-        _ext_error_dict(err_wrapper, config) for err_wrapper in err.raw_errors
-    ]
+    return list(iter_serialized_errors(err, config))
 
 
-def render_validation_error(error: LoadingValidationError) -> str:
-    if issubclass(error.model, BaseModel):
-        config = error.model.__config__
-    else:
-        config = error.model.__pydantic_model__.__config__
-
-    errors = list(_flatten_errors_wrappers(error.raw_errors))
-    errors_num = len(errors)
+def dump_errors_json_lines(
+    err: ValidationError, stream: TextIO, *, limit: int = None
+) -> int:
+    """
+    Write serialized validation errors as JSON lines one by one, so memory
+    usage doesn't depend on the number of errors.
 
-    rendered_errors = '\n'.join(
-        _render_raw_error(raw_err, model_loc, config)
-        for model_loc, raw_err in errors
-    )
-    env_used = any(
-        not isinstance(raw_err.source_loc, TextLocation)
-        for _, raw_err in errors
-        if isinstance(raw_err, ExtendedErrorWrapper)
-    )
+    :param err: validation error
+    :param stream: text stream to write into
+    :param limit: write only first `limit` errors
+    :return: number of written errors
+    """
+    written = 0
+    for serialized_err in iter_serialized_errors(err, limit=limit):
+        # context values, e.g. Decimal constraints, may be not JSON native
+        stream.write(json.dumps(serialized_err, default=str))
+        stream.write('\n')
+        written += 1
+    return written
+
+
+def iter_rendered_validation_error(
+    error: Union[LoadingValidationError, ValidationError],
+    limit: int = None,
+) -> Iterator[str]:
+    """
+    Render validation error line by line. Errors are flattened once: the
+    first `limit` of them are rendered while counting, the rest are only
+    counted, so memory usage depends on the limit, not on the number of
+    errors.
+
+    :param error: validation error
+    :param limit: render only first `limit` errors
+    :return: iterator of rendered lines
+    """
+    config = _get_model_config(error.model)
+    errors_num = 0
+    env_used = False
+    rendered: List[str] = []
+    for model_loc, raw_err in _flatten_errors_wrappers(error.raw_errors):
+        errors_num += 1
+        env_used = env_used or (
+            isinstance(raw_err, ExtendedErrorWrapper)
+            and not isinstance(raw_err.source_loc, TextLocation)
+        )
+        if limit is None or errors_num <= limit:
+            rendered.append(_render_raw_error(raw_err, model_loc, config))
 
-    return (
+    yield (
         f'{errors_num} validation error{"" if errors_num == 1 else "s"} '
         f'for {error.model.__name__} '
-        f'({_render_err_file_path(error.file_path)}'
+        f'({_render_err_file_path(getattr(error, "file_path", None))}'
         f"{' and environment variables' if env_used else ''}"
-        f'):\n{rendered_errors}'
+        f'):'
     )
+    yield from rendered
+
+    if limit is not None and errors_num > limit:
+        yield f'... and {errors_num - limit} more'
+
+
+def render_validation_error(
+    error: LoadingValidationError, limit: int = None
+) -> str:
+    """
+    Render validation error as a human-readable text.
+
+    :param error: validation error
+    :param limit: render only first `limit` errors
+    :return: rendered text
+    """
+    return '\n'.join(iter_rendered_validation_error(error, limit))
 
 
 def _render_err_file_path(file_path: Path) -> str:
@@ -272,16 +374,26 @@ def _render_err_loc(raw_err: ErrorWrapper, loc_override: JsonLocation) -> str:
                 from_loc += f' at {text_loc.pos}:{text_loc.end_pos}'
         else:
             source_loc = raw_err.source_loc
-            from_loc = f' from file at {source_loc.line}:{source_loc.col}'
+            from_loc = ' from file'
+            if source_loc.file_path is not None:
+                from_loc += f' "{source_loc.file_path}"'
+            from_loc += f' at {source_loc.line}:{source_loc.col}'
 
         return model_loc + from_loc
 
     return model_loc
 
 
+def _serialize_text_loc(loc: TextLocation) -> JsonDict:
+    res = asdict(loc, filter=lambda field, _: field.name != 'file_path')
+    if loc.file_path is not None:
+        res['file_path'] = str(loc.file_path)
+    return res
+
+
 def _serialize_source_loc(loc: AnySourceLocation) -> Json:
     if isinstance(loc, TextLocation):
-        return asdict(loc)
+        return _serialize_text_loc(loc)
 
     assert (
         isinstance(loc, Sequence)
@@ -290,14 +402,19 @@ def _serialize_source_loc(loc: AnySourceLocation) -> Json:
     )
 
     env_name, text_loc = loc
-    return [env_name, asdict(text_loc) if text_loc is not None else None]
+    return [
+        env_name,
+        _serialize_text_loc(text_loc) if text_loc is not None else None,
+    ]
 
 
 def _ext_error_dict(
-    err_wrapper: ErrorWrapper, config: Type[BaseConfig]
+    err_wrapper: ErrorWrapper,
+    loc_override: JsonLocation,
+    config: Type[BaseConfig],
 ) -> JsonDict:
     res = cast(
-        JsonDict, error_dict(err_wrapper.exc, config, err_wrapper.loc_tuple())
+        JsonDict, error_dict(err_wrapper.exc, config, tuple(loc_override))
     )
     if isinstance(err_wrapper, ExtendedErrorWrapper):
         res['source_loc'] = _serialize_source_loc(err_wrapper.source_loc)
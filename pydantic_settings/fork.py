@@ -0,0 +1,92 @@
+"""
+Helpers for applications which load settings once and then fork worker
+processes, like pre-fork servers do.
+
+It follows the recipe of :py:func:`gc.freeze` documentation: call
+:py:func:`disable_gc_until_fork` early in the master process, load settings,
+call :py:func:`freeze_for_fork` right before forking, and garbage collection
+is enabled again in forked processes. Once the master process is done
+forking, call :py:func:`enable_gc_after_forking`. The helpers affect the
+whole interpreter, not only settings.
+"""
+import gc
+import os
+from typing import Optional
+
+from pydantic import BaseModel
+
+from pydantic_settings.restorer import ModelShapeRestorer
+
+_gc_disabled = False
+_hook_registered = False
+
+
+def _enable_gc_in_child() -> None:
+    global _gc_disabled
+
+    if _gc_disabled:
+        _gc_disabled = False
+        gc.enable()
+
+
+def disable_gc_until_fork() -> None:
+    """
+    Disable garbage collection in the current process, so objects created
+    while loading settings don't leave freed holes in memory pages, and
+    enable it again in each process forked later.
+
+    Call it early in the master process. Collection stays disabled in the
+    master process itself until :py:func:`enable_gc_after_forking` is called,
+    and only processes forked in between enable it. Fork hooks can't be
+    unregistered, so a hook registered by the first call stays for the whole
+    process lifetime, but it does nothing outside of that period. On Python
+    versions lacking :py:func:`os.register_at_fork` forked processes must
+    call :py:func:`gc.enable` themselves.
+    """
+    global _gc_disabled, _hook_registered
+
+    gc.disable()
+    _gc_disabled = True
+    if not _hook_registered and hasattr(os, 'register_at_fork'):
+        os.register_at_fork(after_in_child=_enable_gc_in_child)
+        _hook_registered = True
+
+
+def enable_gc_after_forking() -> None:
+    """
+    Enable garbage collection in the master process, which is done forking
+    workers, processes forked later don't change collection state anymore.
+    """
+    global _gc_disabled
+
+    _gc_disabled = False
+    gc.enable()
+
+
+def freeze_for_fork(*models: BaseModel) -> None:
+    """
+    Prepare loaded settings to be shared with forked processes. Lazily built
+    state of restorers of given models classes is built in advance, then
+    *all* objects tracked by the garbage collector in the process, not only
+    the given models, are moved into the permanent generation with
+    :py:func:`gc.freeze`. The collector doesn't touch frozen objects in
+    forked processes, so memory pages they occupy stay shared instead of
+    being copied on write. Frozen objects are never collected, until
+    :py:func:`gc.unfreeze` is called.
+
+    Call it in the master process right before forking, no collection is
+    performed, see :py:func:`disable_gc_until_fork`. On Python versions
+    lacking :py:func:`gc.freeze` only restorers are prepared.
+
+    :param models: loaded settings models, which classes restorers to
+        prepare
+    """
+    for model in models:
+        restorer: Optional[ModelShapeRestorer] = getattr(
+            type(model), 'shape_restorer', None
+        )
+        if restorer is not None:
+            restorer.prepare()
+
+    if hasattr(gc, 'freeze'):
+        gc.freeze()
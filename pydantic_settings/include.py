@@ -0,0 +1,289 @@
+"""
+Include directives, which allow to split settings across several files.
+
+Mapping with :code:`"$include"` key is replaced by decoded content of the
+referred file, path is relative to the including file. Other keys of such
+mapping override included values.
+"""
+import hashlib
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+import attr
+from attr import dataclass
+
+from pydantic_settings.decoder import (
+    DecoderNotFoundError,
+    ParsingError,
+    TextValues,
+    get_decoder,
+)
+from pydantic_settings.errors import LoadingError, LoadingParseError
+from pydantic_settings.types import Json, JsonLocation, TextLocation
+from pydantic_settings.utils import LRUCache, copy_json, deep_merge_mappings
+
+INCLUDE_KEY = '$include'
+
+_FileStamp = Tuple[int, int]
+
+
+class IncludeCycleError(ValueError):
+    """File includes itself, directly or through other files."""
+
+    def __init__(self, chain: List[Path]):
+        super().__init__(
+            'include cycle: ' + ' -> '.join(str(path) for path in chain)
+        )
+        self.chain = chain
+
+
+@dataclass
+class _FileEntry:
+    stamp: _FileStamp
+    values: TextValues
+    dependencies: Set[Path]
+
+
+class _FileLocationFinder:
+    """Attributes locations of included file values to the file."""
+
+    def __init__(self, values: TextValues, file_path: Path):
+        self._values = values
+        self._file_path = file_path
+
+    def get_location(self, key: JsonLocation) -> TextLocation:
+        location = self._values.get_location(key)
+        if location.file_path is None:
+            location = attr.evolve(location, file_path=self._file_path)
+        return location
+
+
+class _IncludingLocationFinder:
+    """
+    Looks up location inside the including document first, then inside
+    included file, which values are placed by the longest matching path.
+    """
+
+    def __init__(
+        self,
+        values: TextValues,
+        includes: Dict[Tuple[JsonLocation, ...], _FileLocationFinder],
+    ):
+        self._values = values
+        self._includes = includes
+
+    def get_location(self, key: JsonLocation) -> TextLocation:
+        key = tuple(key)
+        try:
+            return self._values.get_location(key)
+        except KeyError:
+            pass
+
+        for prefix_len in range(len(key), -1, -1):
+            finder = self._includes.get(key[:prefix_len])
+            if finder is not None:
+                return finder.get_location(key[prefix_len:])
+
+        raise KeyError(key)
+
+
+def _file_stamp(path: Path) -> _FileStamp:
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+class IncludeResolver:
+    """
+    Resolves include directives. Each file is decoded once per content:
+    decoded values are cached by content hash, and resolved files are
+    cached along with the files they depend on, so subsequent loads re-read
+    and re-decode only changed files.
+
+    Pass an instance as :py:obj:`~.load_settings.include_resolver` argument
+    and reuse it for reloads.
+    """
+
+    def __init__(self, decoded_cache_size: int = 256):
+        """
+        :param decoded_cache_size: max number of cached decoded contents
+        """
+        self._decoded: LRUCache[bytes, TextValues] = LRUCache(
+            decoded_cache_size
+        )
+        self._files: Dict[Path, _FileEntry] = {}
+        self._roots: Dict[Path, Set[Path]] = {}
+
+    def dependencies(self, path: Path) -> Set[Path]:
+        """
+        Get all files included by the file, directly or transitively.
+
+        :param path: file path
+        """
+        path = path.resolve()
+        result = set(self._roots.get(path, ()))
+        pending = [path, *result]
+        while pending:
+            entry = self._files.get(pending.pop())
+            if entry is None:
+                continue
+            for dep in entry.dependencies - result:
+                result.add(dep)
+                pending.append(dep)
+        return result
+
+    def resolve(
+        self, values: TextValues, base_dir: Path, file_path: Path = None
+    ) -> TextValues:
+        """
+        Resolve include directives of already decoded document.
+
+        :param values: decoded document
+        :param base_dir: directory, relative to which included paths are
+            resolved
+        :param file_path: document file path, used for cycles detection
+        :raises LoadingError: included file can't be loaded, or there is
+            an include cycle
+        :return: document with included values
+        """
+        if file_path is None:
+            return self._resolve_values(values, base_dir, [], set())
+
+        file_path = file_path.resolve()
+        dependencies: Set[Path] = set()
+        result = self._resolve_values(
+            values, base_dir, [file_path], dependencies
+        )
+        self._roots[file_path] = dependencies
+        return result
+
+    def _load_file(self, path: Path, stack: List[Path]) -> TextValues:
+        if path in stack:
+            raise LoadingError(path, IncludeCycleError(stack + [path]))
+
+        try:
+            stamp = _file_stamp(path)
+        except OSError as err:
+            raise LoadingError(path, err)
+
+        entry = self._files.get(path)
+        if entry is not None and self._is_fresh(path, entry, set()):
+            return entry.values
+
+        content = path.read_bytes()
+        digest = hashlib.sha256(content).digest()
+        values = self._decoded.get(digest)
+        if values is None:
+            values = self._decode(path, content.decode())
+            self._decoded.put(digest, values)
+
+        dependencies: Set[Path] = set()
+        resolved = self._resolve_values(
+            values, path.parent, stack + [path], dependencies
+        )
+        self._files[path] = _FileEntry(stamp, resolved, dependencies)
+        return resolved
+
+    def _is_fresh(self, path: Path, entry: _FileEntry, seen: Set[Path]):
+        try:
+            if _file_stamp(path) != entry.stamp:
+                return False
+        except OSError:
+            return False
+
+        seen.add(path)
+        for dep in entry.dependencies:
+            dep_entry = self._files.get(dep)
+            if dep_entry is None:
+                return False
+            if dep not in seen and not self._is_fresh(dep, dep_entry, seen):
+                return False
+        return True
+
+    @staticmethod
+    def _decode(path: Path, content: str) -> TextValues:
+        try:
+            decoder = get_decoder(path.suffix)
+        except DecoderNotFoundError as err:
+            raise LoadingError(path, err)
+
+        try:
+            return decoder.values_loader(content)
+        except ParsingError as err:
+            raise LoadingParseError(
+                path, err.cause, location=err.text_location, decoder=decoder
+            )
+
+    def _resolve_values(
+        self,
+        values: TextValues,
+        base_dir: Path,
+        stack: List[Path],
+        dependencies: Set[Path],
+    ) -> TextValues:
+        includes: Dict[Tuple[JsonLocation, ...], _FileLocationFinder] = {}
+        resolved = self._resolve_node(
+            values, (), base_dir, stack, dependencies, includes
+        )
+        if not includes:
+            return values
+
+        return TextValues(
+            _IncludingLocationFinder(values, includes), **resolved
+        )
+
+    def _resolve_node(
+        self,
+        value: Json,
+        path: Tuple,
+        base_dir: Path,
+        stack: List[Path],
+        dependencies: Set[Path],
+        includes: Dict[Tuple[JsonLocation, ...], _FileLocationFinder],
+    ) -> Json:
+        if isinstance(value, dict):
+            include_path = value.get(INCLUDE_KEY)
+            items = (
+                (key, val) for key, val in value.items() if key != INCLUDE_KEY
+            )
+        elif isinstance(value, list):
+            include_path = None
+            items = enumerate(value)
+        else:
+            return value
+
+        is_changed = include_path is not None
+        resolved_items = []
+        for key, val in items:
+            new_val = self._resolve_node(
+                val, path + (key,), base_dir, stack, dependencies, includes
+            )
+            is_changed = is_changed or new_val is not val
+            resolved_items.append((key, new_val))
+
+        if not is_changed:
+            return value
+        if isinstance(value, list):
+            return [val for _, val in resolved_items]
+
+        result: Dict[str, Json] = dict(resolved_items)
+        if include_path is not None:
+            file_path = (base_dir / include_path).resolve()
+            included = self._load_file(file_path, stack)
+            dependencies.add(file_path)
+            includes[path] = _FileLocationFinder(included, file_path)
+            # included values are cached, while merged ones end up in models
+            result = deep_merge_mappings(result, copy_json(included))
+
+        return result
+
+
+def resolve_includes(
+    resolver: Optional[IncludeResolver],
+    values: TextValues,
+    file_path: Optional[Path],
+) -> TextValues:
+    if resolver is None:
+        return values
+    base_dir = file_path.parent if file_path is not None else Path.cwd()
+    return resolver.resolve(values, base_dir, file_path)
@@ -0,0 +1,217 @@
+"""
+Interpolation of :code:`${...}` references inside string values of decoded
+documents.
+
+Reference is either a dot-separated path of another document value, e.g.
+:code:`${db.replicas.0.host}`, or a name of a variable, e.g. an environment
+variable :code:`${DB_HOST}`, if there is no such path in the document.
+String consisting of a single reference takes referred value as is,
+otherwise referred values are formatted into the string. :code:`$$` is an
+escaped :code:`$` sign in any string, e.g. :code:`$${HOME}` gives
+:code:`${HOME}` literally.
+"""
+import re
+from typing import Dict, List, Mapping, Tuple, Union
+
+from attr import dataclass
+
+from pydantic_settings.decoder import TextValues
+from pydantic_settings.types import Json, JsonLocation
+from pydantic_settings.utils import LRUCache
+
+MARKER = '${'
+ESCAPE = '$$'
+
+_SEGMENT = re.compile(r'\$\$|\$\{([^}]*)\}')
+
+_ValuePath = Tuple[Union[str, int], ...]
+
+
+@dataclass(frozen=True)
+class Reference:
+    name: str
+    path: _ValuePath
+
+
+Segment = Union[str, Reference]
+
+_templates: LRUCache[str, Tuple[Segment, ...]] = LRUCache(1024)
+
+
+class InterpolationError(ValueError):
+    """
+    Template can't be interpolated.
+
+    :param path: location of the template inside the document
+    """
+
+    def __init__(self, msg: str, path: JsonLocation):
+        super().__init__(msg)
+        self.path = path
+
+
+class UndefinedReferenceError(InterpolationError):
+    """Referred value is neither found in the document nor in variables."""
+
+
+class ReferenceCycleError(InterpolationError):
+    """Template refers to itself, directly or through other templates."""
+
+
+def _parse_path(name: str) -> _ValuePath:
+    return tuple(
+        int(part) if part.isdigit() else part for part in name.split('.')
+    )
+
+
+def compile_template(template: str) -> Tuple[Segment, ...]:
+    """
+    Split template into literal strings and references. Compiled templates
+    are cached.
+    """
+    segments = _templates.get(template)
+    if segments is not None:
+        return segments
+
+    result: List[Segment] = []
+    literal = ''
+    pos = 0
+    for match in _SEGMENT.finditer(template):
+        start, end = match.span()
+        literal += template[pos:start]
+        pos = end
+        name = match.group(1)
+        if name is None:
+            literal += '$'
+            continue
+
+        if literal:
+            result.append(literal)
+            literal = ''
+        name = name.strip()
+        result.append(Reference(name, _parse_path(name)))
+
+    literal += template[pos:]
+    if literal:
+        result.append(literal)
+
+    segments = tuple(result)
+    _templates.put(template, segments)
+    return segments
+
+
+def _get_by_path(document: Json, path: _ValuePath) -> Json:
+    value = document
+    for part in path:
+        if isinstance(value, dict):
+            value = value[str(part)]
+        elif isinstance(value, list) and isinstance(part, int):
+            value = value[part]
+        else:
+            raise KeyError(part)
+    return value
+
+
+class _Evaluator:
+    """
+    Evaluates templates in dependency order: referred templates are
+    evaluated first, each at most once.
+    """
+
+    def __init__(self, document: Json, variables: Mapping[str, str]):
+        self._document = document
+        self._variables = variables
+        self._evaluated: Dict[_ValuePath, Json] = {}
+        self._evaluating: List[_ValuePath] = []
+
+    def resolve_node(self, value: Json, path: _ValuePath) -> Json:
+        if isinstance(value, str):
+            if MARKER not in value and ESCAPE not in value:
+                return value
+            return self._evaluate(value, path)
+
+        if isinstance(value, dict):
+            items = value.items()
+        elif isinstance(value, list):
+            items = enumerate(value)
+        else:
+            return value
+
+        is_changed = False
+        resolved = []
+        for key, val in items:
+            new_val = self.resolve_node(val, path + (key,))
+            is_changed = is_changed or new_val is not val
+            resolved.append((key, new_val))
+
+        if not is_changed:
+            return value
+        if isinstance(value, list):
+            return [val for _, val in resolved]
+        return dict(resolved)
+
+    def _evaluate(self, template: str, path: _ValuePath) -> Json:
+        try:
+            return self._evaluated[path]
+        except KeyError:
+            pass
+
+        if path in self._evaluating:
+            cycle_start = self._evaluating.index(path)
+            chain = self._evaluating[cycle_start:]
+            raise ReferenceCycleError(
+                'reference cycle: '
+                + ' -> '.join('.'.join(map(str, item)) for item in chain),
+                path,
+            )
+
+        self._evaluating.append(path)
+        try:
+            segments = compile_template(template)
+            if len(segments) == 1 and isinstance(segments[0], Reference):
+                result = self._lookup(segments[0], path)
+            else:
+                result = ''.join(
+                    str(self._lookup(segment, path))
+                    if isinstance(segment, Reference)
+                    else segment
+                    for segment in segments
+                )
+        finally:
+            self._evaluating.pop()
+
+        self._evaluated[path] = result
+        return result
+
+    def _lookup(self, ref: Reference, path: _ValuePath) -> Json:
+        try:
+            value = _get_by_path(self._document, ref.path)
+        except (KeyError, IndexError):
+            try:
+                return self._variables[ref.name]
+            except KeyError:
+                raise UndefinedReferenceError(
+                    f'reference "{ref.name}" is undefined', path
+                ) from None
+
+        return self.resolve_node(value, ref.path)
+
+
+def interpolate(
+    values: TextValues, variables: Mapping[str, str]
+) -> TextValues:
+    """
+    Interpolate references of decoded document. Only strings containing
+    markers are touched, the other values are shared with the original
+    document, as well as locations finder.
+
+    :param values: decoded document
+    :param variables: values of references, which aren't found in the
+        document, e.g. environment variables
+    :raises InterpolationError: reference can't be resolved
+    :return: interpolated document
+    """
+    resolved = _Evaluator(values, variables).resolve_node(values, ())
+    if resolved is values:
+        return values
+    return TextValues(values.location_finder, **resolved)
@@ -0,0 +1,178 @@
+"""
+Deferred validation of nested model fields, see
+:py:attr:`.BaseSettingsModel.Config.lazy_submodels`.
+"""
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+from pydantic.error_wrappers import ErrorWrapper
+from pydantic.fields import SHAPE_SINGLETON, ModelField
+from pydantic.main import validate_model
+from pydantic.utils import lenient_issubclass
+
+ErrorsLocator = Callable[[ValidationError], ValidationError]
+
+
+def _no_locations(err: ValidationError) -> ValidationError:
+    return err
+
+
+class LazyValue:
+    """Raw value of nested model field, which isn't validated yet."""
+
+    __slots__ = ('raw', 'locator')
+
+    def __init__(self, raw: Mapping[str, Any]):
+        self.raw = raw
+        self.locator: ErrorsLocator = _no_locations
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.raw!r})'
+
+
+class LazyFieldDescriptor:
+    """
+    Validates nested model field on first access, the result replaces raw
+    value inside instance :code:`__dict__`.
+    """
+
+    __slots__ = ('name',)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __get__(self, instance: Optional[BaseModel], owner: Type) -> Any:
+        if instance is None:
+            # fields aren't class attributes for pydantic models
+            raise AttributeError(self.name)
+
+        value = instance.__dict__[self.name]
+        if value.__class__ is LazyValue:
+            validate_pending(instance, (self.name,))
+            value = instance.__dict__[self.name]
+        return value
+
+    def __set__(self, instance: BaseModel, value: Any) -> None:
+        BaseModel.__setattr__(instance, self.name, value)
+
+
+class ShallowModel:
+    """
+    Stand-in of a model for :py:func:`pydantic.main.validate_model`, which
+    accepts any value for lazy fields.
+    """
+
+    def __init__(self, model: Type[BaseModel], lazy_fields: List[str]):
+        self.__config__ = model.__config__
+        self.__pre_root_validators__ = model.__pre_root_validators__
+        self.__post_root_validators__ = model.__post_root_validators__
+        self.__fields__: Dict[str, ModelField] = {
+            name: (
+                ModelField(
+                    name=name,
+                    type_=Any,
+                    class_validators=None,
+                    model_config=model.__config__,
+                    default=field.default,
+                    required=field.required,
+                    alias=field.alias,
+                )
+                if name in lazy_fields
+                else field
+            )
+            for name, field in model.__fields__.items()
+        }
+
+
+def get_lazy_fields(model: Type[BaseModel]) -> List[str]:
+    """
+    Find fields which validation may be deferred: plain nested models without
+    any validators.
+    """
+    return [
+        name
+        for name, field in model.__fields__.items()
+        if field.shape == SHAPE_SINGLETON
+        and field.sub_fields is None
+        and not field.class_validators
+        and lenient_issubclass(field.type_, BaseModel)
+    ]
+
+
+def validate_shallow(
+    model: Type[BaseModel],
+    shallow: ShallowModel,
+    lazy_fields: List[str],
+    data: Mapping[str, Any],
+) -> Tuple[Dict[str, Any], set]:
+    """
+    Validate all fields except nested models given as mappings, which are
+    wrapped into :py:class:`LazyValue` instead.
+
+    :raises ValidationError: in case of failure of eagerly validated fields
+    :return: instance values and set of fields names
+    """
+    values, fields_set, err = validate_model(shallow, data, model)
+    if err is not None:
+        raise err
+
+    for name in lazy_fields:
+        if name not in fields_set:
+            continue
+        value = values[name]
+        if isinstance(value, Mapping):
+            values[name] = LazyValue(value)
+            continue
+
+        # e.g. already built model instance, nothing to defer
+        value, errs = model.__fields__[name].validate(
+            value, values, loc=name, cls=model
+        )
+        if errs:
+            raise ValidationError([errs], model)
+        values[name] = value
+
+    return values, fields_set
+
+
+def bind_errors_locator(instance: BaseModel, locator: ErrorsLocator) -> None:
+    """
+    Set function, which adds source locations to errors of deferred
+    validation.
+    """
+    for value in instance.__dict__.values():
+        if value.__class__ is LazyValue:
+            value.locator = locator
+
+
+def validate_pending(
+    instance: BaseModel, names: Optional[Tuple[str, ...]] = None
+) -> None:
+    """
+    Validate deferred fields of the instance.
+
+    :param instance: model instance
+    :param names: fields to validate, all by default
+    :raises ValidationError: in case of failure, raised error is passed
+        through bound errors locator
+    """
+    values = instance.__dict__
+    model = instance.__class__
+    errors: List[ErrorWrapper] = []
+    locator = _no_locations
+    for name in names if names is not None else list(values):
+        value = values[name]
+        if value.__class__ is not LazyValue:
+            continue
+
+        locator = value.locator
+        validated, errs = model.__fields__[name].validate(
+            value.raw, values, loc=name, cls=model
+        )
+        if errs:
+            errors.append(errs)
+        else:
+            values[name] = validated
+
+    if errors:
+        raise locator(ValidationError(errors, model))
@@ -1,9 +1,11 @@
-import json
+from functools import partial
 from io import StringIO
 from os import environ as os_environ
 from pathlib import Path
 from typing import (
+    Any,
     Callable,
+    Dict,
     Mapping,
     Optional,
     TextIO,
@@ -15,23 +17,47 @@ from typing import (
 
 from pydantic import BaseModel, ValidationError
 
+from pydantic_settings import interpolation
 from pydantic_settings.base import BaseSettingsModel
+from pydantic_settings.cache import SettingsCache
 from pydantic_settings.decoder import (
     DecoderMeta,
     DecoderNotFoundError,
     ParsingError,
     TextValues,
     get_decoder,
+    json,
 )
+from pydantic_settings.env_file import load_env_file
 from pydantic_settings.errors import (
     LoadingError,
     LoadingParseError,
     LoadingValidationError,
     with_errs_locations,
 )
+from pydantic_settings.include import IncludeResolver, resolve_includes
+from pydantic_settings.profiling import (
+    DECODE_PHASE,
+    INTERPOLATE_PHASE,
+    LOCATE_ERRORS_PHASE,
+    MERGE_PHASE,
+    READ_PHASE,
+    RESTORE_PHASE,
+    SECRETS_PHASE,
+    VALIDATE_PHASE,
+    LoadProfiler,
+    count_nodes,
+    profile_phase,
+)
 from pydantic_settings.restorer import FlatMapValues, ModelShapeRestorer
-from pydantic_settings.types import JsonDict
-from pydantic_settings.utils import deep_merge_mappings
+from pydantic_settings.secrets_dir import load_secrets_dir
+from pydantic_settings.types import (
+    AnySourceLocProvider,
+    JsonDict,
+    JsonLocation,
+    TextLocation,
+)
+from pydantic_settings.utils import LRUCache, deep_merge_mappings
 
 
 def _resolve_content_arg(
@@ -84,14 +110,45 @@ def _resolve_content_arg(
         return decoder_by_type_hint(), None, content
 
 
+_restorers: LRUCache[Tuple[Type[BaseModel], str], ModelShapeRestorer] = (
+    LRUCache(64)
+)
+
+
 def _get_shape_restorer(
     cls: Type[BaseModel], env_prefix: str
 ) -> ModelShapeRestorer:
     if issubclass(cls, BaseSettingsModel):
-        restorer = cls.shape_restorer
-    else:
-        restorer = ModelShapeRestorer(cls, env_prefix, False, json.loads)
+        return cls.shape_restorer
+
+    # restorers are cached, so they can reuse memoized values
+    restorer = _restorers.get((cls, env_prefix))
+    if restorer is None:
+        base = _restorers.get((cls, ''))
+        if base is None:
+            base = ModelShapeRestorer(cls, '', False, json.decode_document)
+            _restorers.put((cls, ''), base)
+        # model shape is compiled once for all prefixes
+        restorer = base.with_prefix(env_prefix)
+        _restorers.put((cls, env_prefix), restorer)
+
+    return restorer
+
+
+_secrets_restorers: LRUCache[Type[BaseSettingsModel], ModelShapeRestorer] = (
+    LRUCache(64)
+)
 
+
+def _get_secrets_restorer(cls: Type[BaseModel]) -> ModelShapeRestorer:
+    # secrets files names have no prefix
+    if not issubclass(cls, BaseSettingsModel):
+        return _get_shape_restorer(cls, '')
+
+    restorer = _secrets_restorers.get(cls)
+    if restorer is None:
+        restorer = cls.shape_restorer.with_prefix('')
+        _secrets_restorers.put(cls, restorer)
     return restorer
 
 
@@ -106,6 +163,15 @@ def load_settings(
     load_env: bool = False,
     env_prefix: str = 'APP',
     environ: Mapping[str, str] = None,
+    env_file: Union[None, str, Path] = None,
+    secrets_dir: Union[None, str, Path] = None,
+    root_path: JsonLocation = (),
+    document: Union[None, int, Callable[[JsonDict], bool]] = None,
+    include_resolver: IncludeResolver = None,
+    interpolate: bool = False,
+    intern_values: bool = False,
+    cache: SettingsCache = None,
+    profiler: LoadProfiler = None,
     _content_reader: Callable[[Path], str] = Path.read_text,
 ) -> SettingsM:
     """
@@ -128,65 +194,217 @@ def load_settings(
         subclass of :py:class:`BaseSettingsModel` then `env_prefix`
         argument will be ignored.
     :param environ: environment to use instead of `os.environ`.
+    :param env_file: *dotenv* file, which variables are applied like
+        environment variables, see :py:func:`.load_env_file`. Environment
+        variables take precedence over the file variables.
+    :param secrets_dir: directory with one file per value, e.g. mounted
+        *Kubernetes* secrets. Files are named like environment variables
+        without a prefix, see :py:func:`.load_secrets_dir`. Secrets take
+        precedence over the content, environment variables and *dotenv* file
+        take precedence over secrets.
+    :param root_path: location of settings section inside the content, e.g.
+        :code:`('services', 'billing')`, other parts of the content are
+        skipped by decoder without being decoded
+    :param document: select document of multi-document *yaml* stream by
+        index or by predicate, see :py:func:`.decoder.yaml.decode_document`
+    :param include_resolver: resolves :code:`$include` directives of the
+        content, see :py:class:`.IncludeResolver`
+    :param interpolate: substitute :code:`${...}` references inside the
+        content strings by other values of the content or by environment
+        variables, see :py:mod:`.interpolation`
+    :param intern_values: make equal short string values of the content
+        share single object, which reduces memory used by large documents
+        with repeated values. Equal mapping keys are always shared
+    :param cache: validated models cache, allows to skip validation if the
+        same content and environment has been loaded before
+    :param profiler: collects statistics of each loading phase, see
+        :py:class:`.LoadProfiler`
     :raises LoadingError: in case if any error occurred while loading settings
     :return: instance of settings model, provided by `cls` argument
     """
-    if any_content is None and not load_env:
+    if (
+        any_content is None
+        and not load_env
+        and env_file is None
+        and secrets_dir is None
+    ):
         raise LoadingError(
             None, msg='no sources provided to load settings from'
         )
 
+    # an empty mapping is a valid environment too
+    if environ is None:
+        environ = os_environ
+
     decoder_desc: Optional[DecoderMeta] = None
     file_path: Optional[Path] = None
     content: Optional[str] = None
 
     if any_content is not None:
-        decoder_desc, file_path, content = _resolve_content_arg(
-            any_content, type_hint, _content_reader
-        )
+        with profile_phase(profiler, READ_PHASE) as stats:
+            decoder_desc, file_path, content = _resolve_content_arg(
+                any_content, type_hint, _content_reader
+            )
+            if stats is not None:
+                stats.size = len(content.encode())
 
     document_content: Optional[JsonDict] = None
     file_values: Optional[TextValues] = None
     if content is not None:
-        try:
-            document_content = file_values = decoder_desc.values_loader(
-                content
+        decoder_options: Dict[str, Any] = {}
+        if root_path:
+            decoder_options['root_path'] = root_path
+        if document is not None:
+            if decoder_desc.name != 'yaml':
+                raise LoadingError(
+                    file_path,
+                    None,
+                    'document selection is supported only by "yaml" decoder',
+                )
+            decoder_options['document'] = document
+        if intern_values:
+            decoder_options['intern_values'] = True
+
+        with profile_phase(profiler, DECODE_PHASE) as stats:
+            try:
+                file_values = decoder_desc.values_loader(
+                    content, **decoder_options
+                )
+            except ParsingError as err:
+                raise LoadingParseError(
+                    file_path,
+                    err.cause,
+                    location=err.text_location,
+                    decoder=decoder_desc,
+                )
+            document_content = file_values = resolve_includes(
+                include_resolver, file_values, file_path
+            )
+            if stats is not None:
+                stats.size = len(content.encode())
+                stats.nodes = count_nodes(file_values)
+
+    if interpolate and file_values is not None:
+        with profile_phase(profiler, INTERPOLATE_PHASE):
+            try:
+                document_content = file_values = interpolation.interpolate(
+                    file_values, environ
+                )
+            except interpolation.InterpolationError as err:
+                raise LoadingParseError(
+                    file_path,
+                    err,
+                    location=_get_text_location(file_values, err.path),
+                    decoder=decoder_desc,
+                )
+
+    secrets_values: Optional[TextValues] = None
+    if secrets_dir is not None:
+        with profile_phase(profiler, SECRETS_PHASE) as stats:
+            secrets_values = load_secrets_dir(
+                _get_secrets_restorer(cls), secrets_dir
+            )
+            if stats is not None:
+                stats.nodes = count_nodes(secrets_values)
+
+        with profile_phase(profiler, MERGE_PHASE) as stats:
+            document_content = deep_merge_mappings(
+                secrets_values,
+                document_content if document_content is not None else {},
+                patch_in_place=include_resolver is None,
+            )
+            if stats is not None:
+                stats.nodes = count_nodes(document_content)
+
+    env_file_values: Optional[TextValues] = None
+    if env_file is not None:
+        with profile_phase(profiler, RESTORE_PHASE) as stats:
+            env_file_values = load_env_file(
+                _get_shape_restorer(cls, env_prefix), env_file
             )
-        except ParsingError as err:
-            raise LoadingParseError(
-                file_path,
-                err.cause,
-                location=err.text_location,
-                decoder=decoder_desc,
+            if stats is not None:
+                stats.nodes = count_nodes(env_file_values)
+
+        with profile_phase(profiler, MERGE_PHASE) as stats:
+            document_content = deep_merge_mappings(
+                env_file_values,
+                document_content if document_content is not None else {},
+                patch_in_place=include_resolver is None,
             )
+            if stats is not None:
+                stats.nodes = count_nodes(document_content)
 
     # prepare environment values
     env_values: Optional[FlatMapValues] = None
     if load_env:
-        # TODO: ignore env vars restoration errors so far
-        restorer = _get_shape_restorer(cls, env_prefix)
-        env_values, _ = restorer.restore(environ or os_environ)
+        with profile_phase(profiler, RESTORE_PHASE) as stats:
+            # TODO: ignore env vars restoration errors so far
+            restorer = _get_shape_restorer(cls, env_prefix)
+            env_values, _ = restorer.restore(environ)
+            if stats is not None:
+                stats.nodes = count_nodes(env_values)
 
-        if document_content is not None:
+        with profile_phase(profiler, MERGE_PHASE) as stats:
+            # decoded document is owned here, so list patches restored
+            # from environment are applied to its lists in-place, unless
+            # it shares values cached by include resolver
             document_content = deep_merge_mappings(
-                env_values, document_content
+                env_values,
+                document_content if document_content is not None else {},
+                patch_in_place=include_resolver is None,
             )
-        else:
-            document_content = env_values
+            if stats is not None:
+                stats.nodes = count_nodes(document_content)
+
+    # sources ordered by precedence
+    sources = tuple(
+        values
+        for values in (
+            env_values,
+            env_file_values,
+            secrets_values,
+            file_values,
+        )
+        if values is not None
+    )
 
     try:
-        result = cls(**document_content)
+        with profile_phase(profiler, VALIDATE_PHASE):
+            if cache is not None:
+                result = cache.get_or_validate(cls, document_content)
+            else:
+                result = cls(**document_content)
     except ValidationError as err:
         assert len(err.raw_errors) > 0
-        new_err = err
 
-        if file_values is not None:
-            new_err = with_errs_locations(cls, err, file_values)
-        if env_values is not None:
-            new_err = with_errs_locations(cls, new_err, env_values)
+        with profile_phase(profiler, LOCATE_ERRORS_PHASE) as stats:
+            new_err = _locate_errors(cls, file_path, sources, err)
+            if stats is not None:
+                stats.nodes = len(new_err.raw_errors)
 
-        raise LoadingValidationError(
-            new_err.raw_errors, cls, file_path
-        ) from err
+        raise new_err from err
 
+    if isinstance(result, BaseSettingsModel):
+        result.bind_errors_locator(
+            partial(_locate_errors, cls, file_path, sources)
+        )
     return result
+
+
+def _get_text_location(
+    values: TextValues, path: JsonLocation
+) -> Optional[TextLocation]:
+    try:
+        return values.get_location(path)
+    except KeyError:
+        return None
+
+
+def _locate_errors(
+    cls: Type[BaseModel],
+    file_path: Optional[Path],
+    sources: Tuple[AnySourceLocProvider, ...],
+    err: ValidationError,
+) -> LoadingValidationError:
+    new_err = with_errs_locations(cls, err, *sources)
+    return LoadingValidationError(new_err.raw_errors, cls, file_path)
@@ -0,0 +1,124 @@
+"""
+Instrumentation of :py:func:`.load_settings` phases.
+"""
+import tracemalloc
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Callable, ContextManager, Iterator, List, Optional
+
+from attr import dataclass
+
+from pydantic_settings.types import Json
+
+READ_PHASE = 'read'
+DECODE_PHASE = 'decode'
+INTERPOLATE_PHASE = 'interpolate'
+SECRETS_PHASE = 'secrets'
+RESTORE_PHASE = 'restore'
+MERGE_PHASE = 'merge'
+VALIDATE_PHASE = 'validate'
+LOCATE_ERRORS_PHASE = 'locate_errors'
+
+
+@dataclass
+class PhaseStats:
+    """Statistics of single loading phase."""
+
+    name: str
+    """Phase name"""
+
+    duration: float = 0.0
+    """Phase duration in seconds"""
+
+    size: Optional[int] = None
+    """Size of handled text in UTF-8 bytes, if phase handles any text"""
+
+    nodes: Optional[int] = None
+    """Number of handled document nodes, if phase handles any"""
+
+    memory_delta: Optional[int] = None
+    """
+    Difference of memory allocated by python in bytes, available only if
+    memory tracing is enabled
+    """
+
+
+class LoadProfiler:
+    """
+    Collects :py:class:`PhaseStats` for each phase of settings loading.
+    Pass an instance as :py:obj:`~.load_settings.profiler` argument.
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[PhaseStats], None] = None,
+        *,
+        trace_memory: bool = False,
+    ):
+        """
+        :param callback: invoked with statistics of each finished phase
+        :param trace_memory: measure memory allocated while each phase using
+            :py:mod:`tracemalloc`, tracing will be started if it's not
+        """
+        self.callback = callback
+        self.trace_memory = trace_memory
+        self.phases: List[PhaseStats] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[PhaseStats]:
+        stats = PhaseStats(name)
+
+        stop_tracing = False
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            stop_tracing = True
+        mem_before = (
+            tracemalloc.get_traced_memory()[0] if self.trace_memory else 0
+        )
+        start = perf_counter()
+        try:
+            yield stats
+        finally:
+            stats.duration = perf_counter() - start
+            if self.trace_memory:
+                stats.memory_delta = (
+                    tracemalloc.get_traced_memory()[0] - mem_before
+                )
+                if stop_tracing:
+                    tracemalloc.stop()
+
+            self.phases.append(stats)
+            if self.callback is not None:
+                self.callback(stats)
+
+
+class _NullPhase:
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *args) -> None:
+        pass
+
+
+_null_phase = _NullPhase()
+
+
+def profile_phase(
+    profiler: Optional[LoadProfiler], name: str
+) -> ContextManager[Optional[PhaseStats]]:
+    """
+    Profile phase with given profiler, if there is any. Resulted context
+    manager yields none if profiling is disabled.
+    """
+    if profiler is None:
+        return _null_phase
+    return profiler.phase(name)
+
+
+def count_nodes(value: Json) -> int:
+    """Count document nodes, including the root one."""
+    if isinstance(value, dict):
+        return 1 + sum(count_nodes(val) for val in value.values())
+    if isinstance(value, list):
+        return 1 + sum(count_nodes(val) for val in value)
+    return 1
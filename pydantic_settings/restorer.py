@@ -1,4 +1,3 @@
-from collections import defaultdict
 from dataclasses import is_dataclass
 from functools import reduce
 from typing import (
@@ -19,6 +18,7 @@ from typing import (
 
 from attr import has as is_attr_class
 from pydantic import BaseModel
+from pydantic.fields import SHAPE_LIST, SHAPE_SEQUENCE, SHAPE_TUPLE_ELLIPSIS
 
 from pydantic_settings.decoder import ParsingError, TextValues
 from pydantic_settings.types import (
@@ -27,19 +27,51 @@ from pydantic_settings.types import (
     Json,
     JsonDict,
     JsonLocation,
+    TextLocation,
+)
+from pydantic_settings.utils import (
+    ListPatch,
+    LRUCache,
+    RestoredDict,
+    copy_json,
+    get_sequence_item_type,
+    get_union_subtypes,
 )
-from pydantic_settings.utils import get_union_subtypes
 
 _RecStrDictValue = Union['_RecStrDict', str]
 _RecStrDict = Dict[str, _RecStrDictValue]
+_ValuePath = Tuple[Union[str, int], ...]
 
 
 class _FieldLocDescription(NamedTuple):
-    path: Tuple[str, ...]
+    path: _ValuePath
     is_complex: bool
     is_determined: bool
 
 
+class _SequenceLocDescription(NamedTuple):
+    path: _ValuePath
+    item: _FieldLocDescription
+    """Item description, path is relative to the item"""
+    item_flat_map: Dict[str, _FieldLocDescription]
+    """Item fields, keys and paths are relative to the item"""
+    item_sequences: Dict[str, '_SequenceLocDescription']
+    """Item nested sequences, keys and paths are relative to the item"""
+
+
+class _FailedInlineValue(NamedTuple):
+    """
+    Memoized decoding failure, a fresh :py:class:`ParsingError` is raised on
+    each hit, so tracebacks of cached errors don't pile up callers frames.
+    """
+
+    cause: Exception
+    text_location: Optional[TextLocation]
+
+
+_sequence_shapes = (SHAPE_LIST, SHAPE_SEQUENCE, SHAPE_TUPLE_ELLIPSIS)
+
+
 def _noop(val: Any) -> Any:
     return val
 
@@ -91,7 +123,10 @@ def _list_fields(type_: Type) -> Iterator[Tuple[str, Type]]:
 
     if isinstance(type_, type) and issubclass(type_, BaseModel):
         for field in type_.__fields__.values():
-            yield field.name, field.type_
+            if field.shape in _sequence_shapes:
+                yield field.name, field.outer_type_
+            else:
+                yield field.name, field.type_
     elif is_attr_class(type_):
         for field in type_.__attrs_attrs__:
             yield field.name, field.type
@@ -105,13 +140,27 @@ def _list_fields(type_: Type) -> Iterator[Tuple[str, Type]]:
 def _traveler(
     model: Type[AnyModelType],
     prefix: str,
-    loc: Tuple[str, ...],
+    loc: _ValuePath,
     case_reducer: Callable[[str], str],
-) -> Iterator[Tuple[str, _FieldLocDescription]]:
+) -> Iterator[
+    Tuple[str, Union[_FieldLocDescription, _SequenceLocDescription]]
+]:
     for field_name, field_type in _list_fields(model):
         upper_field_name = case_reducer(field_name)
         new_prefix = f'{prefix}_{upper_field_name}'
         new_loc = loc + (field_name,)
+
+        try:
+            item_type = get_sequence_item_type(field_type)
+        except TypeError:
+            pass
+        else:
+            yield new_prefix, _FieldLocDescription(new_loc, False, False)
+            yield new_prefix, _describe_sequence(
+                new_loc, item_type, case_reducer
+            )
+            continue
+
         is_complex, is_only_complex = _estimate_field_complexity(field_type)
         yield new_prefix, _FieldLocDescription(
             new_loc, is_complex, is_only_complex
@@ -125,24 +174,231 @@ def _traveler(
             )
 
 
+def _describe_sequence(
+    loc: _ValuePath, item_type: Type, case_reducer: Callable[[str], str]
+) -> _SequenceLocDescription:
+    try:
+        nested_item_type = get_sequence_item_type(item_type)
+    except TypeError:
+        pass
+    else:
+        return _SequenceLocDescription(
+            loc,
+            _FieldLocDescription((), False, False),
+            {},
+            {'': _describe_sequence((), nested_item_type, case_reducer)},
+        )
+
+    is_complex, is_only_complex = _estimate_field_complexity(item_type)
+    if not is_complex:
+        return _SequenceLocDescription(
+            loc, _FieldLocDescription((), False, False), {}, {}
+        )
+
+    return _SequenceLocDescription(
+        loc,
+        _FieldLocDescription((), is_complex, is_only_complex),
+        _build_model_flat_map(item_type, '', case_reducer),
+        _build_sequences_map(item_type, '', case_reducer),
+    )
+
+
 def _build_model_flat_map(
     model: Type[BaseModel], prefix: str, case_reducer: Callable[[str], str]
 ) -> Dict[str, _FieldLocDescription]:
-    return dict(_traveler(model, prefix, (), case_reducer))
+    return {
+        key: desc
+        for key, desc in _traveler(model, prefix, (), case_reducer)
+        if isinstance(desc, _FieldLocDescription)
+    }
+
+
+def _build_sequences_map(
+    model: Type[BaseModel], prefix: str, case_reducer: Callable[[str], str]
+) -> Dict[str, _SequenceLocDescription]:
+    return {
+        key: desc
+        for key, desc in _traveler(model, prefix, (), case_reducer)
+        if isinstance(desc, _SequenceLocDescription)
+    }
+
+
+def _resolve_sequence_item_key(
+    key: str, sequences: Mapping[str, _SequenceLocDescription]
+) -> Optional[_FieldLocDescription]:
+    """
+    Resolve key which addresses sequence item or value nested inside the
+    item, like :code:`'prefix_seq_1_field'`.
+    """
+    for seq_prefix, seq in sequences.items():
+        if not key.startswith(seq_prefix + '_'):
+            continue
+
+        idx_start = len(seq_prefix) + 1
+        idx, has_rest, rest = key[idx_start:].partition('_')
+        if not idx.isdecimal():
+            continue
+
+        if has_rest:
+            rest = '_' + rest
+            desc = seq.item_flat_map.get(rest) or _resolve_sequence_item_key(
+                rest, seq.item_sequences
+            )
+            if desc is None:
+                continue
+        else:
+            desc = seq.item
+
+        return _FieldLocDescription(
+            seq.path + (int(idx),) + desc.path,
+            desc.is_complex,
+            desc.is_determined,
+        )
+
+    return None
+
+
+_PathSetter = Callable[[JsonDict, Json, Dict[_ValuePath, str], str], bool]
+
+
+def _compile_path_setters(
+    flat_map: Mapping[str, _FieldLocDescription]
+) -> Dict[str, _PathSetter]:
+    """
+    Generate setter function for each simple field path, descending is
+    unrolled and the path is bound as a constant. Setter descends only
+    through segments created by restorer, and returns false if there is any
+    other value on the way, so generic :py:func:`_apply_path_value` must be
+    used instead.
+    """
+    lines: List[str] = []
+    table: List[str] = []
+    namespace: Dict[str, Any] = {'RestoredDict': RestoredDict}
+
+    for num, (key, desc) in enumerate(flat_map.items()):
+        if desc.is_complex or desc.is_determined:
+            continue
+
+        namespace[f'path_{num}'] = desc.path
+        lines.append(f'def setter_{num}(segment, value, consumed, orig_key):')
+        for part in desc.path[:-1]:
+            lines += [
+                f'    next_segment = segment.get({part!r})',
+                '    if next_segment is None:',
+                f'        next_segment = segment[{part!r}] = RestoredDict()',
+                '    elif next_segment.__class__ is not RestoredDict:',
+                '        return False',
+                '    segment = next_segment',
+            ]
+        lines += [
+            f'    segment[{desc.path[-1]!r}] = value',
+            f'    consumed[path_{num}] = orig_key',
+            '    return True',
+        ]
+        table.append(f'    {key!r}: setter_{num},')
+
+    source = '\n'.join(lines + ['setters = {'] + table + ['}'])
+    exec(compile(source, '<restorer path setters>', 'exec'), namespace)
+    return namespace['setters']
+
+
+_ASCII_CHARS = ''.join(map(chr, range(128)))
+
+
+class _FirstCharsTable(Dict[str, bool]):
+    """
+    Table of first key characters, which tells whether key starting with a
+    character may start with the prefix after case reduction. Allows to
+    reject most of non-prefixed keys without reducing whole key.
+
+    Table is filled for ASCII characters once and is never modified later,
+    other characters are checked on each lookup.
+    """
+
+    __slots__ = ('_prefix', '_case_reducer')
+
+    def __init__(self, prefix: str, case_reducer: Callable[[str], str]):
+        # ASCII characters are reduced one-to-one, so single reduced
+        # character matches the prefix only if it's the prefix first one
+        if prefix:
+            reduced = case_reducer(_ASCII_CHARS)
+            super().__init__(zip(_ASCII_CHARS, map(prefix[0].__eq__, reduced)))
+        else:
+            super().__init__(dict.fromkeys(_ASCII_CHARS, True))
+        self[''] = True
+        self._prefix = prefix
+        self._case_reducer = case_reducer
+
+    def __missing__(self, char: str) -> bool:
+        # single character might be reduced to several characters
+        reduced = self._case_reducer(char)
+        return self._prefix.startswith(reduced) or reduced.startswith(
+            self._prefix
+        )
+
+
+class _ReducedKeysMemo(Dict[str, str]):
+    """
+    Bounded memo of case-reduced keys. Concurrent writes store equal values,
+    so the memo is safe to share between threads.
+    """
+
+    __slots__ = ('_case_reducer',)
+
+    _max_size = 8192
+
+    def __init__(self, case_reducer: Callable[[str], str]):
+        super().__init__()
+        self._case_reducer = case_reducer
+
+    def __missing__(self, key: str) -> str:
+        reduced = self._case_reducer(key)
+        if len(self) < self._max_size:
+            self[key] = reduced
+        return reduced
 
 
 class FlatMapValues(Dict[str, Json]):
-    __slots__ = 'restored_env_values', 'restored_text_values'
+    """
+    Values restored from a flat-mapping, which also keeps track of values
+    provenance.
+    """
+
+    __slots__ = (
+        'restored_env_values',
+        'restored_text_values',
+        '_text_values_depths',
+    )
 
     def __init__(
         self,
-        restored_env_values: Dict[JsonLocation, str],
-        restored_text_values: Dict[str, Union[TextValues, Dict]],
+        restored_env_values: Dict[_ValuePath, str],
+        restored_text_values: Dict[_ValuePath, Tuple[str, TextValues]],
         **values: Json,
     ):
+        """
+        :param restored_env_values: maps value path to flat-mapping key the
+            value was taken from
+        :param restored_text_values: maps value path to flat-mapping key and
+            decoded inline value, the whole subtree was taken from
+        :param values: restored values
+        """
         super().__init__(**values)
         self.restored_env_values = restored_env_values
         self.restored_text_values = restored_text_values
+        # decoded subtrees paths lengths, longest first
+        self._text_values_depths = sorted(
+            {len(path) for path in restored_text_values}, reverse=True
+        )
+
+    def __reduce__(self):
+        return (
+            FlatMapValues,
+            (self.restored_env_values, self.restored_text_values),
+            None,
+            None,
+            iter(self.items()),
+        )
 
     def get_location(self, val_loc: JsonLocation) -> FlatMapLocation:
         """
@@ -152,33 +408,25 @@ class FlatMapValues(Dict[str, Json]):
         :raises KeyError: in case if such value hasn't been restored
         :return: flat-mapping location
         """
-        try:
-            return self._get_location(val_loc)
-        except KeyError:
-            raise KeyError(val_loc)
-
-    def _get_location(self, val_loc: JsonLocation) -> FlatMapLocation:
+        val_loc = tuple(val_loc)
         try:
             return self.restored_env_values[val_loc], None
         except KeyError:
             pass
 
-        loc_iter = iter(val_loc)
-
-        key_used: Optional[str] = None
-        text_vals: Optional[TextValues] = None
-
-        curr = self.restored_text_values
-        for part in loc_iter:
-            curr = curr[part]
-            if isinstance(curr, tuple):
-                key_used, text_vals = curr
-                break
+        for depth in self._text_values_depths:
+            if depth >= len(val_loc):
+                continue
 
-        if text_vals is None:
-            raise KeyError(val_loc)
+            try:
+                key_used, text_vals = self.restored_text_values[
+                    val_loc[:depth]
+                ]
+                return key_used, text_vals.get_location(val_loc[depth:])
+            except KeyError:
+                pass
 
-        return key_used, text_vals.get_location(tuple(loc_iter))
+        raise KeyError(val_loc)
 
 
 class InvalidAssignError(ValueError):
@@ -192,105 +440,309 @@ class InvalidAssignError(ValueError):
 class CannotParseValueError(InvalidAssignError):
     """Cannot parse value."""
 
+    def __init__(
+        self,
+        loc: Optional[Sequence[str]],
+        key: str,
+        text_location: TextLocation = None,
+    ):
+        super().__init__(loc, key)
+        self.text_location = text_location
+        """Error location inside the value."""
+
 
 class AssignBeyondSimpleValueError(InvalidAssignError):
     """Assigning value deeper then previous simple value is forbidden."""
 
 
+class _RestorerStructure:
+    """
+    Model shape compiled for restoring, which is shared by restorers of all
+    prefixes. Maps are keyed by keys suffixes following the prefix, like
+    :code:`'_upstreams_weight'`. Only thread-safe caches are modified after
+    construction.
+    """
+
+    __slots__ = (
+        'case_reducer',
+        'flat_map',
+        'sequences_map',
+        'compile_setters',
+        'setters',
+        'reduced_keys',
+        'dead_end_resolver',
+        'inline_values',
+    )
+
+    def __init__(
+        self,
+        model: AnyModelType,
+        case_sensitive: bool,
+        dead_end_value_resolver: Callable[[str], TextValues],
+        inline_values_cache_size: int,
+        compile_setters: bool,
+    ):
+        self.case_reducer = _noop if case_sensitive else str.casefold
+        self.flat_map = _build_model_flat_map(model, '', self.case_reducer)
+        self.sequences_map = _build_sequences_map(model, '', self.case_reducer)
+        self.compile_setters = compile_setters
+        self.setters: Optional[Dict[str, _PathSetter]] = None
+        self.reduced_keys = _ReducedKeysMemo(self.case_reducer)
+        self.dead_end_resolver = dead_end_value_resolver
+        self.inline_values: Optional[
+            LRUCache[str, Union[TextValues, _FailedInlineValue]]
+        ] = (
+            LRUCache(inline_values_cache_size)
+            if inline_values_cache_size > 0
+            else None
+        )
+
+    def get_setters(self) -> Optional[Dict[str, _PathSetter]]:
+        setters = self.setters
+        if self.compile_setters and setters is None:
+            # concurrent compilations produce equal setters, the last one
+            # is published by atomic assignment
+            setters = self.setters = _compile_path_setters(self.flat_map)
+        return setters
+
+    def get_description(self, suffix: str) -> Optional[_FieldLocDescription]:
+        desc = self.flat_map.get(suffix)
+        if desc is None:
+            desc = _resolve_sequence_item_key(suffix, self.sequences_map)
+        return desc
+
+
 class ModelShapeRestorer(object):
     """
     Restores flat-mapping into JSON document of known shape.
 
-    Currently, setting nested a value inside of any sequence isn't supported.
+    Sequence items, or values nested inside items, are addressed by keys with
+    item index, like :code:`'APP_UPSTREAMS_3_WEIGHT'`. Such values are
+    restored as :py:class:`.ListPatch`, which is applied to a list provided by
+    other source while merging (see :py:func:`.deep_merge_mappings`).
+
+    Values decoded by `dead_end_value_resolver` are memoized by theirs raw
+    text, each call gets own copy of them, so changes of restored values
+    never affect other calls.
+
+    Restorer is immutable, so it may be shared by threads. Use
+    :py:meth:`with_prefix` to get restorer of another prefix, which shares
+    compiled model shape and caches with this one.
     """
 
+    __slots__ = ('_structure', '_prefix', '_first_chars')
+
     def __init__(
         self,
         model: AnyModelType,
         prefix: str,
         case_sensitive: bool,
         dead_end_value_resolver: Callable[[str], TextValues],
+        inline_values_cache_size: int = 128,
+        compile_setters: bool = False,
     ):
-        self._case_reducer = _noop if case_sensitive else str.casefold
-        self._prefix = self._case_reducer(prefix)
-        self._model_flat_map = _build_model_flat_map(
-            model, self._prefix, self._case_reducer
+        """
+        :param model: model class
+        :param prefix: flat-mapping keys prefix
+        :param case_sensitive: respect flat-mapping keys case
+        :param dead_end_value_resolver: decoder of inline complex values
+        :param inline_values_cache_size: max number of memoized inline
+            values, zero disables memoization
+        :param compile_setters: assign restored values using functions
+            generated for each model field path, which is faster for large
+            models
+        """
+        self._init(
+            _RestorerStructure(
+                model,
+                case_sensitive,
+                dead_end_value_resolver,
+                inline_values_cache_size,
+                compile_setters,
+            ),
+            prefix,
+        )
+
+    def _init(self, structure: _RestorerStructure, prefix: str) -> None:
+        self._structure = structure
+        self._prefix = structure.case_reducer(prefix)
+        self._first_chars = _FirstCharsTable(
+            self._prefix, structure.case_reducer
         )
-        self._dead_end_resolver = dead_end_value_resolver
 
     @property
     def prefix(self) -> str:
         return self._prefix
 
-    @prefix.setter
-    def prefix(self, val: str):
-        self._prefix = val
+    def with_prefix(self, prefix: str) -> 'ModelShapeRestorer':
+        """
+        Get restorer of another prefix, compiled model shape isn't rebuilt.
+
+        :param prefix: flat-mapping keys prefix
+        :return: new restorer
+        """
+        restorer = object.__new__(ModelShapeRestorer)
+        restorer._init(self._structure, prefix)
+        return restorer
 
     def restore(
         self, flat_map: Mapping[str, str]
     ) -> Tuple['FlatMapValues', Optional[Sequence[InvalidAssignError]]]:
         errs: List[InvalidAssignError] = []
         target: Dict[str, Json] = {}
-        consumed_envs: Dict[JsonLocation, str] = {}
-
-        def default_dict_factory():
-            return defaultdict(default_dict_factory)
-
-        consumed_text_vals = default_dict_factory()
-
+        consumed_envs: Dict[_ValuePath, str] = {}
+        consumed_text_vals: Dict[_ValuePath, Tuple[str, TextValues]] = {}
+
+        prefix = self._prefix
+        prefix_len = len(prefix)
+        first_chars = self._first_chars
+        reduced_keys = self._structure.reduced_keys
+        setters = self._structure.get_setters()
         for orig_key, val in flat_map.items():
-            key = self._case_reducer(orig_key)
-            if not key.startswith(self._prefix):
+            if not first_chars[orig_key[:1]]:
                 continue
 
-            try:
-                path, is_complex, is_only_complex = self._model_flat_map[key]
-            except KeyError:
+            key = reduced_keys[orig_key]
+            if not key.startswith(prefix):
                 continue
 
-            if is_complex or is_only_complex:
-                try:
-                    val = self._dead_end_resolver(val)
-                    assert isinstance(
-                        val, TextValues
-                    ), 'Check is correct decoder used'
-                    reduce(
-                        lambda curr, item: curr[item],
-                        path[:-1],
-                        consumed_text_vals,
-                    )[path[-1]] = (orig_key, val)
-                except ParsingError as err:
-                    if is_only_complex:
-                        new_err = CannotParseValueError(path, orig_key)
-                        new_err.__cause__ = err.cause
-                        errs.append(new_err)
-                        continue
+            suffix = key[prefix_len:]
+            if setters is not None:
+                setter = setters.get(suffix)
+                if setter is not None and setter(
+                    target, val, consumed_envs, orig_key
+                ):
+                    continue
+
+            self._restore_value(
+                orig_key,
+                suffix,
+                val,
+                target,
+                consumed_envs,
+                consumed_text_vals,
+                errs,
+            )
+
+        return FlatMapValues(consumed_envs, consumed_text_vals, **target), errs
+
+    def has_key(self, key: str) -> bool:
+        """
+        Check whether flat-mapping key addresses any value of the model.
+        """
+        if not self._first_chars[key[:1]]:
+            return False
+        key = self._structure.reduced_keys[key]
+        prefix = self._prefix
+        if not key.startswith(prefix):
+            return False
+        prefix_len = len(prefix)
+        return self._structure.get_description(key[prefix_len:]) is not None
+
+    def prepare(self) -> None:
+        """
+        Build lazily created state ahead of time, e.g. before forking worker
+        processes, so it's shared by them instead of being built by each one.
+        """
+        self._structure.get_setters()
+
+    def _restore_value(
+        self,
+        orig_key: str,
+        suffix: str,
+        val: str,
+        target: JsonDict,
+        consumed_envs: Dict[_ValuePath, str],
+        consumed_text_vals: Dict[_ValuePath, Tuple[str, TextValues]],
+        errs: List[InvalidAssignError],
+    ) -> None:
+        structure = self._structure
+        desc = structure.flat_map.get(suffix)
+        if desc is None:
+            desc = _resolve_sequence_item_key(suffix, structure.sequences_map)
+            if desc is None:
+                return
+        path, is_complex, is_only_complex = desc
+
+        if is_complex or is_only_complex:
+            try:
+                val = self._decode_inline_value(val)
+                consumed_text_vals[path] = (orig_key, val)
+            except ParsingError as err:
+                if is_only_complex:
+                    new_err = CannotParseValueError(
+                        path, orig_key, err.text_location
+                    )
+                    new_err.__cause__ = err.cause
+                    errs.append(new_err)
+                    return
 
+        try:
+            _apply_path_value(target, path, orig_key, val)
+        except InvalidAssignError as e:
+            errs.append(e)
+        else:
+            consumed_envs[path] = orig_key
+
+    def _decode_inline_value(self, raw_val: str) -> TextValues:
+        inline_values = self._structure.inline_values
+        if inline_values is None:
+            return self._resolve_dead_end(raw_val)
+
+        res = inline_values.get(raw_val)
+        if res is None:
             try:
-                _apply_path_value(target, path, orig_key, val)
-            except InvalidAssignError as e:
-                errs.append(e)
-            else:
-                consumed_envs[path] = orig_key
+                res = self._resolve_dead_end(raw_val)
+            except ParsingError as err:
+                res = _FailedInlineValue(
+                    err.cause.with_traceback(None), err.text_location
+                )
+            inline_values.put(raw_val, res)
+
+        if isinstance(res, _FailedInlineValue):
+            raise ParsingError(res.cause, res.text_location)
+        # memoized values end up inside models, e.g. as `Any` fields values
+        return TextValues(
+            res.location_finder,
+            **{key: copy_json(val) for key, val in res.items()},
+        )
 
-        return FlatMapValues(consumed_envs, consumed_text_vals, **target), errs
+    def _resolve_dead_end(self, raw_val: str) -> TextValues:
+        val = self._structure.dead_end_resolver(raw_val)
+        assert isinstance(val, TextValues), 'Check is correct decoder used'
+        return val
 
 
 def _apply_path_value(
     root: JsonDict,
-    path: Sequence[str],
+    path: _ValuePath,
     orig_key: str,
     value: Union[str, JsonDict],
 ):
     curr_segment: Any = root
-    for path_part in path[:-1]:
+    for part_num, path_part in enumerate(path[:-1]):
         if not isinstance(curr_segment, dict):
             raise AssignBeyondSimpleValueError(path, orig_key)
         try:
             next_segment = curr_segment[path_part]
         except KeyError:
-            next_segment = {}
+            if isinstance(path[part_num + 1], int):
+                next_segment = ListPatch()
+            else:
+                next_segment = RestoredDict()
             curr_segment[path_part] = next_segment
+        else:
+            # other mappings are decoded inline values, copy them before
+            # writing into
+            if isinstance(next_segment, dict) and not isinstance(
+                next_segment, (RestoredDict, ListPatch)
+            ):
+                next_segment = curr_segment[path_part] = RestoredDict(
+                    next_segment
+                )
 
         curr_segment = next_segment
+
+    if not isinstance(curr_segment, dict):
+        raise AssignBeyondSimpleValueError(path, orig_key)
     curr_segment[path[-1]] = value
@@ -0,0 +1,117 @@
+"""
+Settings source of a directory with one file per value, like secrets
+mounted by *Kubernetes* or *Docker*.
+
+File name is matched against model fields the same way as environment
+variable name, but without a prefix, e.g. :code:`db_password` file sets
+:code:`password` field of :code:`db` nested model.
+"""
+import os
+from pathlib import Path
+from typing import Dict, Tuple, Union
+
+import attr
+
+from pydantic_settings.decoder import TextValues
+from pydantic_settings.errors import LoadingError, LoadingParseError
+from pydantic_settings.restorer import (
+    FlatMapValues,
+    InvalidAssignError,
+    ModelShapeRestorer,
+)
+from pydantic_settings.types import JsonLocation, TextLocation
+
+KEY_PREFIX = '_'
+"""
+Prefix prepended to file names, so they are matched by restorer built with
+empty prefix.
+"""
+
+SOURCE = 'secrets'
+"""Source name of errors of files, which can't be restored."""
+
+
+def _file_location(file_path: Path, content: str) -> TextLocation:
+    lines = content.split('\n')
+    return TextLocation(
+        1, 1, len(lines), len(lines[-1]) + 1, 0, len(content), file_path
+    )
+
+
+class _SecretsLocationFinder:
+    def __init__(
+        self,
+        values: FlatMapValues,
+        files: Dict[str, Tuple[Path, str]],
+    ):
+        self._values = values
+        self._files = files
+
+    def get_location(self, key: JsonLocation) -> TextLocation:
+        flat_key, text_loc = self._values.get_location(key)
+        file_path, content = self._files[flat_key]
+        if text_loc is None:
+            return _file_location(file_path, content)
+        return attr.evolve(text_loc, file_path=file_path)
+
+
+def _restore_error(
+    err: InvalidAssignError, files: Dict[str, Tuple[Path, str]]
+) -> LoadingParseError:
+    file_path, content = files[err.key]
+    location = getattr(err, 'text_location', None)
+    return LoadingParseError(
+        file_path,
+        err.__cause__ or err,
+        location=(
+            _file_location(file_path, content)
+            if location is None
+            else attr.evolve(location, file_path=file_path)
+        ),
+        source=SOURCE,
+    )
+
+
+def load_secrets_dir(
+    restorer: ModelShapeRestorer, dir_path: Union[str, Path]
+) -> TextValues:
+    """
+    Load values from files of the directory. Directory is scanned by single
+    :py:func:`os.scandir` pass, and only files matching model fields are
+    read. Trailing line breaks are stripped from files contents. Hidden
+    files are ignored.
+
+    :param restorer: restorer built with empty prefix
+    :param dir_path: secrets directory
+    :raises LoadingError: directory or some of matched files can't be read
+    :raises LoadingParseError: file content can't be decoded as a value of a
+        complex field, location refers to the file
+    :return: values, which locations refer to the files
+    """
+    flat_map: Dict[str, str] = {}
+    files: Dict[str, Tuple[Path, str]] = {}
+    try:
+        with os.scandir(dir_path) as entries:
+            for entry in entries:
+                if entry.name.startswith('.'):
+                    continue
+                key = KEY_PREFIX + entry.name
+                if not restorer.has_key(key) or not entry.is_file():
+                    continue
+
+                file_path = Path(entry.path)
+                try:
+                    with open(entry.path) as f:
+                        content = f.read()
+                except OSError as err:
+                    raise LoadingError(file_path, err)
+
+                flat_map[key] = content.rstrip('\r\n')
+                files[key] = (file_path, content)
+    except OSError as err:
+        raise LoadingError(Path(dir_path), err)
+
+    values, errs = restorer.restore(flat_map)
+    if errs:
+        raise _restore_error(errs[0], files)
+    return TextValues(_SecretsLocationFinder(values, files), **values)
@@ -0,0 +1,208 @@
+"""
+Distribution of validated settings to worker processes through shared
+memory, so workers don't repeat reading, decoding and validation.
+"""
+import os
+import pickle
+import struct
+import sys
+import time
+from typing import Any, Generic, Optional, Tuple, TypeVar
+
+from pydantic import BaseModel
+
+M = TypeVar('M', bound=BaseModel)
+
+# version stamp and payload length
+_HEADER = struct.Struct('<QQ')
+_MIN_BACKOFF = 1e-5
+_MAX_BACKOFF = 0.01
+# before Python 3.13 attached blocks are registered by resource tracker of
+# the attaching process, which unlinks them on exit
+_TRACKS_ATTACHED = os.name == 'posix' and sys.version_info < (3, 13)
+
+
+class SnapshotTooLargeError(ValueError):
+    """Serialized settings don't fit into shared memory block."""
+
+
+class SnapshotNotPublishedError(LookupError):
+    """Nothing has been published into shared memory block yet."""
+
+
+class SnapshotBusyError(TimeoutError):
+    """
+    Snapshot is being written longer than the timeout, e.g. the writer has
+    crashed in the middle of publishing.
+    """
+
+
+def _create_shared_memory(name: Optional[str], size: int) -> Any:
+    from multiprocessing.shared_memory import SharedMemory
+
+    return SharedMemory(name, create=True, size=size)
+
+
+def _attach_shared_memory(name: str) -> Any:
+    from multiprocessing.shared_memory import SharedMemory
+
+    if not _TRACKS_ATTACHED:
+        if sys.version_info >= (3, 13):
+            return SharedMemory(name, track=False)
+        return SharedMemory(name)
+
+    from multiprocessing import resource_tracker
+
+    shm = SharedMemory(name)
+    resource_tracker.unregister(shm._name, 'shared_memory')
+    return shm
+
+
+def _unlink_shared_memory(shm: Any) -> None:
+    if _TRACKS_ATTACHED:
+        from multiprocessing import resource_tracker
+
+        # processes started by multiprocessing share the tracker of the
+        # owner, so attaching processes may have unregistered the block
+        resource_tracker.register(shm._name, 'shared_memory')
+    shm.unlink()
+
+
+class SharedSettings(Generic[M]):
+    """
+    Pickled snapshot of a settings model, stored in
+    :py:class:`multiprocessing.shared_memory.SharedMemory` block.
+
+    The snapshot is stamped with a version, which is incremented by each
+    :py:meth:`publish` call, so attached processes notice updates by reading
+    a few bytes only. Consistency of concurrent reads is guarded in seqlock
+    manner: version is odd while the snapshot is being written, and readers
+    retry if the version has been changed during reading.
+
+    Attaching doesn't register the block with the resource tracker of the
+    attaching process, so only the owner destroys it.
+
+    Requires Python 3.8 or later.
+    """
+
+    def __init__(self, shm: Any, owner: bool):
+        self._shm = shm
+        self._owner = owner
+        self._cached: Optional[Tuple[int, M]] = None
+
+    @classmethod
+    def create(
+        cls, size: int, name: Optional[str] = None
+    ) -> 'SharedSettings[M]':
+        """
+        Allocate new shared memory block, which is owned by the caller.
+
+        :param size: max size of serialized settings in bytes
+        :param name: block name, random one is used by default
+        """
+        return cls(_create_shared_memory(name, _HEADER.size + size), True)
+
+    @classmethod
+    def attach(cls, name: str) -> 'SharedSettings[M]':
+        """
+        Attach to shared memory block created by another process.
+
+        :param name: block name, see :py:attr:`name`
+        """
+        return cls(_attach_shared_memory(name), False)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def version(self) -> int:
+        """Version of published snapshot, zero if nothing published yet."""
+        return _HEADER.unpack_from(self._shm.buf)[0] // 2
+
+    def publish(self, model: M) -> int:
+        """
+        Serialize the model into shared memory block.
+
+        :param model: validated settings model, it's class must be importable
+            by attached processes
+        :raises SnapshotTooLargeError: serialized model doesn't fit the block
+        :return: new version
+        """
+        payload = pickle.dumps(model, pickle.HIGHEST_PROTOCOL)
+        buf = self._shm.buf
+        if _HEADER.size + len(payload) > len(buf):
+            raise SnapshotTooLargeError(
+                f'serialized settings take {len(payload)} bytes, but only '
+                f'{len(buf) - _HEADER.size} available'
+            )
+
+        stamp = _HEADER.unpack_from(buf)[0]
+        _HEADER.pack_into(buf, 0, stamp + 1, len(payload))
+        start, end = _HEADER.size, _HEADER.size + len(payload)
+        buf[start:end] = payload
+        _HEADER.pack_into(buf, 0, stamp + 2, len(payload))
+
+        self._cached = ((stamp + 2) // 2, model)
+        return (stamp + 2) // 2
+
+    def get(self, timeout: float = 1.0) -> M:
+        """
+        Get the latest published model. Snapshot is deserialized only if the
+        version has been changed since the previous call. Reads concurrent
+        with publishing are retried with exponential backoff.
+
+        :param timeout: max time in seconds to wait for publishing to finish
+        :raises SnapshotNotPublishedError: nothing has been published yet
+        :raises SnapshotBusyError: publishing isn't finished within timeout
+        :return: settings model
+        """
+        buf = self._shm.buf
+        deadline: Optional[float] = None
+        delay = 0.0
+        while True:
+            stamp, length = _HEADER.unpack_from(buf)
+            if not stamp % 2:
+                if stamp == 0:
+                    raise SnapshotNotPublishedError(
+                        f'no settings published into "{self.name}" yet'
+                    )
+
+                version = stamp // 2
+                if self._cached is not None and self._cached[0] == version:
+                    return self._cached[1]
+
+                start, end = _HEADER.size, _HEADER.size + length
+                payload = bytes(buf[start:end])
+                if _HEADER.unpack_from(buf)[0] == stamp:
+                    break
+
+            now = time.monotonic()
+            if deadline is None:
+                deadline = now + timeout
+            elif now >= deadline:
+                raise SnapshotBusyError(
+                    f'settings in "{self.name}" are being published for '
+                    f'more than {timeout} s'
+                )
+            time.sleep(delay)
+            delay = min(delay * 2 or _MIN_BACKOFF, _MAX_BACKOFF)
+
+        model = pickle.loads(payload)
+        self._cached = (version, model)
+        return model
+
+    def close(self) -> None:
+        """
+        Close access to the block, owner also destroys it.
+        """
+        self._cached = None
+        self._shm.close()
+        if self._owner:
+            _unlink_shared_memory(self._shm)
+
+    def __enter__(self) -> 'SharedSettings[M]':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
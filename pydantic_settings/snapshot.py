@@ -0,0 +1,244 @@
+"""
+Snapshot files of already validated settings, e.g. validated in CI, which
+are loaded without decoding and validation.
+
+Snapshot payload is a JSON document of explicitly set values, models are
+rebuilt from it by :py:meth:`pydantic.BaseModel.construct`, so a snapshot
+file can't execute any code.
+"""
+import hashlib
+import json
+import os
+import struct
+import tempfile
+from copy import deepcopy
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, Optional, Type, TypeVar, Union
+
+from pydantic import BaseModel
+from pydantic.fields import (
+    SHAPE_FROZENSET,
+    SHAPE_LIST,
+    SHAPE_MAPPING,
+    SHAPE_SET,
+    SHAPE_SINGLETON,
+    SHAPE_TUPLE_ELLIPSIS,
+    ModelField,
+)
+from pydantic.json import pydantic_encoder
+from pydantic.utils import lenient_issubclass
+
+from pydantic_settings.load import load_settings
+
+M = TypeVar('M', bound=BaseModel)
+
+_MAGIC = b'PSSNAP'
+_FORMAT_VERSION = 2
+# magic, format version, schema hash, payload checksum, payload length
+_HEADER = struct.Struct('<6sH32s32sQ')
+
+
+def schema_hash(cls: Type[BaseModel]) -> bytes:
+    """
+    Hash of model JSON schema along with model qualified name, changes
+    whenever fields or their types change.
+    """
+    try:
+        schema: Any = cls.schema()
+    except (TypeError, ValueError, KeyError):
+        # some types have no schema representation
+        schema = {
+            name: repr(field.outer_type_)
+            for name, field in cls.__fields__.items()
+        }
+    content = json.dumps(
+        [cls.__module__, cls.__qualname__, schema],
+        sort_keys=True,
+        default=repr,
+    )
+    return hashlib.sha256(content.encode()).digest()
+
+
+# shapes of fields, which items are rebuilt one by one, and theirs containers
+_SEQUENCE_SHAPES = {
+    SHAPE_LIST: list,
+    SHAPE_TUPLE_ELLIPSIS: tuple,
+    SHAPE_SET: set,
+    SHAPE_FROZENSET: frozenset,
+}
+_JSON_SCALARS = (str, int, float, bool)
+
+
+class SnapshotMismatchError(ValueError):
+    """Snapshot value doesn't fit the model field anymore."""
+
+
+def _encode_value(value: Any) -> Any:
+    # pydantic encodes decimals as floats, which loses precision
+    if isinstance(value, Decimal):
+        return str(value)
+    return pydantic_encoder(value)
+
+
+def _rebuild_value(field: ModelField, value: Any) -> Any:
+    """
+    Rebuild value of a field: nested models are constructed, JSON scalars of
+    plain types are taken as is, values of other types, e.g. dates or enums,
+    can't be represented by JSON, so only they are validated.
+    """
+    if value is None and field.allow_none:
+        return None
+
+    shape = field.shape
+    if shape == SHAPE_SINGLETON and not field.sub_fields:
+        type_ = field.type_
+        if type_ is Any:
+            return value
+        if lenient_issubclass(type_, BaseModel) and isinstance(value, dict):
+            return _construct(type_, value)
+        if type_ in _JSON_SCALARS and type(value) is type_:
+            return value
+    elif shape in _SEQUENCE_SHAPES and isinstance(value, list):
+        item_field = field.sub_fields[0]
+        return _SEQUENCE_SHAPES[shape](
+            _rebuild_value(item_field, item) for item in value
+        )
+    elif (
+        shape == SHAPE_MAPPING
+        and field.key_field.type_ is str
+        and isinstance(value, dict)
+    ):
+        value_field = field.sub_fields[0]
+        return {
+            key: _rebuild_value(value_field, val) for key, val in value.items()
+        }
+
+    return _validate(field, value)
+
+
+def _validate(field: ModelField, value: Any) -> Any:
+    validated, errs = field.validate(value, {}, loc=field.name)
+    if errs:
+        raise SnapshotMismatchError(field.name)
+    return validated
+
+
+def _construct(cls: Type[M], data: Dict[str, Any]) -> M:
+    values = {}
+    for name, value in data.items():
+        field = cls.__fields__.get(name)
+        values[name] = value if field is None else _rebuild_value(field, value)
+
+    for name, field in cls.__fields__.items():
+        # such defaults are converted by validation, e.g. `Columnar` ones
+        if name not in data and field.validate_always:
+            values[name] = _validate(field, deepcopy(field.default))
+
+    return cls.construct(_fields_set=set(data), **values)
+
+
+def dump_snapshot(model: BaseModel, path: Union[str, Path]) -> None:
+    """
+    Write validated model into snapshot file. File is replaced atomically
+    by a temporary file with unique name, created in the same directory, so
+    concurrent writers don't clash. Like any temporary file, it's readable
+    by the owner only.
+
+    :param model: validated settings model
+    :param path: snapshot file path
+    :raises TypeError: model contains values, which can't be encoded into
+        JSON
+    """
+    payload = json.dumps(
+        model.dict(exclude_unset=True), default=_encode_value
+    ).encode()
+    header = _HEADER.pack(
+        _MAGIC,
+        _FORMAT_VERSION,
+        schema_hash(type(model)),
+        hashlib.sha256(payload).digest(),
+        len(payload),
+    )
+
+    path = Path(path)
+    tmp_file = tempfile.NamedTemporaryFile(
+        dir=path.parent, prefix=f'{path.name}.', suffix='.tmp', delete=False
+    )
+    try:
+        with tmp_file:
+            tmp_file.write(header)
+            tmp_file.write(payload)
+        os.replace(tmp_file.name, path)
+    except BaseException:
+        os.unlink(tmp_file.name)
+        raise
+
+
+def read_snapshot(cls: Type[M], path: Union[str, Path]) -> Optional[M]:
+    """
+    Read model from snapshot file without validation.
+
+    :param cls: settings model class
+    :param path: snapshot file path
+    :return: model instance, or none if the file is missing, corrupted,
+        has other format version, built for other model schema or some of
+        its values aren't valid anymore
+    """
+    try:
+        with open(path, 'rb') as f:
+            content = f.read()
+    except OSError:
+        return None
+
+    header_size = _HEADER.size
+    if len(content) < header_size:
+        return None
+    magic, version, model_hash, checksum, length = _HEADER.unpack_from(content)
+    if (
+        magic != _MAGIC
+        or version != _FORMAT_VERSION
+        or model_hash != schema_hash(cls)
+    ):
+        return None
+
+    payload = content[header_size:]
+    if len(payload) != length or hashlib.sha256(payload).digest() != checksum:
+        return None
+
+    try:
+        data = json.loads(payload)
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    try:
+        return _construct(cls, data)
+    except (ValueError, TypeError):
+        return None
+
+
+def load_snapshot(
+    cls: Type[M],
+    path: Union[str, Path],
+    any_content: Any = None,
+    **load_kwargs: Any,
+) -> M:
+    """
+    Load settings from snapshot file, or by :py:func:`.load_settings` if the
+    snapshot is unusable, see :py:func:`read_snapshot`.
+
+    Snapshot values aren't validated, except of ones of types JSON can't
+    represent, so snapshots must come from a trusted source, like CI.
+
+    :param cls: settings model class
+    :param path: snapshot file path
+    :param any_content: settings content used for fallback loading
+    :param load_kwargs: other :py:func:`.load_settings` arguments
+    :raises LoadingError: fallback loading failed
+    :return: settings model instance
+    """
+    result = read_snapshot(cls, path)
+    if result is None:
+        result = load_settings(cls, any_content, **load_kwargs)
+    return result
@@ -1,4 +1,5 @@
 from dataclasses import Field
+from pathlib import Path
 from typing import (
     Any,
     Callable,
@@ -73,6 +74,9 @@ class TextLocation:
     pos: int
     end_pos: int
 
+    file_path: Optional[Path] = None
+    """File containing the value, if it differs from the loaded one."""
+
 
 FlatMapLocation = Tuple[str, Optional[TextLocation]]
 AnySourceLocation = Union[FlatMapLocation, TextLocation]
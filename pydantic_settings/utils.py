@@ -1,13 +1,123 @@
-from typing import Dict, Mapping, Tuple, Type, Union
+import collections.abc
+from collections import OrderedDict
+from threading import Lock
+from typing import (
+    Any,
+    Dict,
+    Generic,
+    Hashable,
+    List,
+    Mapping,
+    MutableSequence,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
 from pydantic_settings.types import Json
 
 _sentinel = object()
 
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+
+class RestoredDict(Dict[str, Json]):
+    """
+    Mapping built while restoring flat-mapping, might contain
+    :py:class:`ListPatch` values.
+    """
+
+    __slots__ = ()
+
+
+class ListPatch(Dict[int, Json]):
+    """
+    Sparse patch of a list, maps element index to a new element value.
+    """
+
+    __slots__ = ()
+
+    def apply(self, base: List[Json], in_place: bool = False) -> Json:
+        """
+        Apply patch to the list. Indexes must either address existing
+        elements or append new elements right after the last one.
+
+        :param base: list to patch
+        :param in_place: patch given list instead of its copy
+        :return: patched list or the patch itself, if some index exceeds
+            list bounds
+        """
+        indexes = sorted(self)
+        if indexes and indexes[-1] >= len(base):
+            appended = [idx for idx in indexes if idx >= len(base)]
+            if appended != list(range(len(base), len(base) + len(appended))):
+                return self
+
+        if not in_place:
+            base = list(base)
+
+        for idx in indexes:
+            if idx < len(base):
+                base[idx] = _merge_values(self[idx], base[idx], in_place)
+            else:
+                base.append(_merge_values(self[idx], _sentinel, in_place))
+        return base
+
+
+def _merge_values(first_val: Any, second_val: Any, in_place: bool) -> Any:
+    if first_val is _sentinel:
+        return second_val
+
+    if isinstance(first_val, ListPatch):
+        if isinstance(second_val, list):
+            return first_val.apply(second_val, in_place)
+        if second_val is _sentinel:
+            return first_val.apply([], True)
+
+    if isinstance(first_val, Mapping):
+        if isinstance(second_val, Mapping):
+            return deep_merge_mappings(
+                first_val, second_val, patch_in_place=in_place
+            )
+        if second_val is _sentinel and isinstance(first_val, RestoredDict):
+            # might contain list patches
+            return deep_merge_mappings(first_val, {}, patch_in_place=in_place)
+
+    return first_val
+
+
+def copy_json(value: Json) -> Json:
+    """
+    Copy JSON-like document containers recursively, scalar values are
+    immutable, so they are shared.
+    """
+    if isinstance(value, dict):
+        return {key: copy_json(val) for key, val in value.items()}
+    if isinstance(value, list):
+        return [copy_json(val) for val in value]
+    return value
+
 
 def deep_merge_mappings(
-    first_map: Mapping[str, Json], second_map: Mapping[str, Json]
+    first_map: Mapping[str, Json],
+    second_map: Mapping[str, Json],
+    *,
+    patch_in_place: bool = False,
 ) -> Dict[str, Json]:
+    """
+    Deeply merge two mappings, values of the first one take precedence.
+    :py:class:`ListPatch` values of the first mapping are applied to lists of
+    the second one.
+
+    :param first_map: mapping with higher priority
+    :param second_map: mapping with lower priority
+    :param patch_in_place: apply list patches in-place instead of copying
+        lists of the second mapping
+    :return: new mapping
+    """
     dst: Dict[str, Json] = {}
     keys = set(first_map).union(set(second_map))
     for key in keys:
@@ -16,15 +126,7 @@ def deep_merge_mappings(
 
         assert first_val is not _sentinel or second_val is not _sentinel
 
-        if first_val is _sentinel and second_val is not _sentinel:
-            val = second_val
-        else:
-            val = first_val
-
-        if isinstance(first_val, Mapping) and isinstance(second_val, Mapping):
-            val = deep_merge_mappings(first_val, second_val)
-
-        dst[key] = val
+        dst[key] = _merge_values(first_val, second_val, patch_in_place)
 
     return dst
 
@@ -41,3 +143,66 @@ def get_union_subtypes(t: Type) -> Tuple[Type, ...]:
     if origin is not Union:
         raise TypeError(f'{t} is not typing.Union')
     return args
+
+
+_sequence_origins = (
+    list,
+    List,
+    collections.abc.Sequence,
+    Sequence,
+    collections.abc.MutableSequence,
+    MutableSequence,
+)
+
+
+def get_sequence_item_type(t: Type) -> Type:
+    # e.g. Columnar[Model], which is validated as a list of models
+    columnar_model = getattr(t, '__columnar_model__', None)
+    if columnar_model is not None:
+        return columnar_model
+    origin, args = get_generic_info(t)
+    if origin in _sequence_origins and len(args) == 1:
+        return args[0]
+    if origin in (tuple, Tuple) and len(args) == 2 and args[1] is Ellipsis:
+        return args[0]
+    raise TypeError(f'{t} is not a homogeneous sequence')
+
+
+class LRUCache(Generic[K, V]):
+    """
+    Thread-safe mapping of bounded size, which evicts least recently used
+    entries first.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        if maxsize <= 0:
+            raise ValueError('cache size must be positive')
+
+        self.maxsize = maxsize
+        self._data: 'OrderedDict[K, V]' = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: K, default: V = None) -> V:
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return default
+            return self._data[key]
+
+    def put(self, key: K, value: V) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
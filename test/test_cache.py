@@ -0,0 +1,99 @@
+from typing import List
+
+from pydantic import BaseModel, ValidationError
+from pytest import raises
+
+from pydantic_settings import BaseSettingsModel, SettingsCache, load_settings
+from pydantic_settings.cache import fingerprint
+
+
+class Model(BaseModel):
+    class Config:
+        allow_mutation = False
+
+    foo: int
+    bar: str = ''
+
+
+class MutableModel(BaseModel):
+    foo: int
+    bar: List[str] = []
+
+
+class SettingsModel(BaseSettingsModel):
+    class Config:
+        env_prefix = 'T'
+        allow_mutation = False
+
+    foo: int
+
+
+def test_fingerprint_distinguish_value_types():
+    assert fingerprint({'a': 1}) == fingerprint({'a': 1})
+    assert fingerprint({'a': 1, 'b': [1]}) == fingerprint({'b': [1], 'a': 1})
+    assert fingerprint({'a': 1}) != fingerprint({'a': True})
+    assert fingerprint({'a': 1}) != fingerprint({'a': 1.0})
+    assert fingerprint({'a': [1]}) != fingerprint({'a': {'1': 1}})
+
+
+def test_load_settings_cache_hit():
+    cache = SettingsCache()
+    first = load_settings(Model, '{"foo": 1}', type_hint='json', cache=cache)
+    second = load_settings(
+        Model,
+        '{"bar": "", "foo": 1}',
+        type_hint='json',
+        load_env=True,
+        environ={},
+        cache=cache,
+    )
+    assert first is not second
+    assert (cache.hits, cache.misses) == (0, 2)
+
+    third = load_settings(Model, '{"foo": 1}', type_hint='json', cache=cache)
+    assert third is first
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_cache_evicts_least_recently_used():
+    cache = SettingsCache(maxsize=2)
+    first = cache.get_or_validate(Model, {'foo': 1})
+    cache.get_or_validate(Model, {'foo': 2})
+    assert cache.get_or_validate(Model, {'foo': 1}) is first
+
+    cache.get_or_validate(Model, {'foo': 3})
+    assert len(cache) == 2
+    assert cache.get_or_validate(Model, {'foo': 1}) is first
+    assert cache.misses == 3
+
+    cache.get_or_validate(Model, {'foo': 2})
+    assert cache.misses == 4
+
+
+def test_mutable_models_not_shared():
+    cache = SettingsCache()
+    first = cache.get_or_validate(MutableModel, {'foo': 1})
+    first.foo = 2
+    first.bar.append('x')
+
+    second = cache.get_or_validate(MutableModel, {'foo': 1})
+    assert second is not first
+    assert second == MutableModel(foo=1)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_doesnt_store_failures():
+    cache = SettingsCache()
+    for _ in range(2):
+        with raises(ValidationError):
+            cache.get_or_validate(Model, {'foo': 'NOT AN INT'})
+
+    assert len(cache) == 0
+    assert cache.misses == 2
+
+
+def test_from_env_cache():
+    cache = SettingsCache()
+    first = SettingsModel.from_env({'T_FOO': '1'}, cache=cache)
+    assert SettingsModel.from_env({'t_foo': '1'}, cache=cache) is first
+    assert SettingsModel.from_env({'T_FOO': '2'}, cache=cache) is not first
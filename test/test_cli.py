@@ -0,0 +1,89 @@
+import json
+from io import StringIO
+
+from pydantic import BaseModel
+from pytest import fixture, raises
+
+from pydantic_settings.cli import main
+
+
+class Settings(BaseModel):
+    host: str
+    port: int
+
+
+@fixture
+def settings_file(tmp_path):
+    path = tmp_path / 'settings.json'
+    path.write_text('{"host": "localhost", "port": 80}')
+    return path
+
+
+def run(*args):
+    out = StringIO()
+    status = main(['test.test_cli:Settings', *map(str, args)], out)
+    return status, out.getvalue()
+
+
+def test_report(settings_file):
+    status, output = run(settings_file, '-n', 3)
+    assert status == 0
+    lines = output.splitlines()
+    assert lines[0] == 'Loading phases'
+    assert [line.split()[:2] for line in lines[2:]] == [
+        ['read', '3'],
+        ['decode', '3'],
+        ['validate', '3'],
+        ['total', '3'],
+    ]
+
+
+def test_json_report(settings_file, tmp_path):
+    stats_path = tmp_path / 'stats.prof'
+    status, output = run(
+        settings_file,
+        '-n',
+        2,
+        '--json',
+        '--trace-memory',
+        '--compare-decoders',
+        '--cprofile',
+        stats_path,
+    )
+    assert status == 0
+    report = json.loads(output)
+    assert [phase['name'] for phase in report['phases']] == [
+        'read',
+        'decode',
+        'validate',
+        'total',
+    ]
+    assert report['phases'][1]['memory_delta'] is not None
+    assert [decoder['name'] for decoder in report['decoders']][:2] == [
+        'json',
+        'yaml',
+    ]
+    assert stats_path.exists()
+
+
+def test_invalid_settings(settings_file, capsys):
+    settings_file.write_text('{"host": "localhost", "port": "X"}')
+    status, _ = run(settings_file)
+    assert status == 1
+    assert 'port from file' in capsys.readouterr().err
+
+    status, output = run(settings_file, '-n', 1, '--allow-invalid')
+    assert status == 0
+    assert 'locate_errors' in output
+
+
+def test_max_time(settings_file, capsys):
+    status, _ = run(settings_file, '-n', 1, '--max-time', 0)
+    assert status == 3
+    assert 'exceeds' in capsys.readouterr().err
+
+
+def test_bad_model(capsys):
+    with raises(SystemExit):
+        main(['test.test_cli:Missing'])
+    assert "isn't found" in capsys.readouterr().err
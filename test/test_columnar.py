@@ -0,0 +1,230 @@
+import json
+import pickle
+from array import array
+from typing import List
+
+from pydantic import (
+    BaseModel,
+    Extra,
+    ValidationError,
+    root_validator,
+    validator,
+)
+from pytest import raises
+
+from pydantic_settings import LoadingValidationError, load_settings
+from pydantic_settings.columnar import Columnar, ColumnarList
+from pydantic_settings.decoder import yaml
+from pydantic_settings.restorer import ModelShapeRestorer
+
+
+class Route(BaseModel):
+    host: str
+    port: int
+    weight: float = 1.0
+    tags: List[str] = []
+
+
+class Settings(BaseModel):
+    routes: Columnar[Route] = []
+
+
+ROUTES = [
+    {'host': 'a', 'port': 80, 'weight': 0.5},
+    {'host': 'b', 'port': 81, 'tags': ['x']},
+]
+
+
+def test_columns_packed():
+    routes = Settings(routes=ROUTES).routes
+    assert isinstance(routes, ColumnarList)
+    assert len(routes) == 2
+    assert routes.column('port') == array('q', [80, 81])
+    assert routes.column('weight') == array('d', [0.5, 1.0])
+    assert routes.column('host') == ['a', 'b']
+    assert routes.column('tags') == [[], ['x']]
+
+
+def test_records_built_on_access():
+    routes = Settings(routes=ROUTES).routes
+    assert routes[1] == Route(host='b', port=81, tags=['x'])
+    assert routes[-1] is not routes[-1]
+    assert routes[:1] == [Route(host='a', port=80, weight=0.5)]
+    assert list(routes) == [Route(**row) for row in ROUTES]
+    assert routes == [Route(**row) for row in ROUTES]
+    assert routes[0].__fields_set__ == {'host', 'port', 'weight'}
+    assert routes[1].tags is not routes[0].tags
+    with raises(IndexError):
+        routes[2]
+
+
+def test_records_detached():
+    routes = Settings(routes=ROUTES).routes
+    record = routes[1]
+    record.tags.append('y')
+    record.port = 90
+    assert routes[1] == Route(host='b', port=81, tags=['x'])
+    assert routes.column('tags') == [[], ['x']]
+
+
+def test_immutable():
+    routes = Settings(routes=ROUTES).routes
+    for mutate in (
+        lambda: routes.append(Route(host='c', port=82)),
+        lambda: routes.__setitem__(0, Route(host='c', port=82)),
+        lambda: routes.pop(),
+        lambda: routes.sort(),
+    ):
+        with raises(TypeError):
+            mutate()
+    assert len(routes) == 2
+    assert routes + [] == [Route(**row) for row in ROUTES]
+    assert list(reversed(routes)) == [Route(**row) for row in ROUTES[::-1]]
+
+
+def test_default_converted():
+    routes = Settings().routes
+    assert isinstance(routes, ColumnarList)
+    assert routes == []
+
+
+def test_serialized_as_list():
+    settings = Settings(routes=ROUTES)
+    expected = [
+        {'host': 'a', 'port': 80, 'weight': 0.5, 'tags': []},
+        {'host': 'b', 'port': 81, 'weight': 1.0, 'tags': ['x']},
+    ]
+    assert settings.dict() == {'routes': expected}
+    assert type(settings.dict()['routes']) is list
+    assert json.loads(settings.json()) == {'routes': expected}
+
+
+def test_schema():
+    schema = Settings.schema()['properties']['routes']
+    assert schema['type'] == 'array'
+    assert schema['items'] == Route.schema()
+
+
+def test_large_integers_not_packed():
+    routes = Settings(routes=[{'host': 'a', 'port': 2 ** 70}]).routes
+    assert routes.column('port') == [2 ** 70]
+
+
+def test_models_and_columnar_accepted():
+    settings = Settings(routes=[Route(host='a', port=80)])
+    assert settings.routes[0].__fields_set__ == {'host', 'port'}
+    assert Settings(routes=settings.routes).routes is settings.routes
+
+
+def test_validation_errors():
+    with raises(ValidationError) as exc_info:
+        Settings(routes=[{'host': 'a', 'port': 'x'}, 1, {'port': 1}])
+    assert {err['loc']: err['type'] for err in exc_info.value.errors()} == {
+        ('routes', 0, 'port'): 'type_error.integer',
+        ('routes', 1): 'type_error.dict',
+        ('routes', 2, 'host'): 'value_error.missing',
+    }
+
+    with raises(ValidationError):
+        Settings(routes={'host': 'a', 'port': 80})
+
+
+def test_validators_receive_record_values():
+    class Checked(BaseModel):
+        low: int
+        high: int
+
+        @validator('high')
+        def check_high(cls, value, values):
+            if value < values['low']:
+                raise ValueError('high is below low')
+            return value
+
+    class Model(BaseModel):
+        items: Columnar[Checked]
+
+    assert Model(items=[{'low': 1, 'high': 2}]).items[0].high == 2
+    with raises(ValidationError) as exc_info:
+        Model(items=[{'low': 1, 'high': 2}, {'low': 3, 'high': 2}])
+    assert exc_info.value.errors()[0]['loc'] == ('items', 1, 'high')
+
+
+def test_extra_forbidden():
+    class Strict(Route):
+        class Config:
+            extra = Extra.forbid
+
+    class Model(BaseModel):
+        routes: Columnar[Strict]
+
+    with raises(ValidationError) as exc_info:
+        Model(routes=[{'host': 'a', 'port': 80, 'unknown': 1}])
+    assert exc_info.value.errors()[0]['loc'] == ('routes', 0, 'unknown')
+
+
+def test_unsupported_models():
+    class WithRoot(Route):
+        @root_validator
+        def check(cls, values):
+            return values
+
+    class WithExtra(Route):
+        class Config:
+            extra = Extra.allow
+
+    for model in (WithRoot, WithExtra, int):
+        with raises(TypeError):
+            Columnar[model]
+    assert Columnar[Route] is Columnar[Route]
+
+
+def test_pickle():
+    routes = Settings(routes=ROUTES).routes
+    assert pickle.loads(pickle.dumps(routes)) == routes
+
+
+def test_restored_from_env():
+    restorer = ModelShapeRestorer(Settings, 'APP', False, yaml.decode_document)
+    values, errs = restorer.restore(
+        {'APP_ROUTES_1_PORT': '90', 'APP_ROUTES_2_HOST': 'c'}
+    )
+    assert errs == []
+    assert values == {'routes': {1: {'port': '90'}, 2: {'host': 'c'}}}
+
+    settings = load_settings(
+        Settings,
+        'routes: [{host: a, port: 80}, {host: b, port: 81}]',
+        type_hint='yaml',
+        load_env=True,
+        environ={
+            'APP_ROUTES_1_PORT': '90',
+            'APP_ROUTES_2_HOST': 'c',
+            'APP_ROUTES_2_PORT': '82',
+        },
+    )
+    assert settings.routes == [
+        Route(host='a', port=80),
+        Route(host='b', port=90),
+        Route(host='c', port=82),
+    ]
+
+
+def test_errors_located():
+    content = 'routes:\n  - host: a\n    port: 80\n  - host: b\n    port: x\n'
+    with raises(LoadingValidationError) as exc_info:
+        load_settings(Settings, content, type_hint='yaml')
+    err = exc_info.value.raw_errors[0]
+    assert err.loc_tuple() == ('routes', 1, 'port')
+    assert (err.source_loc.line, err.source_loc.col) == (5, 11)
+
+    with raises(LoadingValidationError) as exc_info:
+        load_settings(
+            Settings,
+            content.replace('port: x', 'port: 81'),
+            type_hint='yaml',
+            load_env=True,
+            environ={'APP_ROUTES_0_PORT': 'y'},
+        )
+    err = exc_info.value.raw_errors[0]
+    assert err.loc_tuple() == ('routes', 0, 'port')
+    assert err.source_loc == ('APP_ROUTES_0_PORT', None)
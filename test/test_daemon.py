@@ -0,0 +1,93 @@
+import os
+import socket
+from threading import Thread
+
+from pydantic import BaseModel
+from pytest import fixture, mark
+
+from pydantic_settings.daemon import SettingsDaemon, fetch_settings
+
+pytestmark = mark.skipif(
+    not hasattr(socket, 'AF_UNIX'), reason='Unix sockets are unavailable'
+)
+
+
+class Model(BaseModel):
+    foo: int
+    bar: str = ''
+
+
+class OtherModel(BaseModel):
+    foo: int
+
+
+@fixture
+def settings_file(tmp_path):
+    path = tmp_path / 'settings.json'
+    path.write_text('{"foo": 1}')
+    return path
+
+
+@fixture
+def daemon(tmp_path, settings_file):
+    with SettingsDaemon(tmp_path / 'settings.sock', Model, settings_file) as d:
+        thread = Thread(target=d.serve_forever)
+        thread.start()
+        yield d
+        d.shutdown()
+        thread.join()
+
+
+def test_socket_never_accessible_by_others(
+    tmp_path, settings_file, monkeypatch
+):
+    modes = []
+    orig_bind = socket.socket.bind
+
+    def bind(sock, address):
+        orig_bind(sock, address)
+        modes.append(os.stat(address).st_mode & 0o777)
+
+    monkeypatch.setattr(socket.socket, 'bind', bind)
+    old_umask = os.umask(0o022)
+    try:
+        with SettingsDaemon(tmp_path / 'settings.sock', Model, settings_file):
+            pass
+    finally:
+        os.umask(old_umask)
+    assert modes == [0o600]
+
+
+def test_fetch_from_daemon(daemon, settings_file):
+    assert fetch_settings(Model, daemon.socket_path) == Model(foo=1)
+
+    settings_file.write_text('{"foo": 2, "bar": "B"}')
+    assert fetch_settings(Model, daemon.socket_path) == Model(foo=2, bar='B')
+
+    # the last valid snapshot is served
+    settings_file.write_text('{"foo": "NOT AN INT"}')
+    assert fetch_settings(Model, daemon.socket_path) == Model(foo=2, bar='B')
+
+
+def test_fetch_falls_back_to_local_loading(daemon, tmp_path):
+    assert fetch_settings(
+        OtherModel, daemon.socket_path, '{"foo": 3}', type_hint='json'
+    ) == OtherModel(foo=3)
+    assert fetch_settings(
+        Model, tmp_path / 'missing.sock', '{"foo": 4}', type_hint='json'
+    ) == Model(foo=4)
+
+
+def test_fetch_falls_back_on_schema_mismatch(daemon):
+    # daemon runs code with other version of the model
+    daemon._model_hash = 'other'
+    assert fetch_settings(
+        Model, daemon.socket_path, '{"foo": 5}', type_hint='json'
+    ) == Model(foo=5)
+
+
+def test_fetch_falls_back_on_broken_snapshot(daemon):
+    daemon._payload = daemon._payload[:-3]
+    assert fetch_settings(
+        Model, daemon.socket_path, '{"foo": 6}', type_hint='json'
+    ) == Model(foo=6)
@@ -1,6 +1,10 @@
 from pytest import raises
 
-from pydantic_settings.utils import deep_merge_mappings
+from pydantic_settings.utils import (
+    ListPatch,
+    RestoredDict,
+    deep_merge_mappings,
+)
 
 
 def test_simple_chain_map_possibilities():
@@ -24,3 +28,34 @@ def test_simple_values_priority():
     with raises(TypeError) as exc_info:
         _ = m['a']['aa']
     assert exc_info.value.args[0] == "'int' object is not subscriptable"
+
+
+def test_list_patch_merge():
+    base = [{'a': 1, 'b': 1}, {'a': 2, 'b': 2}]
+    m = deep_merge_mappings(
+        {'l': ListPatch({1: {'a': 3}, 2: {'a': 4}})}, {'l': base}
+    )
+    assert m['l'] == [{'a': 1, 'b': 1}, {'a': 3, 'b': 2}, {'a': 4}]
+    assert base == [{'a': 1, 'b': 1}, {'a': 2, 'b': 2}]
+
+
+def test_list_patch_merge_in_place():
+    base = [1, 2, 3]
+    m = deep_merge_mappings(
+        {'l': ListPatch({0: 4})}, {'l': base}, patch_in_place=True
+    )
+    assert m['l'] is base
+    assert base == [4, 2, 3]
+
+
+def test_nested_list_patch_without_base():
+    m = deep_merge_mappings(
+        {'a': RestoredDict(l=ListPatch({1: ListPatch({0: 2}), 0: 1}))}, {}
+    )
+    assert m == {'a': {'l': [1, [2]]}}
+
+
+def test_list_patch_out_of_bounds():
+    patch = ListPatch({3: 1})
+    assert deep_merge_mappings({'l': patch}, {'l': [1, 2]})['l'] is patch
+    assert deep_merge_mappings({'l': patch}, {})['l'] is patch
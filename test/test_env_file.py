@@ -0,0 +1,117 @@
+from pydantic import BaseModel
+from pytest import mark, raises
+
+from pydantic_settings import (
+    LoadingParseError,
+    LoadingValidationError,
+    TextLocation,
+    load_settings,
+)
+from pydantic_settings.decoder import ParsingError
+from pydantic_settings.decoder.dotenv import decode_document
+
+
+class Database(BaseModel):
+    host: str = 'localhost'
+    port: int = 5432
+
+
+class Settings(BaseModel):
+    name: str = ''
+    timeout: int = 1
+    db: Database = Database()
+
+
+@mark.parametrize(
+    'content, expected',
+    [
+        ('A=1\nexport B = x y  # comment\n', {'A': '1', 'B': 'x y'}),
+        ('# comment\n\n  # indented\nA=', {'A': ''}),
+        ('A= #comment\nB=a#b\r\n', {'A': '', 'B': 'a#b'}),
+        ("A='raw \\n # x'", {'A': 'raw \\n # x'}),
+        ('A="x\\n\\"y\\"" # comment', {'A': 'x\n"y"'}),
+        ('A="multi\nline"\nB=2', {'A': 'multi\nline', 'B': '2'}),
+        ('A=1\nA=2', {'A': '2'}),
+    ],
+)
+def test_decode(content, expected):
+    assert decode_document(content) == expected
+
+
+def test_decode_locations():
+    values = decode_document('A=1\nB="multi\nline"  # c\nC = x ')
+    assert values.get_location(('A',)) == TextLocation(1, 3, 1, 4, 2, 3)
+    assert values.get_location(('B',)) == TextLocation(2, 4, 3, 5, 7, 17)
+    assert values.get_location(('C',)) == TextLocation(4, 5, 4, 6, 28, 29)
+
+
+@mark.parametrize(
+    'content, location',
+    [
+        ('A=1\nB', TextLocation(2, 1, 2, 2, 4, 5)),
+        ('A="x\nB=1', TextLocation(1, 1, 1, 5, 0, 4)),
+        ("A='x' y", TextLocation(1, 1, 1, 8, 0, 7)),
+    ],
+)
+def test_decode_malformed(content, location):
+    with raises(ParsingError) as exc_info:
+        decode_document(content)
+    assert exc_info.value.text_location == location
+
+
+def test_load_env_file(tmp_path):
+    env_file = tmp_path / '.env'
+    env_file.write_text('APP_NAME=app\nAPP_DB_HOST=remote\nOTHER=1\n')
+
+    settings = load_settings(
+        Settings,
+        '{"name": "file", "timeout": 2}',
+        type_hint='json',
+        env_file=env_file,
+        load_env=True,
+        environ={'APP_DB_HOST': 'env'},
+    )
+    assert settings == Settings(name='app', timeout=2, db={'host': 'env'})
+
+
+def test_errors_located_in_env_file(tmp_path):
+    env_file = tmp_path / '.env'
+    env_file.write_text(
+        '# settings\nAPP_TIMEOUT=X\nAPP_DB=\'{"port": "Y"}\'\n'
+    )
+
+    with raises(LoadingValidationError) as exc_info:
+        load_settings(Settings, env_file=env_file)
+
+    assert {
+        err.loc_tuple(): err.source_loc for err in exc_info.value.raw_errors
+    } == {
+        ('timeout',): TextLocation(2, 13, 2, 14, 23, 24, env_file),
+        ('db', 'port'): TextLocation(3, 18, 3, 21, 43, 45, env_file),
+    }
+    assert f'timeout from file "{env_file}" at 2:13' in (
+        exc_info.value.render_error()
+    )
+
+
+def test_malformed_env_file(tmp_path):
+    env_file = tmp_path / '.env'
+    env_file.write_text('APP_NAME=app\nAPP_TIMEOUT\n')
+
+    with raises(LoadingParseError) as exc_info:
+        load_settings(Settings, env_file=env_file)
+    assert exc_info.value.file_path == env_file
+    assert exc_info.value.location.line == 2
+
+
+def test_undecodable_env_file_value(tmp_path):
+    env_file = tmp_path / '.env'
+    env_file.write_text('APP_NAME=app\nAPP_DB=\'{"port": }\'\n')
+
+    with raises(LoadingParseError) as exc_info:
+        load_settings(Settings, env_file=env_file)
+    assert exc_info.value.file_path == env_file
+    # points at "}" of the value
+    assert exc_info.value.location == TextLocation(
+        2, 18, 2, 18, 30, 30, env_file
+    )
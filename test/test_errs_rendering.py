@@ -1,10 +1,18 @@
+import json
+from decimal import Decimal
+from io import StringIO
 from pathlib import Path
 
-from pydantic import FloatError
-from pytest import mark
+from pydantic import BaseModel, FloatError, ValidationError, condecimal
+from pydantic.error_wrappers import ErrorWrapper
+from pytest import mark, raises
 
-from pydantic_settings import LoadingValidationError, TextLocation
-from pydantic_settings.errors import ExtendedErrorWrapper
+from pydantic_settings import LoadingValidationError, TextLocation, errors
+from pydantic_settings.errors import (
+    ExtendedErrorWrapper,
+    dump_errors_json_lines,
+    with_errs_locations,
+)
 
 from .test_settings_base import Model1
 
@@ -57,3 +65,122 @@ from .test_settings_base import Model1
 )
 def test_load_validation_err_rendering(args, res):
     assert LoadingValidationError(*args).render_error() == res
+
+
+def _many_errors(num):
+    return LoadingValidationError(
+        [
+            ExtendedErrorWrapper(
+                FloatError(),
+                loc=('foo', idx),
+                source_loc=TextLocation(idx + 1, 4, idx + 1, 8, 0, 0),
+            )
+            for idx in range(num)
+        ],
+        Model1,
+        None,
+    )
+
+
+def test_load_validation_err_rendering_limit():
+    assert _many_errors(3).render_error(limit=1) == (
+        '3 validation errors for Model1 (in-memory buffer):\n'
+        'foo -> 0 from file at 1:4\n'
+        '\tvalue is not a valid float (type=type_error.float)\n'
+        '... and 2 more'
+    )
+    assert _many_errors(3).render_error(limit=3).count('\n') == 6
+
+
+def test_errors_flattened_once(monkeypatch):
+    calls = []
+    orig_flatten = errors._flatten_errors_wrappers
+
+    def flatten(*args, **kwargs):
+        calls.append(kwargs.get('loc'))
+        return orig_flatten(*args, **kwargs)
+
+    monkeypatch.setattr(errors, '_flatten_errors_wrappers', flatten)
+    assert _many_errors(3).render_error(limit=1).endswith('... and 2 more')
+    assert calls == [None]
+
+
+def test_dump_errors_json_lines():
+    stream = StringIO()
+    assert dump_errors_json_lines(_many_errors(1000), stream, limit=2) == 2
+    assert [json.loads(line) for line in stream.getvalue().splitlines()] == [
+        {
+            'loc': ['foo', idx],
+            'msg': 'value is not a valid float',
+            'type': 'type_error.float',
+            'source_loc': {
+                'line': idx + 1,
+                'col': 4,
+                'end_line': idx + 1,
+                'end_col': 8,
+                'pos': 0,
+                'end_pos': 0,
+            },
+        }
+        for idx in range(2)
+    ]
+
+
+def test_dump_errors_json_lines_not_json_context():
+    class Model(BaseModel):
+        price: condecimal(gt=Decimal('1.5'))
+
+    with raises(ValidationError) as exc_info:
+        Model(price='1')
+
+    stream = StringIO()
+    assert dump_errors_json_lines(exc_info.value, stream) == 1
+    assert json.loads(stream.getvalue())['ctx'] == {'limit_value': '1.5'}
+
+
+class _Provider:
+    def __init__(self, locations):
+        self.locations = locations
+        self.requested = []
+
+    def get_location(self, val_loc):
+        self.requested.append(val_loc)
+        return self.locations[val_loc]
+
+
+def test_with_errs_locations_multiple_sources():
+    err = ValidationError(
+        [
+            ErrorWrapper(
+                ValidationError(
+                    [
+                        ErrorWrapper(FloatError(), loc='bar'),
+                        ErrorWrapper(FloatError(), loc='baz'),
+                    ],
+                    Model1,
+                ),
+                loc='foo',
+            ),
+            ErrorWrapper(FloatError(), loc='bam'),
+        ],
+        Model1,
+    )
+    env_source = _Provider({('foo', 'bar'): ('T_FOO_BAR', None)})
+    file_source = _Provider(
+        {
+            ('foo', 'bar'): TextLocation(1, 1, 1, 1, 0, 0),
+            ('foo', 'baz'): TextLocation(2, 1, 2, 1, 0, 0),
+        }
+    )
+
+    new_err = with_errs_locations(Model1, err, env_source, file_source)
+
+    assert [
+        (raw_err.loc_tuple(), getattr(raw_err, 'source_loc', None))
+        for raw_err in new_err.raw_errors
+    ] == [
+        (('foo', 'bar'), ('T_FOO_BAR', None)),
+        (('foo', 'baz'), TextLocation(2, 1, 2, 1, 0, 0)),
+        (('bam',), None),
+    ]
+    assert file_source.requested == [('foo', 'baz'), ('bam',)]
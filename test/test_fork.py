@@ -0,0 +1,80 @@
+import gc
+import os
+
+from pytest import fixture, mark
+
+from pydantic_settings import (
+    BaseSettingsModel,
+    disable_gc_until_fork,
+    enable_gc_after_forking,
+    freeze_for_fork,
+)
+
+
+class Settings(BaseSettingsModel):
+    class Config:
+        env_prefix = 'T'
+        compile_env_setters = True
+
+    foo: int = 0
+
+
+@fixture
+def unfreeze():
+    yield
+    gc.unfreeze()
+    enable_gc_after_forking()
+
+
+@mark.skipif(not hasattr(gc, 'freeze'), reason='gc.freeze is unavailable')
+def test_freeze_for_fork(unfreeze):
+    class FreshSettings(Settings):
+        pass
+
+    settings = FreshSettings(foo=1)
+    assert FreshSettings.shape_restorer._structure.setters is None
+
+    freeze_for_fork(settings)
+
+    assert FreshSettings.shape_restorer._structure.setters is not None
+    assert gc.get_freeze_count() > 0
+
+
+@mark.skipif(not hasattr(os, 'fork'), reason='fork is unavailable')
+def test_frozen_settings_usable_after_fork(unfreeze):
+    settings = Settings.from_env({'T_FOO': '1'})
+    freeze_for_fork(settings)
+
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover
+        ok = Settings.from_env({'T_FOO': '2'}).foo == 2 and settings.foo == 1
+        os._exit(0 if ok else 1)
+
+    _, status = os.waitpid(pid, 0)
+    assert os.WEXITSTATUS(status) == 0
+
+
+@mark.skipif(
+    not hasattr(os, 'register_at_fork'), reason='fork hooks are unavailable'
+)
+def test_gc_disabled_until_fork(unfreeze):
+    def child_gc_enabled():
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover
+            os._exit(0 if gc.isenabled() else 1)
+        _, status = os.waitpid(pid, 0)
+        return os.WEXITSTATUS(status) == 0
+
+    disable_gc_until_fork()
+    assert not gc.isenabled()
+    settings = Settings.from_env({'T_FOO': '1'})
+    freeze_for_fork(settings)
+
+    assert child_gc_enabled()
+    assert not gc.isenabled()
+
+    enable_gc_after_forking()
+    assert gc.isenabled()
+    # later forks of the application aren't affected
+    gc.disable()
+    assert not child_gc_enabled()
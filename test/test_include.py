@@ -0,0 +1,132 @@
+from typing import Any, List
+
+from pydantic import BaseModel
+from pytest import fixture, raises
+
+from pydantic_settings import (
+    IncludeResolver,
+    LoadingError,
+    LoadingValidationError,
+    TextLocation,
+    load_settings,
+)
+from pydantic_settings.include import IncludeCycleError
+
+
+class Database(BaseModel):
+    host: str
+    port: int
+
+
+class Settings(BaseModel):
+    name: str
+    db: Database
+    replicas: List[Database] = []
+
+
+@fixture
+def config_dir(tmp_path):
+    (tmp_path / 'db.yaml').write_text('host: localhost\nport: 5432\n')
+    (tmp_path / 'main.json').write_text(
+        '{"name": "app", "db": {"$include": "db.yaml", "port": 1}, '
+        '"replicas": [{"$include": "db.yaml"}, {"$include": "db.yaml"}]}'
+    )
+    return tmp_path
+
+
+def test_include(config_dir):
+    resolver = IncludeResolver()
+    settings = load_settings(
+        Settings, config_dir / 'main.json', include_resolver=resolver
+    )
+    assert settings == Settings(
+        name='app',
+        db={'host': 'localhost', 'port': 1},
+        replicas=[{'host': 'localhost', 'port': 5432}] * 2,
+    )
+    assert resolver.dependencies(config_dir / 'main.json') == {
+        (config_dir / 'db.yaml').resolve()
+    }
+    assert resolver.dependencies(config_dir / 'db.yaml') == set()
+
+
+def test_include_errors_located_in_included_file(config_dir):
+    (config_dir / 'db.yaml').write_text('host: localhost\nport: X\n')
+
+    with raises(LoadingValidationError) as exc_info:
+        load_settings(
+            Settings,
+            config_dir / 'main.json',
+            include_resolver=IncludeResolver(),
+        )
+
+    assert [err.source_loc for err in exc_info.value.raw_errors] == [
+        TextLocation(2, 7, 2, 8, 22, 23, (config_dir / 'db.yaml').resolve())
+    ] * 2
+    assert f'from file "{config_dir.resolve()}' in (
+        exc_info.value.render_error()
+    )
+
+
+def test_reload_decodes_only_changed_files(config_dir, monkeypatch):
+    resolver = IncludeResolver()
+    decoded = []
+    orig_decode = resolver._decode
+
+    def decode(path, content):
+        decoded.append(path.name)
+        return orig_decode(path, content)
+
+    monkeypatch.setattr(resolver, '_decode', decode)
+    (config_dir / 'nested.json').write_text('{"$include": "db.yaml"}')
+    (config_dir / 'main.json').write_text(
+        '{"name": "app", "db": {"$include": "nested.json"}}'
+    )
+
+    for _ in range(2):
+        load_settings(
+            Settings, config_dir / 'main.json', include_resolver=resolver
+        )
+    assert decoded == ['nested.json', 'db.yaml']
+    assert resolver.dependencies(config_dir / 'main.json') == {
+        (config_dir / 'nested.json').resolve(),
+        (config_dir / 'db.yaml').resolve(),
+    }
+
+    (config_dir / 'db.yaml').write_text('host: remote\nport: 5432\n')
+    settings = load_settings(
+        Settings, config_dir / 'main.json', include_resolver=resolver
+    )
+    assert settings.db.host == 'remote'
+    assert decoded == ['nested.json', 'db.yaml', 'db.yaml']
+
+
+def test_included_values_not_shared_by_models(config_dir):
+    class WithAny(BaseModel):
+        data: Any
+
+    (config_dir / 'data.yaml').write_text('data: {x: [1]}\n')
+    (config_dir / 'main.json').write_text('{"$include": "data.yaml"}')
+    resolver = IncludeResolver()
+
+    first = load_settings(
+        WithAny, config_dir / 'main.json', include_resolver=resolver
+    )
+    first.data['x'].append(2)
+
+    second = load_settings(
+        WithAny, config_dir / 'main.json', include_resolver=resolver
+    )
+    assert second.data == {'x': [1]}
+
+
+def test_include_cycle(config_dir):
+    (config_dir / 'db.yaml').write_text('$include: main.json\n')
+
+    with raises(LoadingError) as exc_info:
+        load_settings(
+            Settings,
+            config_dir / 'main.json',
+            include_resolver=IncludeResolver(),
+        )
+    assert isinstance(exc_info.value.cause, IncludeCycleError)
@@ -0,0 +1,91 @@
+from pydantic import BaseModel
+from pytest import mark, raises
+
+from pydantic_settings import LoadingParseError, TextLocation, load_settings
+from pydantic_settings.decoder.yaml import decode_document
+from pydantic_settings.interpolation import (
+    Reference,
+    ReferenceCycleError,
+    UndefinedReferenceError,
+    compile_template,
+    interpolate,
+)
+
+
+def test_compile_template():
+    assert compile_template('${DB_HOST}:${ db.port }/$${x}') == (
+        Reference('DB_HOST', ('DB_HOST',)),
+        ':',
+        Reference('db.port', ('db', 'port')),
+        '/${x}',
+    )
+    assert compile_template('${a.0}') is compile_template('${a.0}')
+
+
+def test_interpolate():
+    values = decode_document(
+        'db:\n'
+        '  host: ${DB_HOST}\n'
+        '  port: 5432\n'
+        'url: "${db.host}:${db.port}"\n'
+        'port: ${db.port}\n'
+        'hosts: ["${url}", plain]\n'
+    )
+    result = interpolate(values, {'DB_HOST': 'localhost'})
+
+    assert result == {
+        'db': {'host': 'localhost', 'port': 5432},
+        'url': 'localhost:5432',
+        'port': 5432,
+        'hosts': ['localhost:5432', 'plain'],
+    }
+    assert result['db']['port'] is values['db']['port']
+    assert result.get_location(('url',)) == values.get_location(('url',))
+
+    plain = decode_document('foo: pa$word')
+    assert interpolate(plain, {}) is plain
+
+
+def test_escape_without_references():
+    values = decode_document('a: pa$$word\nb: "$${x}"\nc: "$$${x}"\n')
+    assert interpolate(values, {'x': 'X'}) == {
+        'a': 'pa$word',
+        'b': '${x}',
+        'c': '$X',
+    }
+
+
+@mark.parametrize(
+    'content, error_cls, path',
+    [
+        ('a: ${b}\nb: ${c}\nc: ${a}\n', ReferenceCycleError, ('a',)),
+        ('a: [1, "${a}"]\n', ReferenceCycleError, ('a', 1)),
+        ('a: x\nb: ${MISSING}\n', UndefinedReferenceError, ('b',)),
+    ],
+)
+def test_interpolation_errors(content, error_cls, path):
+    with raises(error_cls) as exc_info:
+        interpolate(decode_document(content), {})
+    assert exc_info.value.path == path
+
+
+class Settings(BaseModel):
+    host: str
+    url: str
+
+
+def test_load_settings_interpolation():
+    content = 'host: ${HOST}\nurl: "http://${host}/"\n'
+    assert load_settings(
+        Settings,
+        content,
+        type_hint='yaml',
+        interpolate=True,
+        environ={'HOST': 'example.com'},
+    ) == Settings(host='example.com', url='http://example.com/')
+
+    with raises(LoadingParseError) as exc_info:
+        load_settings(
+            Settings, content, type_hint='yaml', interpolate=True, environ={}
+        )
+    assert exc_info.value.location == TextLocation(1, 7, 1, 14, 6, 13)
@@ -145,3 +145,21 @@ def test_json_ast1(in_val, out_val):
 )
 def test_get_json_value(in_val, out_json):
     assert json.loads(in_val).get_json_value() == out_json
+
+
+def test_values_interned():
+    content = '{"a": [{"k": "long value"}, {"k": "long value"}]}'
+    first, second = json.decode_document(content)['a']
+    assert first['k'] is not second['k']
+
+    first, second = json.decode_document(content, intern_values=True)['a']
+    assert first['k'] is second['k']
+
+
+def test_root_path_duplicated_keys():
+    content = '{"s": {"x": 1}, "l": [{"y": 1}, {"y": 2}], "s": {"x": 2}}'
+    full = json.decode_document(content)
+    section = json.decode_document(content, root_path=('s',))
+    assert section == full['s'] == {'x': 2}
+    assert section.get_location(('x',)) == full.get_location(('s', 'x'))
+    assert json.decode_document(content, root_path=('l', 1)) == {'y': 2}
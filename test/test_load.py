@@ -1,15 +1,17 @@
+import json
 import tempfile
 from io import StringIO
 from pathlib import Path
-from typing import List
+from typing import Any, List
 
-from pydantic import FloatError, IntegerError, StrError
+from pydantic import BaseModel, FloatError, IntegerError, StrError
 from pytest import mark, raises
 
 from pydantic_settings import (
     BaseSettingsModel,
     LoadingError,
     LoadingValidationError,
+    LoadProfiler,
     TextLocation,
     load_settings,
 )
@@ -187,3 +189,192 @@ def test_file_not_found():
 
     assert isinstance(err_info.value.cause, FileNotFoundError)
     assert err_info.value.file_path == path
+
+
+@mark.parametrize('trace_memory', [False, True])
+def test_load_settings_profiling(trace_memory):
+    reported = []
+    profiler = LoadProfiler(reported.append, trace_memory=trace_memory)
+    with raises(LoadingValidationError):
+        load_settings(
+            Settings2,
+            '{"settings_list": [], "settings": {"foo": 1, "bar": 2.0}}',
+            type_hint='json',
+            load_env=True,
+            environ={'A_FOO': 'VAL', 'A_SETTINGS_BAR': 'INVALID FLOAT'},
+            profiler=profiler,
+        )
+
+    assert reported == profiler.phases
+    assert [stats.name for stats in profiler.phases] == [
+        'read',
+        'decode',
+        'restore',
+        'merge',
+        'validate',
+        'locate_errors',
+    ]
+    assert all(stats.duration >= 0 for stats in profiler.phases)
+    assert [stats.nodes for stats in profiler.phases] == [
+        None,
+        5,
+        4,
+        6,
+        None,
+        1,
+    ]
+    assert profiler.phases[0].size == profiler.phases[1].size == 57
+    assert all(
+        (stats.memory_delta is not None) is trace_memory
+        for stats in profiler.phases
+    )
+
+
+def test_memoized_inline_values_not_shared_by_models():
+    class Inner(BaseModel):
+        data: Any
+
+    class WithAny(BaseSettingsModel):
+        class Config:
+            env_prefix = 'APP'
+
+        inner: Inner
+
+    environ = {'APP_INNER': '{"data": {"x": [1]}}'}
+    first = load_settings(WithAny, load_env=True, environ=environ)
+    first.inner.data['x'].append(2)
+
+    second = load_settings(WithAny, load_env=True, environ=environ)
+    assert second.inner.data == {'x': [1]}
+
+
+def test_empty_environ_not_replaced(monkeypatch):
+    monkeypatch.setenv('T_FOO', '1')
+    monkeypatch.setenv('T_BAR', '2.5')
+    with raises(LoadingValidationError):
+        load_settings(Settings, load_env=True, environ={})
+    assert load_settings(Settings, load_env=True) == Settings(foo=1, bar=2.5)
+
+
+def test_profiled_size_in_bytes():
+    profiler = LoadProfiler(lambda stats: None)
+    load_settings(
+        Settings2,
+        '{"settings_list": [], "settings": {"foo": 1, "bar": 2}, '
+        '"foo": "\u00e9t\u00e9"}',
+        type_hint='json',
+        profiler=profiler,
+    )
+    assert profiler.phases[0].size == profiler.phases[1].size == 71
+
+
+def test_load_settings_list_items_from_env():
+    settings_list = [{'foo': idx, 'bar': idx} for idx in range(5)]
+    content = json.dumps(
+        {'settings_list': settings_list, 'settings': {'foo': 1, 'bar': 1}}
+    )
+    result = load_settings(
+        Settings2,
+        content,
+        type_hint='json',
+        load_env=True,
+        environ={
+            'A_SETTINGS_LIST_3_BAR': '10.5',
+            'A_SETTINGS_LIST_5_FOO': '5',
+            'A_SETTINGS_LIST_5_BAR': '5',
+        },
+    )
+    assert [s.bar for s in result.settings_list] == [0, 1, 2, 10.5, 4, 5]
+
+    with raises(LoadingValidationError) as exc_info:
+        load_settings(
+            Settings2,
+            content,
+            type_hint='json',
+            load_env=True,
+            environ={
+                'A_SETTINGS_LIST_2_BAR': 'NOT A FLOAT',
+                'A_SETTINGS_LIST_4_FOO': 'NOT AN INT',
+            },
+        )
+
+    assert [
+        (loc, type(err)) for loc, err in per_location_errors(exc_info.value)
+    ] == [
+        (('A_SETTINGS_LIST_2_BAR', None), FloatError),
+        (('A_SETTINGS_LIST_4_FOO', None), IntegerError),
+    ]
+
+
+class LazySettings(BaseSettingsModel):
+    class Config:
+        env_prefix = 'L'
+        lazy_submodels = True
+
+    class Section(BaseModel):
+        foo: int
+
+    section: Section
+
+
+def test_lazy_submodel_error_located_in_file():
+    settings = load_settings(
+        LazySettings, '{"section": {"foo": "NOT AN INT"}}', type_hint='json'
+    )
+    with raises(LoadingValidationError) as exc_info:
+        settings.section
+
+    assert [
+        (loc, type(exc)) for loc, exc in per_location_errors(exc_info.value)
+    ] == [(TextLocation(1, 21, 1, 33, 21, 32), IntegerError)]
+
+
+class Section(BaseModel):
+    foo: int
+    bar: List[int] = []
+
+
+@mark.parametrize(
+    'content, type_hint, root_path, bad_location',
+    [
+        (
+            '{"skip": {"foo": [1, "}"]}, "services": [{}, '
+            '{"billing": {"foo": 1, "bar": [1, "x"]}}]}',
+            'json',
+            ('services', 1, 'billing'),
+            TextLocation(1, 80, 1, 83, 80, 82),
+        ),
+        (
+            'skip:\n  foo: [1, 2]\nservices:\n  - {}\n'
+            '  - billing:\n      foo: 1\n      bar: [1, x]\n',
+            'yaml',
+            ('services', 1, 'billing'),
+            TextLocation(7, 16, 7, 17, 78, 79),
+        ),
+    ],
+)
+def test_load_section_by_root_path(
+    content, type_hint, root_path, bad_location
+):
+    with raises(LoadingValidationError) as exc_info:
+        load_settings(
+            Section, content, type_hint=type_hint, root_path=root_path
+        )
+    assert [loc for loc, _ in per_location_errors(exc_info.value)] == [
+        bad_location
+    ]
+
+    with raises(LoadingError):
+        load_settings(
+            Section, content, type_hint=type_hint, root_path=('missing',)
+        )
+
+
+def test_load_yaml_document():
+    content = 'foo: 1\n---\nfoo: 2\n'
+    assert load_settings(
+        Section, content, type_hint='yaml', document=1
+    ) == Section(foo=2)
+
+    with raises(LoadingError):
+        load_settings(Section, '{}', type_hint='json', document=0)
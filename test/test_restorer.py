@@ -1,14 +1,20 @@
+import pickle
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Tuple, Union
 
 from pydantic import BaseModel
-from pytest import mark
+from pytest import mark, raises
 
 from pydantic_settings import TextLocation
+from pydantic_settings.decoder import ParsingError, TextValues
 from pydantic_settings.decoder.json import decode_document
 from pydantic_settings.restorer import (
+    FlatMapValues,
     ModelShapeRestorer,
     _build_model_flat_map,
+    _build_sequences_map,
 )
+from pydantic_settings.utils import ListPatch
 
 from .conftest import Model1, Model4, Model5, Model6
 
@@ -209,3 +215,218 @@ def test_restore_model(model_cls, input_val, result, locations):
     assert values, errs == (result, [])
 
     assert {loc: values.get_location(loc) for loc in locations} == locations
+
+
+@mark.parametrize(
+    'prefix, case_sensitive, input_val, result',
+    [
+        ('TEST', False, {'test_foo': 'V', 'TEST_BAR': 'V', 'OTHER': '1'}, 2),
+        ('TEST', True, {'test_foo': 'V', 'TEST_BAR': 'V', 'TEST_foo': 'V'}, 1),
+        ('SS', False, {'ß_foo': 'V', 'sS_BAR': 'V', 'S_FOO': 'V'}, 2),
+        ('', False, {'_foo': 'V', 'X_BAR': 'V'}, 1),
+    ],
+)
+def test_restore_respects_prefix(prefix, case_sensitive, input_val, result):
+    restorer = ModelShapeRestorer(
+        Model1, prefix, case_sensitive, decode_document
+    )
+    for _ in range(2):
+        values, _ = restorer.restore(input_val)
+        assert len(values) == result
+
+
+def test_restored_values_pickling():
+    values, _ = ModelShapeRestorer(
+        Model6, 'TEST', False, decode_document
+    ).restore(
+        {
+            'test_baz': '{"bam": {"foo": "VAL1", "bar": "VAL2"}}',
+            'test_baf_foo': 'VAL3',
+        }
+    )
+
+    restored = pickle.loads(pickle.dumps(values))
+
+    assert type(restored) is FlatMapValues
+    assert restored == values
+    assert type(restored['baz']) is TextValues
+    assert restored.get_location(('baf', 'foo')) == ('test_baf_foo', None)
+    assert restored.get_location(('baz', 'bam', 'bar')) == values.get_location(
+        ('baz', 'bam', 'bar')
+    )
+    with raises(KeyError):
+        restored.get_location(('baf', 'bar'))
+
+
+def test_inline_values_memoized():
+    decoded = []
+
+    def decoder(content):
+        decoded.append(content)
+        return decode_document(content)
+
+    restorer = ModelShapeRestorer(Model6, 'TEST', False, decoder)
+    environ = {
+        'test_baz': '{"bam": {"foo": "VAL1"}}',
+        'test_baz_bam_bar': 'VAL2',
+        'test_baf': 'NOT A JSON',
+    }
+
+    for _ in range(3):
+        values, errs = restorer.restore(environ)
+        assert values == {'baz': {'bam': {'foo': 'VAL1', 'bar': 'VAL2'}}}
+        assert [err.key for err in errs] == ['test_baf']
+
+    assert decoded == ['{"bam": {"foo": "VAL1"}}', 'NOT A JSON']
+
+    # memoized value isn't altered by nested value assignment
+    values, _ = restorer.restore({'test_baz': '{"bam": {"foo": "VAL1"}}'})
+    assert values == {'baz': {'bam': {'foo': 'VAL1'}}}
+    assert values.get_location(('baz', 'bam', 'foo')) == (
+        'test_baz',
+        TextLocation(1, 17, 1, 23, 17, 22),
+    )
+
+
+def test_memoized_inline_failure_traceback_not_growing():
+    restorer = ModelShapeRestorer(Model6, 'TEST', False, decode_document)
+
+    def traceback_len():
+        with raises(ParsingError) as exc_info:
+            restorer._decode_inline_value('NOT A JSON')
+        return len(exc_info.traceback)
+
+    initial_len = traceback_len()
+    for _ in range(100):
+        restorer.restore({'test_baf': 'NOT A JSON'})
+    assert traceback_len() == initial_len
+
+
+class WithSequences(BaseModel):
+    models: List[Model1]
+    matrix: List[List[int]]
+    nested: Model6 = None
+
+
+def test_sequences_map():
+    assert {
+        key: (desc.path, desc.item, set(desc.item_flat_map))
+        for key, desc in _build_sequences_map(
+            WithSequences, 't', str.casefold
+        ).items()
+    } == {
+        't_models': (('models',), ((), True, True), {'_foo', '_bar'}),
+        't_matrix': (('matrix',), ((), False, False), set()),
+    }
+
+
+def test_restore_sequence_items():
+    values, errs = ModelShapeRestorer(
+        WithSequences, 'T', False, decode_document
+    ).restore(
+        {
+            'T_MODELS_3_FOO': 'VAL1',
+            'T_MODELS_1': '{"foo": "VAL2"}',
+            'T_MATRIX_0_2': '1',
+            'T_MODELS_X_FOO': 'IGNORED',
+            'T_NESTED_BAF_FOO': 'VAL3',
+        }
+    )
+
+    assert errs == []
+    assert values == {
+        'models': {3: {'foo': 'VAL1'}, 1: {'foo': 'VAL2'}},
+        'matrix': {0: {2: '1'}},
+        'nested': {'baf': {'foo': 'VAL3'}},
+    }
+    assert isinstance(values['models'], ListPatch)
+    assert isinstance(values['matrix'][0], ListPatch)
+    assert values.get_location(('models', 3, 'foo')) == (
+        'T_MODELS_3_FOO',
+        None,
+    )
+    assert values.get_location(('models', 1, 'foo')) == (
+        'T_MODELS_1',
+        TextLocation(1, 9, 1, 15, 9, 14),
+    )
+    assert values.get_location(('matrix', 0, 2)) == ('T_MATRIX_0_2', None)
+
+
+@mark.parametrize(
+    'environ',
+    [
+        {
+            'test_baz_bam_foo': 'VAL1',
+            'test_baz_bam_bar': 'VAL2',
+            'test_baf_foo': 'VAL3',
+        },
+        {
+            'test_baz': '{"bam": {"foo": "VAL1"}}',
+            'test_baz_bam_bar': 'VAL2',
+            'test_baf': 'NOT A JSON',
+        },
+        {'test_baz_bam_bar': 'VAL2', 'test_baz': '{"bam": {"foo": "VAL1"}}'},
+        {'test_baf_foo': 'VAL3', 'test_baf': '"VAL"'},
+    ],
+)
+def test_compiled_setters_restore_same_values(environ):
+    generic = ModelShapeRestorer(Model6, 'TEST', False, decode_document)
+    compiled = ModelShapeRestorer(
+        Model6, 'TEST', False, decode_document, compile_setters=True
+    )
+    expected, expected_errs = generic.restore(environ)
+
+    for _ in range(2):
+        values, errs = compiled.restore(environ)
+        assert values == expected
+        assert [err.key for err in errs] == [
+            err.key for err in expected_errs
+        ]
+        assert values.restored_env_values == expected.restored_env_values
+
+    # memoized inline value isn't altered by compiled setters either
+    values, _ = compiled.restore({'test_baz': '{"bam": {"foo": "VAL1"}}'})
+    assert values == {'baz': {'bam': {'foo': 'VAL1'}}}
+
+
+def test_with_prefix_shares_structure():
+    restorer = ModelShapeRestorer(Model1, 'TEST', False, decode_document)
+    other = restorer.with_prefix('OTHER')
+    assert other._structure is restorer._structure
+    assert other.prefix == 'other'
+
+    environ = {'TEST_FOO': 'V1', 'OTHER_FOO': 'V2'}
+    assert restorer.restore(environ)[0] == {'foo': 'V1'}
+    assert other.restore(environ)[0] == {'foo': 'V2'}
+
+    with raises(AttributeError):
+        restorer.prefix = 'OTHER'
+
+
+def test_concurrent_restore():
+    restorer = ModelShapeRestorer(
+        Model6, 'TEST', False, decode_document, compile_setters=True
+    )
+    restorers = [restorer.with_prefix(f'P{num}') for num in range(4)]
+    environs = [
+        {
+            f'P{num}_BAZ': f'{{"bam": {{"bar": "{num}"}}}}',
+            f'P{num}_BAZ_BAM_FOO': f'VAL{num}',
+            f'P{(num + 1) % 4}_BAF_FOO': 'OTHER',
+        }
+        for num in range(4)
+    ]
+    expected = [
+        {'baz': {'bam': {'foo': f'VAL{num}', 'bar': str(num)}}}
+        for num in range(4)
+    ]
+
+    def restore_many(num):
+        for _ in range(200):
+            values, errs = restorers[num].restore(environs[num])
+            if values != expected[num] or errs:
+                return False
+        return True
+
+    with ThreadPoolExecutor(8) as executor:
+        assert all(executor.map(restore_many, [0, 1, 2, 3] * 4))
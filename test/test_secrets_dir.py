@@ -0,0 +1,115 @@
+from typing import List
+
+from pydantic import BaseModel
+from pytest import fixture, raises
+
+from pydantic_settings import (
+    LoadingError,
+    LoadingParseError,
+    LoadingValidationError,
+    TextLocation,
+    load_settings,
+)
+from pydantic_settings.decoder import json
+from pydantic_settings.restorer import ModelShapeRestorer
+from pydantic_settings.secrets_dir import load_secrets_dir
+
+
+class Database(BaseModel):
+    host: str = 'localhost'
+    password: str
+    port: int = 5432
+
+
+class Settings(BaseModel):
+    token: str = ''
+    timeout: int = 1
+    db: Database
+    replicas: List[Database] = []
+
+
+@fixture
+def secrets_dir(tmp_path):
+    (tmp_path / 'token').write_text('secret-token\n')
+    (tmp_path / 'db_password').write_text('pass')
+    (tmp_path / 'unrelated').write_text('')
+    (tmp_path / '.hidden').write_text('')
+    (tmp_path / 'replicas').mkdir()
+    return tmp_path
+
+
+def test_load_secrets_dir(secrets_dir):
+    settings = load_settings(Settings, secrets_dir=secrets_dir)
+    assert settings == Settings(token='secret-token', db={'password': 'pass'})
+
+
+def test_only_matching_files_read(secrets_dir, monkeypatch):
+    opened = []
+    orig_open = open
+
+    def tracking_open(path, *args, **kwargs):
+        opened.append(str(path))
+        return orig_open(path, *args, **kwargs)
+
+    monkeypatch.setattr(
+        'pydantic_settings.secrets_dir.open', tracking_open, raising=False
+    )
+    restorer = ModelShapeRestorer(Settings, '', False, json.decode_document)
+    load_secrets_dir(restorer, secrets_dir)
+    assert sorted(opened) == [
+        str(secrets_dir / 'db_password'),
+        str(secrets_dir / 'token'),
+    ]
+
+
+def test_precedence(secrets_dir):
+    settings = load_settings(
+        Settings,
+        '{"token": "file", "db": {"password": "file", "host": "file"}}',
+        type_hint='json',
+        secrets_dir=secrets_dir,
+        load_env=True,
+        environ={'APP_TOKEN': 'env'},
+    )
+    assert settings == Settings(
+        token='env', db={'password': 'pass', 'host': 'file'}
+    )
+
+
+def test_errors_located_in_secret_file(secrets_dir):
+    (secrets_dir / 'timeout').write_text('X\n')
+    (secrets_dir / 'db_password').unlink()
+    (secrets_dir / 'db').write_text('{"password": "p", "port": "Y"}')
+
+    with raises(LoadingValidationError) as exc_info:
+        load_settings(Settings, secrets_dir=secrets_dir)
+
+    assert {
+        err.loc_tuple(): err.source_loc for err in exc_info.value.raw_errors
+    } == {
+        ('timeout',): TextLocation(1, 1, 2, 1, 0, 2, secrets_dir / 'timeout'),
+        ('db', 'port'): TextLocation(1, 27, 1, 30, 27, 29, secrets_dir / 'db'),
+    }
+    assert f'from file "{secrets_dir / "timeout"}"' in (
+        exc_info.value.render_error()
+    )
+
+
+def test_undecodable_secret_reported(secrets_dir):
+    (secrets_dir / 'db_password').unlink()
+    (secrets_dir / 'db').write_text('{"password": ')
+
+    with raises(LoadingParseError) as exc_info:
+        load_settings(Settings, secrets_dir=secrets_dir)
+
+    assert exc_info.value.file_path == secrets_dir / 'db'
+    assert exc_info.value.location.file_path == secrets_dir / 'db'
+    assert exc_info.value.location.line == 1
+    assert exc_info.value.decoder is None
+    assert 'using "secrets loader"' in exc_info.value.render_error()
+
+
+def test_missing_dir(tmp_path):
+    with raises(LoadingError) as exc_info:
+        load_settings(Settings, secrets_dir=tmp_path / 'missing')
+    assert exc_info.value.file_path == tmp_path / 'missing'
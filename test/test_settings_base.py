@@ -1,7 +1,9 @@
 import json
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import count, islice
 
 from pydantic import BaseModel, MissingError, ValidationError
-from pytest import raises
+from pytest import mark, raises
 
 from pydantic_settings.base import BaseSettingsModel
 from pydantic_settings.errors import ExtendedErrorWrapper
@@ -58,3 +60,107 @@ def test_settings_model_attrs_docs_created_automatically():
         SettingsModel.__fields__['bar'].field_info.description
         == 'bar description'
     )
+
+
+@mark.parametrize('executor_cls', [None, ProcessPoolExecutor])
+def test_from_env_batch(executor_cls):
+    environs = [
+        {'APP_BAZ_BAF_FOO': f'FOO{i}', 'APP_BAZ_BAF_BAR': f'BAR{i}'}
+        for i in range(5)
+    ]
+    environs.insert(2, {'APP_BAZ_BAF_FOO': 'FOO'})
+
+    if executor_cls is None:
+        results = list(SettingModel1.from_env_batch(environs))
+    else:
+        with executor_cls(max_workers=2) as executor:
+            results = list(
+                SettingModel1.from_env_batch(
+                    environs, executor=executor, chunk_size=2
+                )
+            )
+
+    assert len(results) == 6
+    assert isinstance(results[2], ValidationError)
+    assert results[2].raw_errors[0].loc_tuple() == ('baz', 'baf', 'bar')
+    assert [res.baz.baf.foo for res in results if res is not results[2]] == [
+        f'FOO{i}' for i in range(5)
+    ]
+
+
+def test_from_env_batch_bounded():
+    consumed = []
+
+    def endless_environs():
+        for i in count():
+            consumed.append(i)
+            yield {'APP_BAZ_BAF_FOO': f'FOO{i}', 'APP_BAZ_BAF_BAR': 'BAR'}
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = SettingModel1.from_env_batch(
+            endless_environs(), executor=executor, chunk_size=2, max_pending=3
+        )
+        first = list(islice(results, 3))
+        results.close()
+
+    assert [res.baz.baf.foo for res in first] == ['FOO0', 'FOO1', 'FOO2']
+    # two chunks are yielded, while up to three more are pending
+    assert len(consumed) <= 2 * (2 + 3)
+
+
+class LazySettings(BaseSettingsModel):
+    class Config:
+        env_prefix = 'L'
+        lazy_submodels = True
+
+    class Section(BaseModel):
+        foo: int
+
+    first: Section
+    second: Section = None
+    flag: bool = False
+
+
+def test_lazy_submodels():
+    settings = LazySettings.from_env(
+        {'L_FIRST_FOO': '1', 'L_SECOND_FOO': 'NOT AN INT', 'L_FLAG': 'true'}
+    )
+    assert settings.flag is True
+    assert settings.first == LazySettings.Section(foo=1)
+    assert settings.first is settings.first
+
+    with raises(ValidationError) as exc_info:
+        settings.second
+    err = exc_info.value.raw_errors[0]
+    assert err.loc_tuple() == ('second', 'foo')
+    assert err.source_loc == ('L_SECOND_FOO', None)
+
+    with raises(ValidationError):
+        settings.validate_all()
+    with raises(ValidationError):
+        settings.dict()
+
+
+def test_lazy_submodels_validate_all():
+    settings = LazySettings(first={'foo': '1'}, second={'foo': '2'})
+    assert type(settings.__dict__['second']).__name__ == 'LazyValue'
+
+    settings.validate_all()
+    assert settings.__dict__['second'] == LazySettings.Section(foo=2)
+    assert settings.dict() == {
+        'first': {'foo': 1},
+        'second': {'foo': 2},
+        'flag': False,
+    }
+
+
+def test_lazy_submodels_eager_errors():
+    with raises(ValidationError) as exc_info:
+        LazySettings(first=LazySettings.Section(foo=1), flag='NOT A BOOL')
+    assert [err.loc_tuple() for err in exc_info.value.raw_errors] == [
+        ('flag',)
+    ]
+
+    with raises(ValidationError) as exc_info:
+        LazySettings(second={'foo': 1})
+    assert exc_info.value.raw_errors[0].loc_tuple() == ('first',)
@@ -0,0 +1,95 @@
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from pydantic import BaseModel
+from pytest import importorskip, raises
+
+from pydantic_settings import SharedSettings
+from pydantic_settings.shared import (
+    _HEADER,
+    SnapshotBusyError,
+    SnapshotNotPublishedError,
+    SnapshotTooLargeError,
+)
+
+importorskip('multiprocessing.shared_memory')
+
+
+class Model(BaseModel):
+    foo: int
+    bar: str = ''
+
+
+def _read_shared(name):
+    shared = SharedSettings.attach(name)
+    try:
+        return shared.version, shared.get()
+    finally:
+        shared.close()
+
+
+def test_publish_and_attach():
+    with SharedSettings.create(1024) as shared:
+        with raises(SnapshotNotPublishedError):
+            SharedSettings.attach(shared.name).get()
+
+        assert shared.publish(Model(foo=1)) == 1
+
+        attached = SharedSettings.attach(shared.name)
+        first = attached.get()
+        assert first == Model(foo=1)
+        assert attached.get() is first
+
+        assert shared.publish(Model(foo=2, bar='B')) == 2
+        assert attached.version == 2
+        assert attached.get() == Model(foo=2, bar='B')
+        attached.close()
+
+
+def test_publish_too_large():
+    with SharedSettings.create(16) as shared:
+        with raises(SnapshotTooLargeError):
+            shared.publish(Model(foo=1, bar='x' * 100))
+        assert shared.version == 0
+
+
+def test_workers_read_snapshot():
+    with SharedSettings.create(1024) as shared:
+        shared.publish(Model(foo=1))
+        with ProcessPoolExecutor(2) as executor:
+            results = list(executor.map(_read_shared, [shared.name] * 2))
+
+    assert results == [(1, Model(foo=1))] * 2
+
+
+def test_crashed_writer_times_out():
+    with SharedSettings.create(1024) as shared:
+        shared.publish(Model(foo=1))
+        # writer crashed after marking the snapshot as being written
+        _HEADER.pack_into(shared._shm.buf, 0, 3, 0)
+
+        attached = SharedSettings.attach(shared.name)
+        with raises(SnapshotBusyError):
+            attached.get(timeout=0.05)
+        attached.close()
+
+
+def test_exited_process_does_not_destroy_block():
+    with SharedSettings.create(1024) as shared:
+        shared.publish(Model(foo=1))
+        # independent process has its own resource tracker, which is
+        # stopped explicitly to clean up synchronously
+        subprocess.run(
+            [
+                sys.executable,
+                '-c',
+                'from multiprocessing import resource_tracker; '
+                'from test.test_shared import _read_shared; '
+                f'_read_shared({shared.name!r}); '
+                'resource_tracker._resource_tracker._stop()',
+            ],
+            check=True,
+        )
+
+        assert _read_shared(shared.name) == (1, Model(foo=1))
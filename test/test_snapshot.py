@@ -0,0 +1,150 @@
+import hashlib
+import pickle
+from datetime import datetime
+from decimal import Decimal
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from pydantic import BaseModel
+
+from pydantic_settings import Columnar, load_settings
+from pydantic_settings.columnar import ColumnarList
+from pydantic_settings.snapshot import (
+    _FORMAT_VERSION,
+    _HEADER,
+    _MAGIC,
+    dump_snapshot,
+    load_snapshot,
+    read_snapshot,
+    schema_hash,
+)
+
+
+class Model(BaseModel):
+    class Nested(BaseModel):
+        baz: int
+
+    foo: int
+    nested: Nested
+
+
+class Other(BaseModel):
+    foo: int
+
+
+def test_schema_hash():
+    class Model2(Other):
+        foo: str
+
+    assert schema_hash(Model) == schema_hash(Model)
+    assert schema_hash(Model) != schema_hash(Model.Nested)
+    assert schema_hash(Other) != schema_hash(Model2)
+
+
+def test_snapshot_roundtrip(tmp_path):
+    path = tmp_path / 'settings.snapshot'
+    model = load_settings(
+        Model, '{"foo": 1, "nested": {"baz": 2}}', type_hint='json'
+    )
+    dump_snapshot(model, path)
+
+    restored = read_snapshot(Model, path)
+    assert restored == model
+    assert type(restored.nested) is Model.Nested
+    assert load_snapshot(Model, path) == model
+
+
+def test_stale_snapshot_falls_back(tmp_path):
+    path = tmp_path / 'settings.snapshot'
+    dump_snapshot(Other(foo=1), path)
+    assert read_snapshot(Model, path) is None
+    assert load_snapshot(
+        Model, path, '{"foo": 3, "nested": {"baz": 4}}', type_hint='json'
+    ) == Model(foo=3, nested={'baz': 4})
+
+    assert read_snapshot(Model, tmp_path / 'missing') is None
+
+
+def test_corrupted_snapshot(tmp_path):
+    path = tmp_path / 'settings.snapshot'
+    dump_snapshot(Model(foo=1, nested={'baz': 2}), path)
+    content = bytearray(path.read_bytes())
+    content[-2] ^= 0xFF
+    path.write_bytes(bytes(content))
+
+    assert read_snapshot(Model, path) is None
+
+
+def write_payload(path, cls, payload):
+    header = _HEADER.pack(
+        _MAGIC,
+        _FORMAT_VERSION,
+        schema_hash(cls),
+        hashlib.sha256(payload).digest(),
+        len(payload),
+    )
+    path.write_bytes(header + payload)
+
+
+def test_invalid_snapshot_values(tmp_path):
+    path = tmp_path / 'settings.snapshot'
+    for payload in (
+        b'{"foo": 1, "nested": {"baz": "X"}}',
+        pickle.dumps(Model(foo=1, nested={'baz': 2})),
+        b'[1]',
+    ):
+        write_payload(path, Model, payload)
+        assert read_snapshot(Model, path) is None
+
+    assert load_snapshot(
+        Model, path, '{"foo": 3, "nested": {"baz": 4}}', type_hint='json'
+    ) == Model(foo=3, nested={'baz': 4})
+
+
+class Color(str, Enum):
+    RED = 'red'
+
+
+class Rich(BaseModel):
+    when: datetime
+    price: Decimal
+    color: Color
+    tags: Set[str]
+    pair: Tuple[int, str]
+    nested: Dict[str, List[Model.Nested]]
+    any: Any = None
+    optional: Optional[Model.Nested] = None
+    routes: Columnar[Other] = []
+    path: Path = Path('/tmp')
+
+
+def test_values_rebuilt(tmp_path):
+    path = tmp_path / 'settings.snapshot'
+    model = Rich(
+        when='2020-01-02T03:04:05',
+        price='0.1000000000000000055511151231257827',
+        color='red',
+        tags=['a', 'b'],
+        pair=[1, 'x'],
+        nested={'a': [{'baz': 1}]},
+        any={'x': [1]},
+        routes=[{'foo': 1}],
+    )
+    dump_snapshot(model, path)
+
+    restored = read_snapshot(Rich, path)
+    assert restored.dict() == model.dict()
+    assert restored.__fields_set__ == model.__fields_set__
+    assert type(restored.color) is Color
+    assert type(restored.nested['a'][0]) is Model.Nested
+    assert isinstance(restored.routes, ColumnarList)
+    assert restored.path == Path('/tmp')
+
+
+def test_dump_leaves_no_temporary_files(tmp_path):
+    path = tmp_path / 'settings.snapshot'
+    for foo in range(2):
+        dump_snapshot(Other(foo=foo), path)
+    assert [p.name for p in tmp_path.iterdir()] == ['settings.snapshot']
+    assert read_snapshot(Other, path) == Other(foo=1)
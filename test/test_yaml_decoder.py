@@ -0,0 +1,84 @@
+from pytest import raises
+
+from pydantic_settings import TextLocation
+from pydantic_settings.decoder import ParsingError
+from pydantic_settings.decoder.yaml import _index_documents, decode_document
+
+STREAM = '''%YAML 1.1
+# environments
+---
+env: dev
+port: 1
+--- # comment
+env: prod
+port: [2, 3]
+...
+---
+env: test
+'''
+
+
+def test_documents_index():
+    assert _index_documents(STREAM) == ((0, 0), (46, 5), (87, 9))
+    assert _index_documents('foo: 1\n---\nbar: 2') == ((0, 0), (7, 1))
+    assert _index_documents('foo: 1') == ((0, 0),)
+
+
+def test_select_document_by_index():
+    values = decode_document(STREAM, document=1)
+    assert values == {'env': 'prod', 'port': [2, 3]}
+    assert values.get_location(('port', 1)) == TextLocation(
+        8, 11, 8, 12, 80, 81
+    )
+
+    with raises(ParsingError):
+        decode_document(STREAM, document=3)
+
+
+def test_select_document_by_predicate():
+    values = decode_document(STREAM, document=lambda doc: doc['env'] == 'test')
+    assert values == {'env': 'test'}
+    assert values.get_location(('env',)) == TextLocation(
+        11, 6, 11, 10, 96, 100
+    )
+
+    with raises(ParsingError):
+        decode_document(STREAM, document=lambda doc: False)
+
+
+def test_failed_predicate_reported():
+    with raises(ParsingError) as exc_info:
+        decode_document(STREAM, document=lambda doc: doc['port'] > 1)
+    assert isinstance(exc_info.value.cause, TypeError)
+    assert exc_info.value.text_location == TextLocation(
+        6, 1, -1, -1, 46, -1
+    )
+
+
+def test_multi_document_stream_requires_selection():
+    with raises(ParsingError):
+        decode_document(STREAM)
+
+
+RECORDS = '''
+records:
+- {host: alpha, proto: tcp}
+- {host: beta, proto: tcp}
+'''
+
+
+def test_keys_interned():
+    first, second = decode_document(RECORDS)['records']
+    assert [key for key in first] == [key for key in second]
+    assert all(a is b for a, b in zip(first, second))
+    assert first['proto'] is not second['proto']
+
+
+def test_values_interned():
+    first, second = decode_document(RECORDS, intern_values=True)['records']
+    assert first['proto'] is second['proto']
+
+
+def test_recursive_aliases_interned():
+    values = decode_document('a: &x [*x]', intern_values=True)
+    assert values['a'][0] is values['a']